@@ -3,7 +3,17 @@ modio is a python wrapper to interact with the mod.io API.
 """
 
 from .client import Client
-from .objects import NewMod, NewModFile, Object, Filter
+from .objects import NewMod, NewModFile, Object, Filter, FrozenFilter
+from .catalog import Catalog, ModIndex
+from .crawl import Cursor
+from .mirror import Mirror
+from .dependencies import DependencyResolver
+from .events import EventTailer
+from .scheduler import Scheduler
+from .stats import StatsManager
+from .timeseries import StatsTimeSeries
+from .download import DownloadQueue
+from .cache import FileCache
 from .enums import *
 from .errors import *
 from .mod import *
@@ -0,0 +1,323 @@
+"""Local cache of modfiles keyed by their md5."""
+import hashlib
+import os
+import shutil
+import tempfile
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+from .download import CHUNK_SIZE, _target
+from .errors import modioException
+
+# ioctl cloning a file on filesystems which support copy on write, such as btrfs and xfs
+_FICLONE = 0x40049409
+
+
+def _reflink(source, destination):
+    if fcntl is None:
+        raise OSError("Reflinks are not supported on this platform")
+
+    with open(source, "rb") as src, open(destination, "wb") as dst:
+        try:
+            fcntl.ioctl(dst.fileno(), _FICLONE, src.fileno())
+        except OSError:
+            dst.close()
+            os.remove(destination)
+            raise
+
+
+def _remove(*paths):
+    for path in paths:
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def _md5(path):
+    hasher = hashlib.md5()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            hasher.update(chunk)
+
+    return hasher.hexdigest()
+
+
+class FileCache:
+    """This class is unique to the library and represents a directory of modfiles stored under their
+    md5, so that a modfile downloaded once can be installed again, by any process sharing the
+    directory, without downloading it. Files are written to the cache atomically, a file only ever
+    appears in the cache whole. The state of the cache is the directory itself, which makes it safe to
+    share between processes.
+
+    Files are installed out of the cache with the cheapest method the filesystem supports: a reflink,
+    a copy which shares the data of the file until either is modified, then a hardlink, then a copy.
+    Note that a hardlinked file and the file in the cache are the same file, a file installed with a
+    hardlink must therefore not be modified in place. Pass `link="copy"` or `link="reflink"` if it
+    may be.
+
+    When the cache grows over its maximum size, the files least recently used are removed until it
+    fits again.
+
+    .. code-block:: python
+
+        cache = FileCache("~/.cache/modio", max_size=50 * 1024 ** 3)
+        path = cache.download(mod.file, "mods/")
+
+    Parameters
+    -----------
+    directory : str
+        The directory of the cache, created if it does not exist.
+    max_size : Optional[int]
+        The maximum size of the cache in bytes, defaults to no maximum.
+
+    """
+
+    def __init__(self, directory: str, *, max_size: int = None):
+        self.directory = os.path.expanduser(directory)
+        self.max_size = max_size
+        self._objects = os.path.join(self.directory, "objects")
+        self._tmp = os.path.join(self.directory, "tmp")
+        os.makedirs(self._objects, exist_ok=True)
+        os.makedirs(self._tmp, exist_ok=True)
+
+    def __repr__(self):
+        return f"<FileCache directory={self.directory} max_size={self.max_size}>"
+
+    def __contains__(self, md5):
+        return os.path.exists(self.path(md5))
+
+    def __len__(self):
+        return len(self._entries())
+
+    def path(self, md5: str) -> str:
+        """Returns the path a file is stored at in the cache, whether the file is in the cache or not.
+
+        Parameters
+        -----------
+        md5 : str
+            The md5 of the file
+
+        Returns
+        --------
+        str
+            The path of the file
+        """
+        md5 = md5.lower()
+        return os.path.join(self._objects, md5[:2], md5)
+
+    def _entries(self):
+        entries = []
+        for prefix in os.listdir(self._objects):
+            for entry in os.scandir(os.path.join(self._objects, prefix)):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+        return entries
+
+    @property
+    def size(self) -> int:
+        """int : The size of every file in the cache in bytes"""
+        return sum(size for _, size, _ in self._entries())
+
+    def get(self, md5: str):
+        """Returns the path of a file in the cache and marks it as used.
+
+        Parameters
+        -----------
+        md5 : str
+            The md5 of the file
+
+        Returns
+        --------
+        Optional[str]
+            The path of the file, None if it is not in the cache
+        """
+        path = self.path(md5)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+
+        return path
+
+    def _reserve(self):
+        # every download has a temporary file of its own so that concurrent downloads of the same
+        # file, from threads or other processes, never write to the same partial file
+        fd, tmp = tempfile.mkstemp(dir=self._tmp)
+        os.close(fd)
+        return tmp
+
+    def put(self, md5: str, source: str, *, move: bool = False, verify: bool = True) -> str:
+        """Adds a file to the cache. The file is copied, or moved, to a temporary file in the cache
+        first then renamed, so it is never seen partly written.
+
+        Parameters
+        -----------
+        md5 : str
+            The md5 of the file
+        source : str
+            The path of the file to add
+        move : Optional[bool]
+            Move the file into the cache instead of copying it, defaults to False.
+        verify : Optional[bool]
+            Check the md5 of the file before adding it, defaults to True.
+
+        Raises
+        -------
+        modioException
+            The md5 of the file does not match
+
+        Returns
+        --------
+        str
+            The path of the file in the cache
+        """
+        if verify and _md5(source) != md5.lower():
+            raise modioException(f"The md5 of {source} does not match {md5}")
+
+        path = self.path(md5)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = self._reserve()
+        try:
+            if move:
+                shutil.move(source, tmp)
+            else:
+                shutil.copyfile(source, tmp)
+
+            os.replace(tmp, path)
+        except BaseException:
+            _remove(tmp)
+            raise
+
+        self.evict(keep=path)
+        return path
+
+    def evict(self, *, keep: str = None) -> int:
+        """Removes the files least recently used until the cache fits its maximum size.
+
+        Parameters
+        -----------
+        keep : Optional[str]
+            The path of a file not to remove
+
+        Returns
+        --------
+        int
+            The number of bytes freed
+        """
+        if self.max_size is None:
+            return 0
+
+        entries = sorted(self._entries())
+        total, freed = sum(size for _, size, _ in entries), 0
+        for _, size, path in entries:
+            if total - freed <= self.max_size:
+                break
+
+            if path == keep:
+                continue
+
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                continue
+
+            freed += size
+
+        return freed
+
+    def materialize(self, md5: str, destination: str, *, link: str = "auto") -> str:
+        """Installs a file of the cache to a path.
+
+        Parameters
+        -----------
+        md5 : str
+            The md5 of the file
+        destination : str
+            The path to install the file to, replaced if it exists.
+        link : Optional[str]
+            How to install the file: `reflink`, `hardlink`, `copy` or `auto` to try each of them
+            in that order. Defaults to `auto`.
+
+        Raises
+        -------
+        modioException
+            The file is not in the cache
+        OSError
+            The filesystem does not support the link requested
+
+        Returns
+        --------
+        str
+            The path the file was installed to
+        """
+        path = self.get(md5)
+        if path is None:
+            raise modioException(f"{md5} is not in the cache")
+
+        methods = {"reflink": _reflink, "hardlink": os.link, "copy": shutil.copyfile}
+        if link == "auto":
+            candidates = list(methods.values())
+        else:
+            candidates = [methods[link]]
+
+        directory = os.path.dirname(os.path.abspath(destination))
+        os.makedirs(directory, exist_ok=True)
+        tmp = os.path.join(directory, f".{os.path.basename(destination)}.{md5}.tmp")
+        for index, method in enumerate(candidates):
+            if os.path.exists(tmp):
+                os.remove(tmp)
+
+            try:
+                method(path, tmp)
+                break
+            except OSError:
+                if index == len(candidates) - 1:
+                    raise
+
+        os.replace(tmp, destination)
+        return destination
+
+    def download(self, file, path=None, *, link: str = "auto", **options) -> str:
+        """Installs a modfile from the cache, downloading it into the cache first if it is not
+        already there.
+
+        |coro|
+
+        Parameters
+        -----------
+        file : ModFile
+            The file to install
+        path : Optional[str]
+            The path to install the file to, see :meth:`ModFile.download`.
+        link : Optional[str]
+            How to install the file, see :meth:`materialize`.
+        options
+            Passed to :meth:`ModFile.download`, the md5 of the file is verified as it is downloaded.
+
+        Returns
+        --------
+        str
+            The path the file was installed to
+        """
+        if self.get(file.hash) is None:
+            tmp = self._reserve()
+            try:
+                # the download checks the md5 as the file is streamed, it is not read a second time
+                self.put(file.hash, file.download(tmp, **options), move=True, verify=False)
+            finally:
+                _remove(tmp, f"{tmp}.part")
+
+        return self.materialize(file.hash, _target(path, file.filename), link=link)
+
+    async def async_download(self, file, path=None, *, link: str = "auto", **options) -> str:
+        if self.get(file.hash) is None:
+            tmp = self._reserve()
+            try:
+                self.put(file.hash, await file.async_download(tmp, **options), move=True, verify=False)
+            finally:
+                _remove(tmp, f"{tmp}.part")
+
+        return self.materialize(file.hash, _target(path, file.filename), link=link)
@@ -0,0 +1,283 @@
+"""In-memory collections of models indexed for repeated lookups."""
+import bisect
+import datetime
+import enum
+from collections import defaultdict
+
+from .errors import modioException
+from .objects import Returned
+from .query import evaluate
+from .utils import _missing, _resolve_attr
+
+
+def _comparable(value):
+    if isinstance(value, datetime.datetime):
+        return value.timestamp()
+
+    if isinstance(value, enum.Enum):
+        return value.value
+
+    return value
+
+
+class Catalog:
+    """This class is unique to the library and represents an in-memory collection of models
+    which can be queried repeatedly. Lookups build an index on the attributes they use the
+    first time they are made so that subsequent lookups on the same attributes only cost a
+    hash lookup rather than a scan of the whole collection. Catalogs can be created from
+    any iterable of models or directly from the results of a request.
+
+    Parameters
+    -----------
+    items : Optional[Union[Iterable, Returned]]
+        The models to store in the catalog.
+
+    """
+
+    def __init__(self, items=()):
+        if isinstance(items, Returned):
+            items = items.results
+
+        self._items = {}
+        self._indexes = {}
+        self._ranges = {}
+        self._positions = None
+
+        for item in items:
+            self._items[self._key(item)] = item
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} items={len(self._items)}>"
+
+    def __len__(self):
+        return len(self._items)
+
+    def __iter__(self):
+        return iter(self._items.values())
+
+    def __contains__(self, item):
+        return self._key(item) in self._items
+
+    def _key(self, item):
+        return id(item)
+
+    def _index(self, name, func):
+        if name not in self._indexes:
+            index = defaultdict(list)
+            try:
+                for item in self._items.values():
+                    index[func(item)].append(item)
+            except TypeError:
+                index = None
+
+            self._indexes[name] = (index, func)
+
+        return self._indexes[name][0]
+
+    def _unindex(self, item):
+        self._ranges.clear()
+        self._positions = None
+        stale = []
+        for name, (index, func) in self._indexes.items():
+            if index is None:
+                continue
+
+            try:
+                value = func(item)
+                bucket = index[value]
+                bucket.pop(next(position for position, other in enumerate(bucket) if other is item))
+            except (TypeError, StopIteration):
+                # the model was changed in place since it was indexed
+                stale.append(name)
+                continue
+
+            if not bucket:
+                del index[value]
+
+        # stale indexes are rebuilt on their next use
+        for name in stale:
+            del self._indexes[name]
+
+    def _range(self, name, func):
+        if name not in self._ranges:
+            pairs = []
+            for item in self._items.values():
+                value = func(item)
+                if value is not None and value is not _missing:
+                    pairs.append((value, item))
+
+            try:
+                pairs.sort(key=lambda pair: pair[0])
+            except TypeError:
+                self._ranges[name] = None
+            else:
+                self._ranges[name] = ([pair[0] for pair in pairs], [pair[1] for pair in pairs])
+
+        return self._ranges[name]
+
+    def _narrow(self, conditions):
+        for condition in conditions:
+            items = condition.narrow(self)
+            if items is not None:
+                if self._positions is None:
+                    self._positions = {key: position for position, key in enumerate(self._items)}
+
+                return sorted(items, key=lambda item: self._positions[self._key(item)])
+
+        return list(self._items.values())
+
+    def add(self, item):
+        """Add a model to the catalog, existing indexes are updated.
+
+        Parameters
+        -----------
+        item : Any
+            The model to add
+        """
+        item_key = self._key(item)
+        if item_key in self._items:
+            self.discard(self._items[item_key])
+
+        self._items[item_key] = item
+        self._positions = None
+        self._ranges.clear()
+        for name, (index, func) in self._indexes.items():
+            if index is not None:
+                try:
+                    index[func(item)].append(item)
+                except TypeError:
+                    self._indexes[name] = (None, func)
+
+    def discard(self, item):
+        """Remove a model from the catalog if it is present.
+
+        Parameters
+        -----------
+        item : Any
+            The model to remove
+        """
+        old = self._items.pop(self._key(item), None)
+        if old is not None:
+            self._unindex(old)
+
+    def get(self, **fields):
+        """Returns a list of the models which have all the attributes passed equal to the value
+        passed, in the order they were added. If no model matches the empty list is returned.
+        Attributes of attributes can be matched using dots.
+
+            mods = catalog.get(game_id=2, visible=Visibility.public)
+
+        Returns
+        --------
+        List[Any]
+            The matching models
+        """
+        keys = tuple(sorted(fields))
+        index = self._index(keys, lambda item: tuple(_resolve_attr(item, key) for key in keys))
+        if index is not None:
+            try:
+                return list(index.get(tuple(fields[key] for key in keys), ()))
+            except TypeError:
+                pass
+
+        return [
+            item
+            for item in self._items.values()
+            if all(_resolve_attr(item, key) == value for key, value in fields.items())
+        ]
+
+    def find(self, **fields):
+        """Returns the first model which has all the attributes passed equal to the value passed.
+        If no model matches None is returned.
+
+            mod = catalog.find(name="Rogue Knight HD Pack")
+
+        Returns
+        --------
+        Optional[Any]
+            The matching model
+        """
+        items = self.get(**fields)
+        return items[0] if items else None
+
+    def between(self, key, low=None, high=None):
+        """Returns a list of the models whose attribute is between the bounds passed, bounds are
+        inclusive and can be omitted. Models are returned ordered by the value of the attribute,
+        models for which the attribute is None are ignored. Works for numerical and date attributes,
+        dates can be compared to either datetimes or UNIX timestamps. Attributes of attributes can
+        be compared using dots.
+
+            mods = catalog.between("stats.downloads", low=1000)
+
+        Parameters
+        -----------
+        key : str
+            The attribute to compare
+        low : Optional[Any]
+            The lower bound
+        high : Optional[Any]
+            The upper bound
+
+        Returns
+        --------
+        List[Any]
+            The matching models
+        """
+        pairs = self._range(key, lambda item: _comparable(_resolve_attr(item, key)))
+        if pairs is None:
+            raise modioException(f"The values of {key} cannot be compared with each other")
+
+        values, items = pairs
+        start = 0 if low is None else bisect.bisect_left(values, _comparable(low))
+        end = len(values) if high is None else bisect.bisect_right(values, _comparable(high))
+        return items[start:end]
+
+    def query(self, filters=None):
+        """Evaluates a filter against the models of the catalog rather than against the API, see
+        :func:`query.evaluate`. Equality, inclusion and range filters use the indexes of the catalog
+        to avoid scanning every model.
+
+        Parameters
+        -----------
+        filters : Optional[Filter]
+            The filter to evaluate
+
+        Returns
+        --------
+        Returned[List[Any], Pagination]
+            The results and pagination tuple of the query
+        """
+        return evaluate(filters, self)
+
+
+class ModIndex(Catalog):
+    """A :class:`Catalog` for models which have a unique `id`, such as mods. Models can
+    be retrieved by id and adding a model replaces the model with the same id.
+
+    Parameters
+    -----------
+    items : Optional[Union[Iterable, Returned]]
+        The models to store in the index.
+
+    """
+
+    def _key(self, item):
+        return item.id
+
+    def __getitem__(self, item_id):
+        return self._items[item_id]
+
+    def __contains__(self, item):
+        return getattr(item, "id", item) in self._items
+
+    def discard(self, item):
+        """Remove a model from the index if it is present.
+
+        Parameters
+        -----------
+        item : Union[int, Any]
+            The model or the id of the model to remove
+        """
+        old = self._items.pop(getattr(item, "id", item), None)
+        if old is not None:
+            self._unindex(old)
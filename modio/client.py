@@ -3,6 +3,7 @@ this is where you can get your  games, authentify and get the models for
 your authenticated user.
 """
 import asyncio
+import concurrent.futures
 import datetime
 import logging
 import math
@@ -22,11 +23,118 @@ from .game import Game
 from .mod import Mod
 
 MAX_TRIES = 2
+PAGE_LIMIT = 100
+MAX_WORKERS = 4
+MAX_IN_VALUES = 100
+
+
+def _split_filters(filters):
+    """Returns the sub filters an oversized `-in` filter must be split into, or None if the filter
+    can be sent as is. Only the first oversized `-in` filter is split."""
+    if filters is None:
+        return None
+
+    filters = filters.freeze()
+    for key, value in filters.params:
+        if not key.endswith("-in") or key.endswith("-not-in") or not isinstance(value, str):
+            continue
+
+        values = list(dict.fromkeys(value.split(",")))
+        if len(values) > MAX_IN_VALUES:
+            return [
+                filters.with_params(
+                    {key: ",".join(values[index : index + MAX_IN_VALUES]), "_offset": None, "_limit": None}
+                )
+                for index in range(0, len(values), MAX_IN_VALUES)
+            ]
+
+    return None
+
+
+# sort columns of the API whose values are nested in the payload of the results
+_SORT_PATHS = {
+    "downloads": ("stats", "downloads_total"),
+    "popular": ("stats", "popularity_rank_position"),
+    "rating": ("stats", "ratings_weighted_aggregate"),
+    "subscribers": ("stats", "subscribers_total"),
+    "downloads_total": ("stats", "downloads_total"),
+    "subscribers_total": ("stats", "subscribers_total"),
+    "ratings_positive": ("stats", "ratings_positive"),
+    "ratings_negative": ("stats", "ratings_negative"),
+    "ratings_weighted_aggregate": ("stats", "ratings_weighted_aggregate"),
+    "popularity_rank_position": ("stats", "popularity_rank_position"),
+}
+
+
+def _sort_value(result, path):
+    for key in path:
+        if not isinstance(result, dict) or key not in result:
+            raise KeyError(key)
+
+        result = result[key]
+
+    return result
+
+
+def _merge_chunks(filters, chunks, offset, limit):
+    """Merges the results of split sub queries into a single response, de-duplicating results by id
+    and restoring the order requested by the filter, or the order by id of the API if the filter is
+    not sorted. If the results cannot be ordered and only part of them is returned an error is raised
+    rather than returning the wrong part."""
+    data, seen, duplicates = [], set(), 0
+    for results, _ in chunks:
+        for result in results:
+            result_id = result.get("id")
+            if result_id is not None:
+                if result_id in seen:
+                    duplicates += 1
+                    continue
+
+                seen.add(result_id)
+
+            data.append(result)
+
+    sort = filters._sort or "id"
+    key = sort.lstrip("-")
+    try:
+        values = [_sort_value(result, _SORT_PATHS.get(key, (key,))) for result in data]
+    except KeyError:
+        if offset or len(data) > limit:
+            raise modioException(
+                f"The results of a filter split into several requests cannot be sorted by {key}"
+            ) from None
+    else:
+        present = [(value, result) for value, result in zip(values, data) if value is not None]
+        absent = [result for value, result in zip(values, data) if value is None]
+        present.sort(key=lambda pair: pair[0], reverse=sort.startswith("-"))
+        data = [result for _, result in present] + absent
+
+    page = data[offset : offset + limit]
+    return {
+        "data": page,
+        "result_count": len(page),
+        "result_limit": limit,
+        "result_offset": offset,
+        "result_total": sum(total for _, total in chunks) - duplicates,
+    }
+
 
 class Connection:
     """Class handling under the hood requests and ratelimits."""
 
-    def __init__(self, api_path, api_key, access_token, lang, version, test, platform, portal, ratelimit_max_sleep):
+    def __init__(
+        self,
+        api_path,
+        api_key,
+        access_token,
+        lang,
+        version,
+        test,
+        platform,
+        portal,
+        ratelimit_max_sleep,
+        keep_raw=False,
+    ):
         self.test = test
         self.version = version
         self.api_path = api_path
@@ -40,6 +148,7 @@ class Connection:
         self.rate_remain = None
         self.retry_after = 0
         self.ratelimit_max_sleep = ratelimit_max_sleep
+        self.keep_raw = keep_raw
 
         self.session = requests.Session()
         self._async_session = None
@@ -154,8 +263,40 @@ class Connection:
 
         return data
 
-    @ratelimit_retry(MAX_TRIES)
     def get_request(self, url, *, h_type=0, **fields):
+        """Gets a single page of results. Filters with more values in an `-in` filter than can be
+        sent at once are split into sub queries which are sent concurrently and merged."""
+        filters = fields.get("filters")
+        chunks = _split_filters(filters)
+        if chunks is None:
+            return self._get_request(url, h_type=h_type, **fields)
+
+        fields.pop("filters")
+        offset = filters._offset or 0
+        needed = offset + (filters._limit or PAGE_LIMIT)
+
+        def get_chunk(chunk):
+            return self._get_chunk(url, chunk, needed, h_type=h_type, **fields)
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            results = list(executor.map(get_chunk, chunks))
+
+        return _merge_chunks(filters, results, offset, needed - offset)
+
+    def _get_chunk(self, url, filters, needed, **fields):
+        data, offset = [], 0
+        while True:
+            limit = min(needed - len(data), PAGE_LIMIT)
+            page = self._get_request(
+                url, filters=filters.with_params({"_limit": limit, "_offset": offset}), **fields
+            )
+            data.extend(page["data"])
+            offset += limit
+            if len(data) >= needed or offset >= page["result_total"] or not page["data"]:
+                return data, page["result_total"]
+
+    @ratelimit_retry(MAX_TRIES)
+    def _get_request(self, url, *, h_type=0, **fields):
         filters = fields.pop("filters", None)
         filters = (filters or Filter()).get_dict()
 
@@ -168,9 +309,44 @@ class Connection:
         resp = self.session.get(self._base_path + url, headers=self._define_headers(h_type), params=extra)
         return self._post_process(resp)
 
+    def _page_filters(self, filters, offset):
+        return filters.with_params({"_limit": PAGE_LIMIT, "_offset": offset})
+
+    def get_all_request(self, url, *, filters=None, max_workers=MAX_WORKERS, **fields):
+        """Gets every result of a list endpoint. The first page is requested alone to learn the
+        total amount of results and the remaining pages are then requested concurrently. Returns
+        the data of every page in order."""
+        filters = (filters or Filter()).freeze()
+        offset = filters._offset or 0
+        chunks = _split_filters(filters)
+        if chunks is not None:
+
+            def get_chunk(chunk):
+                data = self.get_all_request(url, filters=chunk, max_workers=max_workers, **fields)
+                return data, len(data)
+
+            with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+                results = list(executor.map(get_chunk, chunks))
+
+            return _merge_chunks(filters, results, offset, sum(total for _, total in results))["data"]
+
+        first = self.get_request(url, filters=self._page_filters(filters, offset), **fields)
+        offsets = range(offset + PAGE_LIMIT, first["result_total"], PAGE_LIMIT)
+
+        def get_page(page_offset):
+            return self.get_request(url, filters=self._page_filters(filters, page_offset), **fields)["data"]
+
+        data = first["data"]
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for page in executor.map(get_page, offsets):
+                data.extend(page)
+
+        return data
+
     @ratelimit_retry(MAX_TRIES)
-    def post_request(self, url, *, h_type=0, **fields):
-        resp = self.session.post(self._base_path + url, headers=self._define_headers(h_type), **fields)
+    def post_request(self, url, *, h_type=0, headers=None, **fields):
+        headers = {**self._define_headers(h_type), **(headers or {})}
+        resp = self.session.post(self._base_path + url, headers=headers, **fields)
         return self._post_process(resp)
 
     @ratelimit_retry(MAX_TRIES)
@@ -199,8 +375,38 @@ class Connection:
 
         return data
 
-    @async_ratelimit_retry(MAX_TRIES)
     async def async_get_request(self, url, *, h_type=0, **fields):
+        filters = fields.get("filters")
+        chunks = _split_filters(filters)
+        if chunks is None:
+            return await self._async_get_request(url, h_type=h_type, **fields)
+
+        fields.pop("filters")
+        offset = filters._offset or 0
+        needed = offset + (filters._limit or PAGE_LIMIT)
+        semaphore = asyncio.Semaphore(MAX_WORKERS)
+
+        async def get_chunk(chunk):
+            async with semaphore:
+                return await self._async_get_chunk(url, chunk, needed, h_type=h_type, **fields)
+
+        results = await asyncio.gather(*(get_chunk(chunk) for chunk in chunks))
+        return _merge_chunks(filters, results, offset, needed - offset)
+
+    async def _async_get_chunk(self, url, filters, needed, **fields):
+        data, offset = [], 0
+        while True:
+            limit = min(needed - len(data), PAGE_LIMIT)
+            page = await self._async_get_request(
+                url, filters=filters.with_params({"_limit": limit, "_offset": offset}), **fields
+            )
+            data.extend(page["data"])
+            offset += limit
+            if len(data) >= needed or offset >= page["result_total"] or not page["data"]:
+                return data, page["result_total"]
+
+    @async_ratelimit_retry(MAX_TRIES)
+    async def _async_get_request(self, url, *, h_type=0, **fields):
         filters = fields.pop("filters", None)
         filters = (filters or Filter()).get_dict()
 
@@ -215,10 +421,46 @@ class Connection:
         ) as resp:
             return await self._async_post_process(resp)
 
+    async def async_get_all_request(self, url, *, filters=None, max_workers=MAX_WORKERS, **fields):
+        filters = (filters or Filter()).freeze()
+        offset = filters._offset or 0
+        chunks = _split_filters(filters)
+        if chunks is not None:
+            pending = [
+                self.async_get_all_request(url, filters=chunk, max_workers=max_workers, **fields)
+                for chunk in chunks
+            ]
+            results = [(data, len(data)) for data in await asyncio.gather(*pending)]
+
+            return _merge_chunks(filters, results, offset, sum(total for _, total in results))["data"]
+
+        first = await self.async_get_request(url, filters=self._page_filters(filters, offset), **fields)
+        offsets = range(offset + PAGE_LIMIT, first["result_total"], PAGE_LIMIT)
+        semaphore = asyncio.Semaphore(max_workers)
+
+        async def get_page(page_offset):
+            async with semaphore:
+                page = await self.async_get_request(
+                    url, filters=self._page_filters(filters, page_offset), **fields
+                )
+                return page["data"]
+
+        data = first["data"]
+        for page in await asyncio.gather(*(get_page(page_offset) for page_offset in offsets)):
+            data.extend(page)
+
+        return data
+
     @async_ratelimit_retry(MAX_TRIES)
-    async def async_post_request(self, url, *, h_type=0, **fields):
+    async def async_post_request(self, url, *, h_type=0, headers=None, **fields):
         files = fields.pop("files", {})
         data = fields.pop("data", {})
+        headers = {**self._define_headers(h_type), **(headers or {})}
+
+        # bodies which are not form fields, such as a MultipartUpload, are sent as they are
+        if not isinstance(data, dict):
+            async with self.async_session.post(self._base_path + url, headers=headers, data=data) as resp:
+                return await self._async_post_process(resp)
 
         form = aiohttp.FormData()
         for key, value in data.items():
@@ -236,9 +478,7 @@ class Connection:
             else:
                 form.add_field(key, value, content_type="multipart/form-data")
 
-        async with self.async_session.post(
-            self._base_path + url, headers=self._define_headers(h_type), data=form
-        ) as resp:
+        async with self.async_session.post(self._base_path + url, headers=headers, data=form) as resp:
             return await self._async_post_process(resp)
 
     @async_ratelimit_retry(MAX_TRIES)
@@ -289,6 +529,11 @@ class Client:
         header returned dictates a longer sleep than that value then the library will instead raise
         the ratelimit. If it is less then the library will sleep for the duration required before
         retrying the request once.
+    keep_raw : Optional[bool]
+        Whether or not models created by this client should keep a reference to the payload they were
+        created from. This payload can then be obtained again without being rebuilt with the `to_dict`
+        and `to_json` methods of :class:`Game`, :class:`Mod`, :class:`ModFile`, :class:`Comment`,
+        :class:`User`, :class:`TeamMember` and :class:`Rating`. Defaults to False.
 
     Attributes
     -----------
@@ -308,7 +553,8 @@ class Client:
         test=False,
         platform=None,
         portal=None,
-        ratelimit_max_sleep=math.inf
+        ratelimit_max_sleep=math.inf,
+        keep_raw=False,
     ):
         self.lang = lang
         self.version = version
@@ -322,7 +568,8 @@ class Client:
             lang=lang,
             platform=platform,
             portal=portal,
-            ratelimit_max_sleep=ratelimit_max_sleep
+            ratelimit_max_sleep=ratelimit_max_sleep,
+            keep_raw=keep_raw,
         )
 
     def __repr__(self):
@@ -364,6 +611,35 @@ class Client:
         """
         self.connection.portal = portal
 
+    def attach(self, entity):
+        """Attach an entity, or a list of entities, to this client. Entities drop their connection
+        when they are pickled so they can be sent to other processes cheaply, they must be attached
+        to a client on the receiving side before any request can be made with them. Nested entities
+        such as the submitter of a mod or its modfile are attached as well.
+
+        Parameters
+        -----------
+        entity : Union[Game, Mod, ModFile, Comment, User, Rating, List, Returned]
+            The entity or list of entities to attach
+
+        Returns
+        --------
+        Union[Game, Mod, ModFile, Comment, User, Rating, List, Returned]
+            The entity or list of entities that was passed
+        """
+        if isinstance(entity, Returned):
+            items = entity.results
+        elif isinstance(entity, (list, tuple)):
+            items = entity
+        else:
+            items = (entity,)
+
+        seen = set()
+        for item in items:
+            item._attach(self.connection, seen)
+
+        return entity
+
     async def close(self):
         """|async| This function is used to clean up the client in order to close the application that it uses gracefully.
         At the moment it is only used to close the client's Session.
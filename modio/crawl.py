@@ -0,0 +1,347 @@
+"""Crawling of entire list endpoints using keyset pagination."""
+import asyncio
+import concurrent.futures
+import json
+import os
+import queue
+import threading
+from collections import deque
+
+from .client import MAX_WORKERS, PAGE_LIMIT
+from .objects import Filter
+
+
+class Cursor:
+    """This class is unique to the library and represents the position of a crawl, the id of the
+    last model crawled. If the cursor was created with a path it is saved to that path every time
+    it advances so that a crawl interrupted by a crash can be resumed from the last page it completed.
+
+    Parameters
+    -----------
+    last_id : Optional[int]
+        The id of the last model crawled, the crawl resumes from the model after it. Defaults
+        to 0 to crawl from the start.
+    path : Optional[str]
+        The path of the file the cursor is saved to.
+
+    Attributes
+    -----------
+    last_id : int
+        The id of the last model crawled
+    path : Optional[str]
+        The path of the file the cursor is saved to
+    """
+
+    def __init__(self, last_id=0, path=None):
+        self.last_id = last_id
+        self.path = path
+
+    def __repr__(self):
+        return f"<Cursor last_id={self.last_id} path={self.path}>"
+
+    @classmethod
+    def load(cls, path):
+        """Loads a cursor from a file previously saved to, if the file does not
+        exist a new cursor starting from the beginning is returned.
+
+        Parameters
+        -----------
+        path : str
+            The path of the file to load the cursor from
+
+        Returns
+        --------
+        Cursor
+            The cursor
+        """
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return cls(path=path)
+
+        return cls(last_id=data["last_id"], path=path)
+
+    def save(self):
+        """Saves the cursor to its path. The cursor is written to a temporary file first
+        and then moved in place so that a crash never leaves a partially written cursor."""
+        temp = f"{self.path}.tmp"
+        with open(temp, "w", encoding="utf-8") as f:
+            json.dump({"last_id": self.last_id}, f)
+
+        os.replace(temp, self.path)
+
+    def advance(self, last_id):
+        """Moves the cursor past a model and saves it if it has a path.
+
+        Parameters
+        -----------
+        last_id : int
+            The id of the last model crawled
+        """
+        self.last_id = last_id
+        if self.path is not None:
+            self.save()
+
+
+def _keyset_filters(filters, cursor):
+    filters = (filters or Filter()).freeze()
+    low = max(cursor.last_id + 1, int(filters.get_dict().get("id-min", 0)))
+    return filters.with_params({"_sort": "id", "_limit": PAGE_LIMIT, "_offset": None, "id-min": low})
+
+
+def crawl(method, *, filters=None, cursor=None):
+    """Lazily crawls every result of a list endpoint, one page at a time. Rather than paging with
+    an offset, which gets slower as the offset grows and skips or repeats models when models are
+    added or removed during the crawl, pages are requested sorted by id starting after the last id
+    of the previous page. The cursor is advanced once every model of a page was yielded, a crawl
+    resumed from a cursor may therefore yield again the models of the page it was interrupted in.
+
+    .. code-block:: python
+
+        cursor = modio.crawl.Cursor.load("mods.cursor")
+        for mod in modio.crawl.crawl(game.get_mods, cursor=cursor):
+            ...
+
+    Parameters
+    -----------
+    method : Callable[..., Returned]
+        The method of the list endpoint to crawl, for example `Game.get_mods`
+    filters : Optional[Filter]
+        Filters to apply to the crawl, sorting and pagination are overwritten
+    cursor : Optional[Cursor]
+        The cursor to resume the crawl from, advanced as the crawl progresses.
+
+    Returns
+    --------
+    Iterator[Any]
+        The models of the endpoint in increasing order of id
+    """
+    cursor = cursor or Cursor()
+    while True:
+        results, _ = method(filters=_keyset_filters(filters, cursor))
+        yield from results
+
+        if not results:
+            return
+
+        cursor.advance(results[-1].id)
+        if len(results) < PAGE_LIMIT:
+            return
+
+
+async def async_crawl(method, *, filters=None, cursor=None):
+    """Async version of :func:`crawl`, takes an async method such as `Game.async_get_mods`.
+
+    .. code-block:: python
+
+        async for mod in modio.crawl.async_crawl(game.async_get_mods):
+            ...
+    """
+    cursor = cursor or Cursor()
+    while True:
+        results, _ = await method(filters=_keyset_filters(filters, cursor))
+        for result in results:
+            yield result
+
+        if not results:
+            return
+
+        cursor.advance(results[-1].id)
+        if len(results) < PAGE_LIMIT:
+            return
+
+
+class _Range:
+    __slots__ = ("low", "high")
+
+    def __init__(self, low, high):
+        self.low = low
+        self.high = high
+
+
+class _Partitions:
+    """The ranges of ids left to crawl, shared between the workers of a partitioned crawl. Workers
+    which run out of ranges split the largest range still being crawled in two so that the id space
+    is rebalanced when models are not evenly distributed."""
+
+    def __init__(self, low, high, count):
+        step = max((high - low) // count + 1, 1)
+        self.pending = deque(
+            _Range(start, min(start + step - 1, high)) for start in range(low, high + 1, step)
+        )
+        self.active = []
+        self.lock = threading.Lock()
+
+    def take(self):
+        with self.lock:
+            if self.pending:
+                partition = self.pending.popleft()
+            else:
+                if not self.active:
+                    return None
+
+                largest = max(self.active, key=lambda partition: partition.high - partition.low)
+                if largest.high - largest.low < PAGE_LIMIT:
+                    return None
+
+                middle = (largest.low + largest.high) // 2
+                partition = _Range(middle + 1, largest.high)
+                largest.high = middle
+
+            self.active.append(partition)
+            return partition
+
+    def bounds(self, partition):
+        with self.lock:
+            return partition.low, partition.high
+
+    def advance(self, partition, results):
+        with self.lock:
+            complete = len(results) < PAGE_LIMIT
+            results = [result for result in results if result.id <= partition.high]
+            if results:
+                partition.low = results[-1].id + 1
+
+            done = complete or partition.low > partition.high
+            if done:
+                self.active.remove(partition)
+
+            return results, done
+
+
+def _probe_filters(filters, sort):
+    return filters.with_params({"_sort": sort, "_limit": 1, "_offset": None})
+
+
+def _range_filters(filters, low, high):
+    return filters.with_params(
+        {"_sort": "id", "_limit": PAGE_LIMIT, "_offset": None, "id-min": low, "id-max": high}
+    )
+
+
+def partitioned_crawl(method, *, filters=None, partitions=None, max_workers=MAX_WORKERS):
+    """Crawls every result of a list endpoint with several concurrent connections. The lowest and
+    highest ids matching the filters are requested first, the ids in between are then split into
+    ranges which are crawled concurrently with keyset pagination. Workers which finish their range
+    split the largest range still being crawled, so ranges which contain more models than others do
+    not end up being crawled by a single worker. Models are yielded as pages complete and are
+    therefore not in order of id.
+
+    .. code-block:: python
+
+        for mod in modio.crawl.partitioned_crawl(game.get_mods, max_workers=8):
+            ...
+
+    Parameters
+    -----------
+    method : Callable[..., Returned]
+        The method of the list endpoint to crawl, for example `Game.get_mods`, `Client.get_games`
+        or `Game.get_mod_events`
+    filters : Optional[Filter]
+        Filters to apply to the crawl, sorting and pagination are overwritten
+    partitions : Optional[int]
+        The number of ranges the ids are initially split into, defaults to the number of workers.
+    max_workers : Optional[int]
+        The number of ranges crawled concurrently
+
+    Returns
+    --------
+    Iterator[Any]
+        The models of the endpoint
+    """
+    filters = (filters or Filter()).freeze()
+    first, _ = method(filters=_probe_filters(filters, "id"))
+    if not first:
+        return
+
+    last, _ = method(filters=_probe_filters(filters, "-id"))
+    work = _Partitions(first[0].id, last[0].id, partitions or max_workers)
+    pages = queue.Queue()
+    stop = threading.Event()
+
+    def worker():
+        try:
+            while not stop.is_set():
+                partition = work.take()
+                if partition is None:
+                    break
+
+                done = False
+                while not done and not stop.is_set():
+                    results, _ = method(filters=_range_filters(filters, *work.bounds(partition)))
+                    results, done = work.advance(partition, results)
+                    pages.put(results)
+        except Exception as e:
+            pages.put(e)
+        finally:
+            pages.put(None)
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for _ in range(max_workers):
+            executor.submit(worker)
+
+        try:
+            finished = 0
+            while finished < max_workers:
+                page = pages.get()
+                if page is None:
+                    finished += 1
+                elif isinstance(page, Exception):
+                    raise page
+                else:
+                    yield from page
+        finally:
+            stop.set()
+
+
+async def async_partitioned_crawl(method, *, filters=None, partitions=None, max_workers=MAX_WORKERS):
+    """Async version of :func:`partitioned_crawl`, takes an async method such as
+    `Game.async_get_mods`. Ranges are crawled by concurrent tasks.
+
+    .. code-block:: python
+
+        async for mod in modio.crawl.async_partitioned_crawl(game.async_get_mods, max_workers=8):
+            ...
+    """
+    filters = (filters or Filter()).freeze()
+    first, _ = await method(filters=_probe_filters(filters, "id"))
+    if not first:
+        return
+
+    last, _ = await method(filters=_probe_filters(filters, "-id"))
+    work = _Partitions(first[0].id, last[0].id, partitions or max_workers)
+    pages = asyncio.Queue()
+
+    async def worker():
+        try:
+            while True:
+                partition = work.take()
+                if partition is None:
+                    break
+
+                done = False
+                while not done:
+                    results, _ = await method(filters=_range_filters(filters, *work.bounds(partition)))
+                    results, done = work.advance(partition, results)
+                    await pages.put(results)
+        except Exception as e:
+            await pages.put(e)
+        finally:
+            await pages.put(None)
+
+    tasks = [asyncio.ensure_future(worker()) for _ in range(max_workers)]
+    try:
+        finished = 0
+        while finished < max_workers:
+            page = await pages.get()
+            if page is None:
+                finished += 1
+            elif isinstance(page, Exception):
+                raise page
+            else:
+                for result in page:
+                    yield result
+    finally:
+        for task in tasks:
+            task.cancel()
@@ -0,0 +1,145 @@
+"""Resolution of the transitive dependencies of mods."""
+import asyncio
+import concurrent.futures
+
+from .client import MAX_WORKERS
+from .errors import modioException
+from .objects import Filter
+
+
+class DependencyResolver:
+    """This class is unique to the library and resolves the full set of mods a mod depends on,
+    directly or not, into an install plan. The dependency graph is expanded level by level: the
+    dependencies of every mod of a level are requested concurrently and the mods discovered are then
+    requested together with a single `id-in` filter, so that resolving a graph costs a number of rounds
+    of requests proportional to its depth. The dependencies and mods requested are kept by the resolver
+    so that the same resolver can resolve mods which share dependencies without requesting them again.
+
+    .. code-block:: python
+
+        resolver = DependencyResolver()
+        for mod in mods:
+            plan = mod.resolve_dependencies(resolver=resolver)
+
+    Parameters
+    -----------
+    max_workers : Optional[int]
+        The maximum number of concurrent requests
+
+    """
+
+    def __init__(self, *, max_workers: int = MAX_WORKERS):
+        self.max_workers = max_workers
+        self._edges = {}
+        self._mods = {}
+
+    def __repr__(self):
+        return f"<DependencyResolver mods={len(self._mods)}>"
+
+    def _dependencies_url(self, mod, mod_id):
+        return f"/games/{mod.game_id}/mods/{mod_id}/dependencies"
+
+    def _expand(self, frontier, seen):
+        """Returns the mods first reached from the frontier and those of them which must be requested."""
+        reached = sorted({dependency for mod_id in frontier for dependency in self._edges[mod_id]} - seen)
+        seen.update(reached)
+        return reached, [mod_id for mod_id in reached if mod_id not in self._mods]
+
+    def _add_mods(self, root, requested, mod_json):
+        for data in mod_json:
+            self._mods[data["id"]] = type(root)(connection=root.connection, **data)
+
+        missing = [mod_id for mod_id in requested if mod_id not in self._mods]
+        if missing:
+            raise modioException(f"Dependencies {missing} of mod {root.id} could not be found")
+
+    def _plan(self, root):
+        """Orders the graph depth first so that every mod comes after its dependencies."""
+        plan, done, path = [], set(), []
+        stack = [(root.id, iter(self._edges[root.id]))]
+        path.append(root.id)
+        while stack:
+            mod_id, dependencies = stack[-1]
+            for dependency in dependencies:
+                if dependency in path:
+                    cycle = path[path.index(dependency) :] + [dependency]
+                    raise modioException(f"Circular dependency: {' -> '.join(str(x) for x in cycle)}")
+
+                if dependency not in done:
+                    stack.append((dependency, iter(self._edges[dependency])))
+                    path.append(dependency)
+                    break
+            else:
+                stack.pop()
+                path.pop()
+                done.add(mod_id)
+                plan.append(self._mods[mod_id])
+
+        return plan
+
+    def resolve(self, mod):
+        """Resolves the dependencies of a mod.
+
+        Parameters
+        -----------
+        mod : Mod
+            The mod to resolve the dependencies of
+
+        Raises
+        -------
+        modioException
+            A dependency could not be found or the dependencies are circular
+
+        Returns
+        --------
+        List[Mod]
+            Every mod to install in the order they should be installed, each mod comes after the mods
+            it depends on and the mod itself is last.
+        """
+        connection = mod.connection
+
+        def get_dependencies(mod_id):
+            return connection.get_all_request(self._dependencies_url(mod, mod_id), max_workers=1)
+
+        self._mods[mod.id] = mod
+        frontier, seen = [mod.id], {mod.id}
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while frontier:
+                unknown = [mod_id for mod_id in frontier if mod_id not in self._edges]
+                for mod_id, data in zip(unknown, executor.map(get_dependencies, unknown)):
+                    self._edges[mod_id] = [dependency["mod_id"] for dependency in data]
+
+                frontier, missing = self._expand(frontier, seen)
+                if missing:
+                    mod_json = connection.get_all_request(
+                        f"/games/{mod.game_id}/mods", filters=Filter().values_in(id=missing)
+                    )
+                    self._add_mods(mod, missing, mod_json)
+
+        return self._plan(mod)
+
+    async def async_resolve(self, mod):
+        semaphore = asyncio.Semaphore(self.max_workers)
+
+        async def get_dependencies(mod_id):
+            async with semaphore:
+                return await mod.connection.async_get_all_request(
+                    self._dependencies_url(mod, mod_id), max_workers=1
+                )
+
+        self._mods[mod.id] = mod
+        frontier, seen = [mod.id], {mod.id}
+        while frontier:
+            unknown = [mod_id for mod_id in frontier if mod_id not in self._edges]
+            results = await asyncio.gather(*(get_dependencies(mod_id) for mod_id in unknown))
+            for mod_id, data in zip(unknown, results):
+                self._edges[mod_id] = [dependency["mod_id"] for dependency in data]
+
+            frontier, missing = self._expand(frontier, seen)
+            if missing:
+                mod_json = await mod.connection.async_get_all_request(
+                    f"/games/{mod.game_id}/mods", filters=Filter().values_in(id=missing)
+                )
+                self._add_mods(mod, missing, mod_json)
+
+        return self._plan(mod)
@@ -0,0 +1,397 @@
+"""Streaming downloads of modfiles."""
+import asyncio
+import collections
+import concurrent.futures
+import hashlib
+import math
+import os
+import threading
+
+from .errors import modioException
+from .objects import Filter
+
+CHUNK_SIZE = 1024 * 1024
+
+
+def _target(path, filename):
+    if path is None:
+        return filename
+
+    if os.path.isdir(path):
+        return os.path.join(path, filename)
+
+    return path
+
+
+class _Download:
+    """The state of the download of a file, shared by the sync and async downloads. The file is
+    downloaded to a `.part` file next to the target which is only moved to the target once the whole
+    file is downloaded and its md5 matches. If a `.part` file is found it is hashed and the download
+    resumes from its end."""
+
+    def __init__(self, path, size, md5, progress=None):
+        self.path = path
+        self.partial = f"{path}.part"
+        self.size = size
+        self.md5 = md5
+        self.progress = progress
+        self.hasher = hashlib.md5()
+        self.offset = 0
+
+        if os.path.exists(self.partial):
+            with open(self.partial, "rb") as f:
+                for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+                    self.hasher.update(chunk)
+                    self.offset += len(chunk)
+
+        if self.offset > size:
+            self._restart()
+
+    def _restart(self):
+        self.hasher = hashlib.md5()
+        self.offset = 0
+
+    @property
+    def complete(self):
+        return self.offset == self.size
+
+    @property
+    def headers(self):
+        return {"Range": f"bytes={self.offset}-"} if self.offset else {}
+
+    def open(self, status):
+        """Opens the partial file for a response, servers which ignore the range restart the download."""
+        if status == 206 and self.offset:
+            return open(self.partial, "ab")
+
+        if status == 200:
+            self._restart()
+            return open(self.partial, "wb")
+
+        raise modioException(f"Failed to download {self.path}", code=status)
+
+    def write(self, file, chunk):
+        file.write(chunk)
+        self.hasher.update(chunk)
+        self.offset += len(chunk)
+        if self.progress is not None:
+            self.progress(self.offset, self.size)
+
+    def finish(self):
+        """Verifies the partial file and moves it to the target."""
+        if self.offset != self.size or self.hasher.hexdigest() != self.md5:
+            os.remove(self.partial)
+            raise modioException(f"Download of {self.path} is corrupted, the md5 does not match")
+
+        os.replace(self.partial, self.path)
+        return self.path
+
+
+def download(session, url, path, *, size, md5, chunk_size=CHUNK_SIZE, progress=None):
+    """Streams a file to disk with a requests session, see :meth:`ModFile.download`."""
+    state = _Download(path, size, md5, progress)
+    if not state.complete:
+        with session.get(url, headers=state.headers, stream=True) as resp:
+            with state.open(resp.status_code) as f:
+                for chunk in resp.iter_content(chunk_size):
+                    state.write(f, chunk)
+
+    return state.finish()
+
+
+async def async_download(session, url, path, *, size, md5, chunk_size=CHUNK_SIZE, progress=None):
+    state = _Download(path, size, md5, progress)
+    if not state.complete:
+        async with session.get(url, headers=state.headers) as resp:
+            with state.open(resp.status) as f:
+                async for chunk in resp.content.iter_chunked(chunk_size):
+                    state.write(f, chunk)
+
+    return state.finish()
+
+
+def _ranges(size, segments, segment_size):
+    if segment_size is None:
+        segment_size = max(math.ceil(size / segments), 1)
+
+    return [(start, min(start + segment_size, size) - 1) for start in range(0, size, segment_size)]
+
+
+class _SegmentedDownload:
+    """The state of a download split in byte ranges, shared by the sync and async downloads. The
+    `.part` file is preallocated to the size of the file and each range is written in place, the md5
+    is verified once every range is downloaded."""
+
+    def __init__(self, path, size, md5, progress=None):
+        self.path = path
+        self.partial = f"{path}.part"
+        self.size = size
+        self.md5 = md5
+        self.progress = progress
+        self.done = 0
+        self._lock = threading.Lock()
+
+        with open(self.partial, "wb") as f:
+            f.truncate(size)
+
+    def headers(self, start, end):
+        return {"Range": f"bytes={start}-{end}"}
+
+    def open(self, status, start):
+        if status != 206:
+            raise modioException(f"Failed to download a range of {self.path}", code=status)
+
+        f = open(self.partial, "r+b")
+        f.seek(start)
+        return f
+
+    def write(self, file, chunk):
+        file.write(chunk)
+        with self._lock:
+            self.done += len(chunk)
+            if self.progress is not None:
+                self.progress(self.done, self.size)
+
+    def abort(self):
+        if os.path.exists(self.partial):
+            os.remove(self.partial)
+
+    def finish(self):
+        """Verifies the md5 of the partial file and moves it to the target."""
+        hasher = hashlib.md5()
+        with open(self.partial, "rb") as f:
+            for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+                hasher.update(chunk)
+
+        if self.done != self.size or hasher.hexdigest() != self.md5:
+            self.abort()
+            raise modioException(f"Download of {self.path} is corrupted, the md5 does not match")
+
+        os.replace(self.partial, self.path)
+        return self.path
+
+
+def segmented_download(
+    session, url, path, *, size, md5, segments=4, segment_size=None, chunk_size=CHUNK_SIZE, progress=None
+):
+    """Downloads byte ranges of a file concurrently with a requests session, see
+    :meth:`ModFile.segmented_download`."""
+    state = _SegmentedDownload(path, size, md5, progress)
+    stop = threading.Event()
+
+    def fetch(byte_range):
+        if stop.is_set():
+            return
+
+        start, end = byte_range
+        try:
+            with session.get(url, headers=state.headers(start, end), stream=True) as resp:
+                with state.open(resp.status_code, start) as f:
+                    for chunk in resp.iter_content(chunk_size):
+                        if stop.is_set():
+                            return
+
+                        state.write(f, chunk)
+        except BaseException:
+            stop.set()
+            raise
+
+    # once a segment fails the others stop at their next chunk and those not started never start,
+    # the partial file is only removed once every thread stopped writing to it
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=segments)
+    try:
+        list(executor.map(fetch, _ranges(size, segments, segment_size)))
+    except BaseException:
+        stop.set()
+        raise
+    finally:
+        executor.shutdown()
+        if stop.is_set():
+            state.abort()
+
+    return state.finish()
+
+
+async def async_segmented_download(
+    session, url, path, *, size, md5, segments=4, segment_size=None, chunk_size=CHUNK_SIZE, progress=None
+):
+    state = _SegmentedDownload(path, size, md5, progress)
+    semaphore = asyncio.Semaphore(segments)
+
+    async def fetch(start, end):
+        async with semaphore:
+            async with session.get(url, headers=state.headers(start, end)) as resp:
+                with state.open(resp.status, start) as f:
+                    async for chunk in resp.content.iter_chunked(chunk_size):
+                        state.write(f, chunk)
+
+    tasks = [asyncio.ensure_future(fetch(start, end)) for start, end in _ranges(size, segments, segment_size)]
+    try:
+        await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+
+        # the partial file is only removed once every task stopped writing to it
+        await asyncio.gather(*tasks, return_exceptions=True)
+        state.abort()
+        raise
+
+    return state.finish()
+
+
+class DownloadQueue:
+    """This class is unique to the library and downloads a queue of modfiles one after the other,
+    making sure the url of each file is valid when its download starts. Download urls expire, so with
+    a long queue the urls of the last files may expire before their turn comes. Before each download,
+    if the url of the file expires within the margin, the urls of every file in the queue expiring
+    within the margin are requested again, with a single request per mod.
+
+    If a download fails the error is raised and the file stays at the head of the queue, running the
+    queue again resumes the download.
+
+    .. code-block:: python
+
+        queue = DownloadQueue()
+        for mod in mods:
+            queue.add(mod.file, "mods/")
+
+        paths = queue.run()
+
+    Parameters
+    -----------
+    margin : Optional[float]
+        How long before they expire urls are requested again, in seconds. It should leave enough
+        time for a download to complete. Defaults to 5 minutes.
+    segments : Optional[int]
+        If given, files are downloaded with :meth:`ModFile.segmented_download` in that many
+        concurrent ranges, else with :meth:`ModFile.download`.
+    chunk_size : Optional[int]
+        The size of the chunks streamed to disk in bytes, defaults to 1 MiB.
+    progress : Optional[Callable[[ModFile, int, int], Any]]
+        Called with the file, the number of bytes downloaded and the size of the file after every
+        chunk
+
+    """
+
+    def __init__(
+        self, *, margin: float = 300, segments: int = None, chunk_size: int = CHUNK_SIZE, progress=None
+    ):
+        self.margin = margin
+        self.segments = segments
+        self.chunk_size = chunk_size
+        self.progress = progress
+        self._queue = collections.deque()
+
+    def __repr__(self):
+        return f"<DownloadQueue files={len(self)}>"
+
+    def __len__(self):
+        return len(self._queue)
+
+    def add(self, file, path=None):
+        """Adds a file to the end of the queue.
+
+        Parameters
+        -----------
+        file : ModFile
+            The file to download
+        path : Optional[str]
+            The path to download the file to, see :meth:`ModFile.download`.
+
+        Raises
+        -------
+        modioException
+            The file was returned by the me/modfiles endpoint, its url cannot be requested again.
+        """
+        if not file.game_id:
+            raise modioException("The url of files returned by the me/modfiles endpoint cannot be refreshed")
+
+        self._queue.append((file, path))
+
+    def _expiring(self):
+        mods = {}
+        for file, _ in self._queue:
+            if file.url_is_expired(self.margin):
+                mods.setdefault((file.game_id, file.mod), {}).setdefault(file.id, []).append(file)
+
+        return mods
+
+    def _update(self, files, file_json):
+        for data in file_json:
+            for file in files.get(data["id"], []):
+                file.url = data["download"]["binary_url"]
+                file._date_expires_raw = data["download"]["date_expires"]
+                # the datetime cached by the descriptor is created again from the new timestamp
+                file.__dict__.pop("date_expires", None)
+                # the payload is shared with the mod the file belongs to, it is updated in place
+                if file._raw is not None:
+                    file._raw["download"].update(data["download"])
+
+    def refresh(self):
+        """Requests again the urls of every file in the queue which expire within the margin, with a
+        request per mod."""
+        for (game_id, mod_id), files in self._expiring().items():
+            connection = next(iter(files.values()))[0].connection
+            file_json = connection.get_all_request(
+                f"/games/{game_id}/mods/{mod_id}/files", filters=Filter().values_in(id=sorted(files))
+            )
+            self._update(files, file_json)
+
+    async def async_refresh(self):
+        for (game_id, mod_id), files in self._expiring().items():
+            connection = next(iter(files.values()))[0].connection
+            file_json = await connection.async_get_all_request(
+                f"/games/{game_id}/mods/{mod_id}/files", filters=Filter().values_in(id=sorted(files))
+            )
+            self._update(files, file_json)
+
+    def _options(self, file):
+        options = {"chunk_size": self.chunk_size}
+        if self.progress is not None:
+            options["progress"] = lambda done, total: self.progress(file, done, total)
+
+        if self.segments is not None:
+            options["segments"] = self.segments
+
+        return options
+
+    def run(self):
+        """Downloads every file in the queue.
+
+        |coro|
+
+        Raises
+        -------
+        modioException
+            A download failed
+
+        Returns
+        --------
+        List[str]
+            The paths of the files downloaded
+        """
+        paths = []
+        while self._queue:
+            file, path = self._queue[0]
+            if file.url_is_expired(self.margin):
+                self.refresh()
+
+            method = file.download if self.segments is None else file.segmented_download
+            paths.append(method(path, **self._options(file)))
+            self._queue.popleft()
+
+        return paths
+
+    async def async_run(self):
+        paths = []
+        while self._queue:
+            file, path = self._queue[0]
+            if file.url_is_expired(self.margin):
+                await self.async_refresh()
+
+            method = file.async_download if self.segments is None else file.async_segmented_download
+            paths.append(await method(path, **self._options(file)))
+            self._queue.popleft()
+
+        return paths
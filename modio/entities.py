@@ -2,10 +2,18 @@
 import time
 import json
 
-from .mixins import OwnerMixin, RatingMixin, ReportMixin, StatsMixin
+from .mixins import ConnectionMixin, OwnerMixin, RatingMixin, ReportMixin, StatsMixin
+from .download import (
+    CHUNK_SIZE,
+    _target,
+    async_download,
+    async_segmented_download,
+    download,
+    segmented_download,
+)
 from .errors import modioException
-from .utils import concat_docs, _convert_date
-from .enums import EventType, RatingType, TargetPlatform, VirusStatus, ModFilePlatformStatus
+from .utils import DateField, concat_docs, _api_to_event_type
+from .enums import RatingType, TargetPlatform, VirusStatus, ModFilePlatformStatus
 
 
 class Message:
@@ -94,33 +102,29 @@ class Event:
     date : datetime.datetime
         UNIX timestamp of the event occurrence. Filter attribute.
     type : EventType
-        Type of the event. Filter attribute.
+        Type of the event, None if the type is not known to the library. Filter attribute.
     game_id : int
         ID of the game that the mod the user change came from. Can be None if it is
         a mod event. Filter attribute.
 
     """
 
+    date = DateField()
+
     def __init__(self, **attrs):
         self.id = attrs.pop("id")
-        self.date = _convert_date(attrs.pop("date_added"))
+        self._date_raw = attrs.pop("date_added")
         self._raw_type = attrs.pop("event_type")
+        self.type = _api_to_event_type.get(self._raw_type)
         self.mod = attrs.pop("mod_id")
         self.user = attrs.pop("user_id")
         self.game_id = attrs.pop("game_id", None)
 
-    @property
-    def type(self):
-        if self._raw_type.startswith("MOD"):
-            return EventType[self._raw_type.replace("MOD_", "").replace("MOD", "").lower()]
-
-        return EventType[self._raw_type.replace("USER_", "").lower()]
-
     def __repr__(self):
-        return f"<Event id={self.id} type={self.type.name} mod={self.mod}>"
+        return f"<Event id={self.id} type={self._raw_type} mod={self.mod}>"
 
 
-class Comment:
+class Comment(ConnectionMixin):
     """Represents a comment on a mod page.
 
     Attributes
@@ -155,10 +159,13 @@ class Comment:
         the deepest level
     """
 
+    date = DateField()
+
     def __init__(self, **attrs):
+        self._store_raw(attrs, "mod")
         self.id = attrs.pop("id")
         self.resource_id = attrs.pop("resource_id")
-        self.date = _convert_date(attrs.pop("date_added"))
+        self._date_raw = attrs.pop("date_added")
         self.parent_id = attrs.pop("reply_id")
         self.position = attrs.pop("thread_position")
         self.level = len(self.position.split("."))
@@ -261,7 +268,7 @@ class Comment:
         return await self._async_add_karma(False)
 
 
-class ModFile(OwnerMixin):
+class ModFile(OwnerMixin, ConnectionMixin):
     """A object to represents modfiles. If the modfile has been returned for the me/modfile endpoint
     then edit() and delete() cannot be called as a game is lacking.
 
@@ -305,12 +312,16 @@ class ModFile(OwnerMixin):
     """
 
     _resource_type = "files"
+    date = DateField()
+    scanned = DateField()
+    date_expires = DateField()
 
     def __init__(self, **attrs):
+        self._store_raw(attrs, "game_id")
         self.id = attrs.pop("id")
         self.mod = attrs.pop("mod_id")
-        self.date = attrs.pop("date_added")
-        self.scanned = attrs.pop("date_scanned")
+        self._date_raw = attrs.pop("date_added")
+        self._scanned_raw = attrs.pop("date_scanned")
         self.virus_status = VirusStatus(attrs.pop("virus_status"))
         self.virus = bool(attrs.pop("virus_positive"))
         self.virus_hash = attrs.pop("virustotal_hash")
@@ -322,7 +333,7 @@ class ModFile(OwnerMixin):
         self.metadata = attrs.pop("metadata_blob")
         download = attrs.pop("download")
         self.url = download["binary_url"]
-        self.date_expires = _convert_date(download.pop("date_expires"))
+        self._date_expires_raw = download["date_expires"]
         self.game_id = attrs.pop("game_id", None)
         self.platforms = [ModFilePlatform(**platform) for platform in attrs.pop("platforms")]
         self.connection = attrs.pop("connection")
@@ -470,15 +481,146 @@ class ModFile(OwnerMixin):
         return self.__class__(connection=self.connection, game_id=self.game_id, **file_json)
 
 
-    def url_is_expired(self):
-        """Check if the url is still valid for this modfile.
+    def url_is_expired(self, margin: float = 0):
+        """Check if the url of this modfile has expired and must be requested again.
+
+        Parameters
+        -----------
+        margin : Optional[float]
+            Consider the url expired this many seconds before it actually expires, for example to
+            leave enough time for a download to complete. Defaults to 0.
 
         Returns
         -------
         bool
-            True if it's still valid, else False
+            True if the url has expired or expires within the margin, else False
+        """
+        return self._date_expires_raw - margin < time.time()
+
+    def download(self, path=None, *, chunk_size: int = CHUNK_SIZE, progress=None) -> str:
+        """Downloads the file, streaming it to disk in chunks so that it is never held in memory,
+        using the session of the client. The file is downloaded to a `.part` file next to the target
+        first, if the download is interrupted calling this again resumes it from where it stopped
+        with an HTTP range request. The md5 of the file is computed as it is downloaded and the file
+        is only moved to the target if it matches.
+
+        |coro|
+
+        Parameters
+        -----------
+        path : Optional[str]
+            The path to download the file to, if it is a directory the file is downloaded to it under
+            its filename. Defaults to the filename of the file in the current directory.
+        chunk_size : Optional[int]
+            The size of the chunks streamed to disk in bytes, defaults to 1 MiB.
+        progress : Optional[Callable[[int, int], Any]]
+            Called with the number of bytes downloaded and the size of the file after every chunk
+
+        Raises
+        -------
+        modioException
+            The download failed or the md5 of the file downloaded does not match
+
+        Returns
+        --------
+        str
+            The path of the file downloaded
+        """
+        return download(
+            self.connection.session,
+            self.url,
+            _target(path, self.filename),
+            size=self.size,
+            md5=self.hash,
+            chunk_size=chunk_size,
+            progress=progress,
+        )
+
+    async def async_download(self, path=None, *, chunk_size: int = CHUNK_SIZE, progress=None) -> str:
+        return await async_download(
+            self.connection.async_session,
+            self.url,
+            _target(path, self.filename),
+            size=self.size,
+            md5=self.hash,
+            chunk_size=chunk_size,
+            progress=progress,
+        )
+
+    def segmented_download(
+        self,
+        path=None,
+        *,
+        segments: int = 4,
+        segment_size: int = None,
+        chunk_size: int = CHUNK_SIZE,
+        progress=None,
+    ) -> str:
+        """Downloads the file in byte ranges requested concurrently, which is faster than
+        :meth:`download` for large files when the throughput of a single connection is the limit.
+        The ranges are written in place to a `.part` file preallocated to the size of the file and
+        the md5 of the file is verified once every range is downloaded. Unlike :meth:`download`,
+        an interrupted segmented download is started over.
+
+        |coro|
+
+        Parameters
+        -----------
+        path : Optional[str]
+            The path to download the file to, if it is a directory the file is downloaded to it under
+            its filename. Defaults to the filename of the file in the current directory.
+        segments : Optional[int]
+            The maximum number of ranges downloaded concurrently, defaults to 4.
+        segment_size : Optional[int]
+            The size of each range in bytes, defaults to splitting the file in `segments` ranges.
+        chunk_size : Optional[int]
+            The size of the chunks streamed to disk in bytes, defaults to 1 MiB.
+        progress : Optional[Callable[[int, int], Any]]
+            Called with the number of bytes downloaded and the size of the file after every chunk
+
+        Raises
+        -------
+        modioException
+            The download failed, the server does not support range requests or the md5 of the
+            file downloaded does not match.
+
+        Returns
+        --------
+        str
+            The path of the file downloaded
         """
-        return self.date_expires.timestamp() < time.time()
+        return segmented_download(
+            self.connection.session,
+            self.url,
+            _target(path, self.filename),
+            size=self.size,
+            md5=self.hash,
+            segments=segments,
+            segment_size=segment_size,
+            chunk_size=chunk_size,
+            progress=progress,
+        )
+
+    async def async_segmented_download(
+        self,
+        path=None,
+        *,
+        segments: int = 4,
+        segment_size: int = None,
+        chunk_size: int = CHUNK_SIZE,
+        progress=None,
+    ) -> str:
+        return await async_segmented_download(
+            self.connection.async_session,
+            self.url,
+            _target(path, self.filename),
+            size=self.size,
+            md5=self.hash,
+            segments=segments,
+            segment_size=segment_size,
+            chunk_size=chunk_size,
+            progress=progress,
+        )
 
 
 class ModMedia:
@@ -592,7 +734,7 @@ class TagOption:
         return f"<TagOption name={self.name} hidden={self.hidden} locked=>"
 
 
-class Rating(RatingMixin):
+class Rating(RatingMixin, ConnectionMixin):
     """Represents a rating, objects obtained from the get_my_ratings endpoint
 
     Attributes
@@ -609,12 +751,14 @@ class Rating(RatingMixin):
     """
 
     mod_key = "mod_id"
+    date = DateField()
 
     def __init__(self, **attrs):
+        self._store_raw(attrs)
         self.game_id = attrs.pop("game_id")
         self.mod_id = attrs.pop("mod_id")
         self.rating = RatingType(attrs.pop("rating"))
-        self.date = _convert_date(attrs.pop("date_added"))
+        self._date_raw = attrs.pop("date_added")
         self.connection = attrs.pop("connection")
 
     def __repr__(self) -> str:
@@ -657,13 +801,15 @@ class ModStats(StatsMixin):
         should be polled again when this expires.
     """
 
+    date_expires = DateField()
+
     def __init__(self, **attrs):
         self.id = attrs.pop("mod_id")
         self.rank = attrs.pop("popularity_rank_position")
         self.rank_total = attrs.pop("popularity_rank_total_mods")
         self.downloads = attrs.pop("downloads_total")
         self.subscribers = attrs.pop("subscribers_total")
-        self.date_expires = _convert_date(attrs.pop("date_expires"))
+        self._date_expires_raw = attrs.pop("date_expires")
         self.total = attrs.pop("ratings_total")
         self.positive = attrs.pop("ratings_positive")
         self.negative = attrs.pop("ratings_negative")
@@ -694,6 +840,8 @@ class GameStats(StatsMixin):
         and no longer accurate.
     """
 
+    date_expires = DateField()
+
     def __init__(self, **attrs):
         self.id = attrs.pop("game_id")
         self.mods_count_total = attrs.pop("mods_count_total")
@@ -701,7 +849,7 @@ class GameStats(StatsMixin):
         self.mods_downloads_total = attrs.pop("mods_downloads_total")
         self.mods_downloads_daily_avg = attrs.pop("mods_downloads_daily_average")
         self.mods_subscribers_total = attrs.pop("mods_subscribers_total")
-        self.date_expires = _convert_date(attrs.pop("date_expires"))
+        self._date_expires_raw = attrs.pop("date_expires")
 
 
 class Theme:
@@ -775,7 +923,7 @@ class Dependencies:
     """
 
 
-class User(ReportMixin):
+class User(ReportMixin, ConnectionMixin):
     """Represents a modio user.
 
     Attributes
@@ -800,12 +948,14 @@ class User(ReportMixin):
     """
 
     _resource_type = "users"
+    last_online = DateField()
 
     def __init__(self, **attrs):
+        self._store_raw(attrs)
         self.id = attrs.pop("id")
         self.name_id = attrs.pop("name_id")
         self.username = attrs.pop("username")
-        self.last_online = _convert_date(attrs.pop("date_online"))
+        self._last_online_raw = attrs.pop("date_online")
 
         avatar = attrs.pop("avatar")
         if avatar:
@@ -874,12 +1024,16 @@ class TeamMember(User):
 
     """
 
+    date = DateField()
+
     def __init__(self, **attrs):
+        raw = attrs.copy()
         self.connection = attrs.pop("connection")
         super().__init__(**attrs.pop("user"), connection=self.connection)
+        self._store_raw(raw, "mod")
         self.team_id = attrs.pop("id")
         self.level = attrs.pop("level")
-        self.date = attrs.pop("date_added")
+        self._date_raw = attrs.pop("date_added")
         self.position = attrs.pop("position")
         self.mod = attrs.pop("mod")
 
@@ -0,0 +1,246 @@
+"""Tailing and compaction of the event endpoints."""
+import asyncio
+
+from .client import MAX_WORKERS, PAGE_LIMIT
+from .crawl import Cursor
+from .enums import EventType
+from .mod import Mod
+from .objects import Filter
+
+# events which change the payload of a mod
+_mod_events = {
+    EventType.file_changed,
+    EventType.available,
+    EventType.unavailable,
+    EventType.edited,
+    EventType.deleted,
+}
+
+_removed_events = {EventType.deleted, EventType.unavailable}
+
+
+def compact(events):
+    """Collapses a batch of events to the latest event changing each mod. Events which do not change
+    the mod itself, such as comments and team changes, are dropped. For example a batch of twenty
+    edits of a mod followed by a file change is collapsed to the file change.
+
+    Parameters
+    -----------
+    events : Iterable[Event]
+        The events to compact
+
+    Returns
+    --------
+    Dict[Tuple[int, int], Event]
+        The latest event of each mod, keyed by game id and mod id
+    """
+    latest = {}
+    for event in events:
+        if event.type not in _mod_events:
+            continue
+
+        key = (event.game_id, event.mod)
+        current = latest.get(key)
+        if current is None or event.id > current.id:
+            latest[key] = event
+
+    return latest
+
+
+def _changes(events):
+    latest = compact(events)
+    changed = sorted(mod_id for (_, mod_id), event in latest.items() if event.type not in _removed_events)
+    removed = sorted(mod_id for (_, mod_id), event in latest.items() if event.type in _removed_events)
+    return changed, removed
+
+
+def _game_events(game, events):
+    return [event for event in events if event.game_id in (None, game.id)]
+
+
+def refetch(game, events):
+    """Compacts a batch of events of a game with :func:`compact` then requests every mod still
+    available in bulk, with a single `id-in` filter, instead of once per event. Mods which were
+    deleted or made unavailable are not requested.
+
+    .. code-block:: python
+
+        async for events in batches:
+            mods, removed = refetch(game, events)
+
+    Parameters
+    -----------
+    game : Game
+        The game of the events, events of other games are ignored.
+    events : Iterable[Event]
+        The events to compact
+
+    Returns
+    --------
+    Tuple[List[Mod], List[int]]
+        The mods changed by the events and the ids of the mods removed or which can no
+        longer be requested
+    """
+    changed, removed = _changes(_game_events(game, events))
+    mod_json = []
+    if changed:
+        mod_json = game.connection.get_all_request(
+            f"/games/{game.id}/mods", filters=Filter().values_in(id=changed)
+        )
+
+    mods = [Mod(connection=game.connection, **mod) for mod in mod_json]
+    return mods, sorted(set(removed) | set(changed) - {mod.id for mod in mods})
+
+
+async def async_refetch(game, events):
+    changed, removed = _changes(_game_events(game, events))
+    mod_json = []
+    if changed:
+        mod_json = await game.connection.async_get_all_request(
+            f"/games/{game.id}/mods", filters=Filter().values_in(id=changed)
+        )
+
+    mods = [Mod(connection=game.connection, **mod) for mod in mod_json]
+    return mods, sorted(set(removed) | set(changed) - {mod.id for mod in mods})
+
+
+class EventTailer:
+    """This class is unique to the library and represents a never ending async iterator over the
+    new events of an event endpoint such as `Game.async_get_mod_events`, `Mod.async_get_events` or
+    `Client.async_get_my_events`. The endpoint is polled in the background for events newer than the
+    last one, the interval between polls is halved every time new events are found and doubled every
+    time none are, within the bounds given. When the endpoint has a backlog of events, several pages
+    are requested concurrently and the endpoint is polled again without waiting. If a request fails
+    the error is raised by the iterator, iterating again resumes polling.
+
+    Events are buffered until they are consumed, once the buffer is full polling pauses until events
+    are consumed. The cursor is advanced once the last event of each page was consumed, if the cursor
+    has a path the tailer can therefore be resumed after a crash without missing events.
+
+    .. code-block:: python
+
+        cursor = modio.Cursor.load("events.cursor")
+        async with EventTailer(game.async_get_mod_events, cursor=cursor) as tailer:
+            async for event in tailer:
+                print(event)
+
+    Parameters
+    -----------
+    method : Callable[..., Awaitable[Returned]]
+        The async method of the event endpoint to tail
+    filters : Optional[Filter]
+        Filters to apply to the events, sorting and pagination are handled by the tailer.
+    cursor : Optional[Cursor]
+        The cursor to resume from, defaults to tailing from the first event of the endpoint.
+    min_interval : Optional[float]
+        The shortest time to wait between polls, in seconds. Defaults to 1.
+    max_interval : Optional[float]
+        The longest time to wait between polls, in seconds. Defaults to 60.
+    buffer : Optional[int]
+        The maximum number of events polled but not consumed yet. Defaults to 1000.
+    max_workers : Optional[int]
+        The maximum number of pages requested concurrently when draining a backlog.
+
+    Attributes
+    -----------
+    cursor : Cursor
+        The position of the tailer
+    interval : float
+        The current time waited between polls, in seconds
+    """
+
+    def __init__(
+        self,
+        method,
+        *,
+        filters: Filter = None,
+        cursor: Cursor = None,
+        min_interval: float = 1,
+        max_interval: float = 60,
+        buffer: int = 1000,
+        max_workers: int = MAX_WORKERS,
+    ):
+        self.method = method
+        self.cursor = cursor or Cursor()
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.interval = min_interval
+        self.max_workers = max_workers
+        self._filters = (filters or Filter()).freeze()
+        self._position = self.cursor.last_id
+        self._queue = asyncio.Queue(maxsize=buffer)
+        self._task = None
+
+    def __repr__(self):
+        return f"<EventTailer position={self.cursor.last_id} interval={self.interval}>"
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._produce())
+
+        event, last = await self._queue.get()
+        if isinstance(event, Exception):
+            self._task = None
+            raise event
+
+        if last:
+            self.cursor.advance(event.id)
+
+        return event
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await self.close()
+
+    async def close(self):
+        """Stops polling the endpoint."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def _poll(self):
+        filters = self._filters.with_params(
+            {"_sort": "id", "_limit": PAGE_LIMIT, "_offset": None, "id-min": self._position + 1}
+        )
+        events, pagination = await self.method(filters=filters)
+        offsets = range(PAGE_LIMIT, min(pagination.total, PAGE_LIMIT * self.max_workers), PAGE_LIMIT)
+        pages = await asyncio.gather(
+            *(self.method(filters=filters.with_offset(offset)) for offset in offsets)
+        )
+
+        pages = [events] + [page for page, _ in pages]
+        if events:
+            self._position = max(page[-1].id for page in pages if page)
+
+        return pages, pagination.total > sum(len(page) for page in pages)
+
+    async def _produce(self):
+        try:
+            while True:
+                pages, backlog = await self._poll()
+                for page in pages:
+                    for index, event in enumerate(page):
+                        await self._queue.put((event, index == len(page) - 1))
+
+                if backlog:
+                    self.interval = self.min_interval
+                    continue
+
+                if any(pages):
+                    self.interval = max(self.min_interval, self.interval / 2)
+                else:
+                    self.interval = min(self.max_interval, self.interval * 2)
+
+                await asyncio.sleep(self.interval)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            await self._queue.put((e, False))
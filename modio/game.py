@@ -1,16 +1,87 @@
 """Games are the umbrella entities under which all mods are stored."""
+import datetime
 import json
 from typing import List, Literal, Optional
 
 from .mod import Mod
 from .entities import Event, Image, Message, GameStats, ModStats, GamePlatform, TagOption, User
-from .objects import Filter, NewMod, Pagination, Returned
-from .utils import _convert_date, find
-from .enums import APIAccess, Community, Curation, MaturityOptions, Presentation, Revenue, Status, Submission
-from .mixins import OwnerMixin, ReportMixin
+from .objects import Filter, NewMod, Pagination, Returned, SyncResult
+from .utils import DateField, _convert_date, find
+from .enums import (
+    APIAccess,
+    Community,
+    Curation,
+    MaturityOptions,
+    Presentation,
+    Revenue,
+    Status,
+    Submission,
+    Visibility,
+)
+from .mixins import ConnectionMixin, OwnerMixin, ReportMixin
+
+
+def _sync_filters(filters, since, overlap):
+    filters = (filters or Filter()).freeze().with_params({"_sort": "id"})
+    if since is None:
+        return filters
+
+    if isinstance(since, datetime.datetime):
+        since = since.timestamp()
+
+    if isinstance(overlap, datetime.timedelta):
+        overlap = overlap.total_seconds()
+
+    return filters.with_params({"date_updated-min": int(since - overlap)})
+
+
+def _remove_synced(into, mod):
+    if not hasattr(into, "discard"):
+        into.pop(mod.id, None)
+    elif hasattr(into, "get"):
+        # catalogs may hold a previous copy of the mod rather than the mod itself
+        for old in into.get(id=mod.id):
+            into.discard(old)
+    else:
+        into.discard(mod)
+
+
+def _merge_sync(mods, since, into):
+    updated, removed = [], []
+    for mod in mods:
+        if mod.status is Status.deleted or mod.visible is Visibility.hidden:
+            removed.append(mod)
+            if into is not None:
+                _remove_synced(into, mod)
+        else:
+            updated.append(mod)
+            if into is None:
+                continue
+
+            if hasattr(into, "add"):
+                _remove_synced(into, mod)
+                into.add(mod)
+            else:
+                into[mod.id] = mod
+
+    if mods:
+        since = _convert_date(max(mod._updated_raw for mod in mods))
+    elif since is not None and not isinstance(since, datetime.datetime):
+        since = _convert_date(since)
+
+    return SyncResult(updated, removed, since)
+
 
+def _attach_stats(mods, stats_json):
+    stats = {data["mod_id"]: ModStats(**data) for data in stats_json}
+    for mod in mods:
+        if mod.id in stats:
+            mod.stats = stats[mod.id]
 
-class Game(ReportMixin, OwnerMixin):
+    return list(stats.values())
+
+
+class Game(ReportMixin, OwnerMixin, ConnectionMixin):
     """Represents an instance of a Game. Do not create manually.
 
     Attributes
@@ -78,13 +149,17 @@ class Game(ReportMixin, OwnerMixin):
     """
 
     _resource_type = "games"
+    date = DateField()
+    updated = DateField()
+    live = DateField()
 
     def __init__(self, **attrs):
+        self._store_raw(attrs)
         self.id = attrs.pop("id")
         self.status = Status(attrs.pop("status"))
-        self.date = _convert_date(attrs.pop("date_added"))
-        self.updated = _convert_date(attrs.pop("date_updated"))
-        self.live = _convert_date(attrs.pop("date_live"))
+        self._date_raw = attrs.pop("date_added")
+        self._updated_raw = attrs.pop("date_updated")
+        self._live_raw = attrs.pop("date_live")
         self.presentation = Presentation(attrs.pop("presentation_option"))
         self.submission = Submission(attrs.pop("submission_option"))
         self.curation = Curation(attrs.pop("curation_option"))
@@ -184,6 +259,57 @@ class Game(ReportMixin, OwnerMixin):
             [Mod(connection=self.connection, **mod) for mod in mod_json["data"]], Pagination(**mod_json)
         )
 
+    def sync_mods(self, *, since=None, into=None, overlap=300, filters: Filter = None) -> SyncResult:
+        """Fetches only the mods updated since a previous sync and merges them into an existing
+        collection, so that the cost of keeping a copy of the mods of a game up to date depends
+        on how many mods changed rather than on how many mods there are. Pages are requested by id
+        with :func:`crawl.crawl` rather than by offset so that mods updated while the sync runs do not
+        shift the pages and get skipped. Mods which were deleted or hidden are removed from the
+        collection, note that the API only returns such mods to game admins. |filterable|
+
+        .. code-block:: python
+
+            mods = modio.ModIndex()
+            result = game.sync_mods(into=mods)
+            ...
+            result = game.sync_mods(since=result.since, into=mods)
+
+        |coro|
+
+        Parameters
+        -----------
+        since : Optional[Union[datetime.datetime, int]]
+            The high-water mark returned by the previous sync, as a datetime or UNIX timestamp.
+            If omitted every mod is fetched.
+        into : Optional[Union[Catalog, dict]]
+            The collection to merge the mods into. Can be a :class:`Catalog`, any object with
+            `add` and `discard` methods or a dict of mods keyed by id.
+        overlap : Optional[Union[int, datetime.timedelta]]
+            How far before `since` to start fetching, in seconds, to account for clock skew
+            and updates made while the previous sync ran. Defaults to 5 minutes.
+        filters : Optional[Filter]
+            A instance of Filter to be used for filtering results, sorting and pagination are
+            handled by the method.
+
+        Returns
+        --------
+        SyncResult
+            The mods updated and removed and the new high-water mark
+        """
+        from .crawl import crawl
+
+        mods = list(crawl(self.get_mods, filters=_sync_filters(filters, since, overlap)))
+        return _merge_sync(mods, since, into)
+
+    async def async_sync_mods(
+        self, *, since=None, into=None, overlap=300, filters: Filter = None
+    ) -> SyncResult:
+        from .crawl import async_crawl
+
+        filters = _sync_filters(filters, since, overlap)
+        mods = [mod async for mod in async_crawl(self.async_get_mods, filters=filters)]
+        return _merge_sync(mods, since, into)
+
     def get_mod_events(self, *, filters: Filter = None) -> Returned[Event]:
         """Gets all the mod events available for this game sorted by latest event first. |filterable|
 
@@ -282,6 +408,40 @@ class Game(ReportMixin, OwnerMixin):
         stats_json = await self.connection.async_get_request(f"/games/{self.id}/mods/stats", filters=filters)
         return Returned([ModStats(**stats) for stats in stats_json["data"]], Pagination(**stats_json))
 
+    def attach_stats(self, mods: List[Mod]) -> List[ModStats]:
+        """Requests the stats of many mods at once and updates the `stats` attribute of each mod in
+        place, instead of calling :meth:`Mod.get_stats` for each of them. The stats are requested
+        a hundred mods at a time, concurrently. Mods the game has no stats for keep their stats.
+
+        |coro|
+
+        Parameters
+        -----------
+        mods : List[Mod]
+            The mods of this game to update
+
+        Returns
+        --------
+        List[ModStats]
+            The stats requested
+        """
+        if not mods:
+            return []
+
+        stats_json = self.connection.get_all_request(
+            f"/games/{self.id}/mods/stats", filters=Filter().values_in(mod_id=[mod.id for mod in mods])
+        )
+        return _attach_stats(mods, stats_json)
+
+    async def async_attach_stats(self, mods: List[Mod]) -> List[ModStats]:
+        if not mods:
+            return []
+
+        stats_json = await self.connection.async_get_all_request(
+            f"/games/{self.id}/mods/stats", filters=Filter().values_in(mod_id=[mod.id for mod in mods])
+        )
+        return _attach_stats(mods, stats_json)
+
     def add_mod(self, mod: NewMod) -> Mod:
         """Add a mod to this game.
 
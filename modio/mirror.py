@@ -0,0 +1,553 @@
+"""Local SQLite mirror of the mods of a game."""
+import asyncio
+import concurrent.futures
+import json
+import sqlite3
+from typing import List
+
+from .client import MAX_WORKERS, PAGE_LIMIT
+from .crawl import Cursor, async_crawl, async_partitioned_crawl, crawl, partitioned_crawl
+from .enums import Status, Visibility
+from .events import _changes
+from .errors import modioException
+from .mod import Mod
+from .objects import Filter, FrozenFilter, Pagination, Returned
+from .query import _number, _parse_key, evaluate
+
+_schema = """
+CREATE TABLE IF NOT EXISTS mods (
+    id INTEGER PRIMARY KEY,
+    game_id INTEGER,
+    status INTEGER,
+    visible INTEGER,
+    submitted_by INTEGER,
+    date_added INTEGER,
+    date_updated INTEGER,
+    date_live INTEGER,
+    maturity_option INTEGER,
+    name TEXT,
+    name_id TEXT,
+    modfile INTEGER,
+    downloads_total INTEGER,
+    subscribers_total INTEGER,
+    ratings_positive INTEGER,
+    ratings_negative INTEGER,
+    ratings_weighted_aggregate REAL,
+    popularity_rank_position INTEGER,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS mods_date_updated ON mods (date_updated);
+CREATE TABLE IF NOT EXISTS modfiles (
+    id INTEGER PRIMARY KEY,
+    mod_id INTEGER NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS modfiles_mod_id ON modfiles (mod_id);
+CREATE TABLE IF NOT EXISTS tags (
+    mod_id INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    PRIMARY KEY (mod_id, name)
+);
+CREATE INDEX IF NOT EXISTS tags_name ON tags (name);
+CREATE TABLE IF NOT EXISTS kvp (
+    mod_id INTEGER NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT
+);
+CREATE INDEX IF NOT EXISTS kvp_mod_id ON kvp (mod_id);
+CREATE TABLE IF NOT EXISTS dependencies (
+    mod_id INTEGER NOT NULL,
+    dependency_id INTEGER NOT NULL,
+    PRIMARY KEY (mod_id, dependency_id)
+);
+CREATE TABLE IF NOT EXISTS state (
+    key TEXT PRIMARY KEY,
+    value INTEGER
+);
+"""
+
+# column name -> path of the value in the mod payload
+_columns = {
+    "id": ("id",),
+    "game_id": ("game_id",),
+    "status": ("status",),
+    "visible": ("visible",),
+    "submitted_by": ("submitted_by", "id"),
+    "date_added": ("date_added",),
+    "date_updated": ("date_updated",),
+    "date_live": ("date_live",),
+    "maturity_option": ("maturity_option",),
+    "name": ("name",),
+    "name_id": ("name_id",),
+    "modfile": ("modfile", "id"),
+    "downloads_total": ("stats", "downloads_total"),
+    "subscribers_total": ("stats", "subscribers_total"),
+    "ratings_positive": ("stats", "ratings_positive"),
+    "ratings_negative": ("stats", "ratings_negative"),
+    "ratings_weighted_aggregate": ("stats", "ratings_weighted_aggregate"),
+    "popularity_rank_position": ("stats", "popularity_rank_position"),
+}
+
+_sort_columns = {
+    "downloads": "downloads_total",
+    "popular": "popularity_rank_position",
+    "rating": "ratings_weighted_aggregate",
+    "subscribers": "subscribers_total",
+}
+
+_comparisons = {"=": "=", "-not": "!=", "-min": ">=", "-max": "<=", "-st": "<", "-gt": ">"}
+
+_name_like = "name LIKE ? ESCAPE '\\'"
+
+
+def _extract(data, path):
+    for key in path:
+        if not isinstance(data, dict):
+            return None
+
+        data = data.get(key)
+
+    return data
+
+
+def _like(value):
+    value = str(value).replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return value.replace("*", "%")
+
+
+def _clause(field, operator, value):
+    """Translates a filter to an SQL clause and its arguments, returns None if it cannot be translated."""
+    values = [_number(x) for x in str(value).split(",") if x] if operator.endswith("-in") else None
+
+    if field == "tags":
+        if operator in ("=", "-not"):
+            clause, args = "name = ?", [value]
+        elif operator in ("-in", "-not-in"):
+            clause, args = f"name IN ({','.join('?' * len(values))})", values
+        elif operator in ("-lk", "-not-lk"):
+            clause, args = "name LIKE ? ESCAPE '\\'", [_like(value)]
+        else:
+            return None
+
+        exists = "NOT EXISTS" if "not" in operator else "EXISTS"
+        return f"{exists} (SELECT 1 FROM tags WHERE tags.mod_id = mods.id AND {clause})", args
+
+    if field == "metadata_kvp" and operator in ("=", "-not") and ":" in str(value):
+        key, _, kvp_value = str(value).partition(":")
+        exists = "NOT EXISTS" if operator == "-not" else "EXISTS"
+        return (
+            f"{exists} (SELECT 1 FROM kvp WHERE kvp.mod_id = mods.id AND key = ? AND value = ?)",
+            [key, kvp_value],
+        )
+
+    if field not in _columns:
+        return None
+
+    if operator in _comparisons:
+        return f"{field} {_comparisons[operator]} ?", [_number(value)]
+    if operator in ("-in", "-not-in"):
+        negate = "NOT " if operator == "-not-in" else ""
+        return f"{field} {negate}IN ({','.join('?' * len(values))})", values
+    if operator in ("-lk", "-not-lk"):
+        negate = "NOT " if operator == "-not-lk" else ""
+        return f"{field} {negate}LIKE ? ESCAPE '\\'", [_like(value)]
+
+    mask = int(_number(value))
+    return f"({field} & ?) = ?", [mask, mask]
+
+
+class Mirror:
+    """This class is unique to the library and represents a local copy of the mods of a game, along
+    with their current modfile, tags, metadata, dependencies and stats, stored in an SQLite database.
+    The mirror is filled once with :meth:`bootstrap` and then kept up to date by calling :meth:`update`
+    regularly which only requests the mods changed since the last update, based on the mod events of
+    the game. Mods can then be queried locally with the same filters as the API.
+
+    The mirror stores the payloads of the mods, the client of the game must therefore be created with
+    `keep_raw=True`.
+
+    .. code-block:: python
+
+        client = modio.Client(api_key="api key goes here", keep_raw=True)
+        game = client.get_game(345)
+
+        mirror = Mirror(game, "mods.db")
+        if not len(mirror):
+            mirror.bootstrap()
+
+        mirror.update()
+        mods, pagination = mirror.query(modio.Filter().equals(tags="Unity").sort("downloads", reverse=True))
+
+    Parameters
+    -----------
+    game : Game
+        The game to mirror
+    path : Optional[str]
+        The path of the database, defaults to an in-memory database.
+
+    """
+
+    def __init__(self, game, path=":memory:"):
+        if not game.connection.keep_raw:
+            raise modioException(
+                "Mirrors store the raw payload of mods, create the Client with keep_raw=True"
+            )
+
+        self.game = game
+        self.db = sqlite3.connect(path)
+        self.db.executescript(_schema)
+
+    def __repr__(self):
+        return f"<Mirror game={self.game.id} mods={len(self)}>"
+
+    def __len__(self):
+        return self.db.execute("SELECT COUNT(*) FROM mods").fetchone()[0]
+
+    def close(self):
+        """Closes the database."""
+        self.db.close()
+
+    def _get_state(self, key, default=None):
+        row = self.db.execute("SELECT value FROM state WHERE key = ?", (key,)).fetchone()
+        return default if row is None else row[0]
+
+    def _set_state(self, key, value):
+        with self.db:
+            self.db.execute("INSERT OR REPLACE INTO state (key, value) VALUES (?, ?)", (key, value))
+
+    def _mod(self, data):
+        return Mod(connection=self.game.connection, **json.loads(data))
+
+    def _store(self, mods):
+        columns = ", ".join(_columns)
+        placeholders = ", ".join("?" * (len(_columns) + 1))
+        ids = [(mod["id"],) for mod in mods]
+        with self.db:
+            self.db.executemany(
+                f"INSERT OR REPLACE INTO mods ({columns}, data) VALUES ({placeholders})",
+                [[_extract(mod, path) for path in _columns.values()] + [json.dumps(mod)] for mod in mods],
+            )
+            self.db.executemany("DELETE FROM tags WHERE mod_id = ?", ids)
+            self.db.executemany("DELETE FROM kvp WHERE mod_id = ?", ids)
+            self.db.executemany("DELETE FROM modfiles WHERE mod_id = ?", ids)
+            self.db.executemany(
+                "INSERT OR IGNORE INTO tags (mod_id, name) VALUES (?, ?)",
+                [(mod["id"], tag["name"]) for mod in mods for tag in mod.get("tags", [])],
+            )
+            self.db.executemany(
+                "INSERT INTO kvp (mod_id, key, value) VALUES (?, ?, ?)",
+                [
+                    (mod["id"], kvp["metakey"], kvp["metavalue"])
+                    for mod in mods
+                    for kvp in mod.get("metadata_kvp", [])
+                ],
+            )
+            self.db.executemany(
+                "INSERT OR REPLACE INTO modfiles (id, mod_id, data) VALUES (?, ?, ?)",
+                [
+                    (mod["modfile"]["id"], mod["id"], json.dumps(mod["modfile"]))
+                    for mod in mods
+                    if mod.get("modfile")
+                ],
+            )
+
+    def _remove(self, mod_ids):
+        ids = [(mod_id,) for mod_id in mod_ids]
+        with self.db:
+            for table in ("tags", "kvp", "modfiles", "dependencies"):
+                self.db.executemany(f"DELETE FROM {table} WHERE mod_id = ?", ids)
+
+            self.db.executemany("DELETE FROM mods WHERE id = ?", ids)
+
+    def _store_dependencies(self, dependencies):
+        with self.db:
+            self.db.executemany("DELETE FROM dependencies WHERE mod_id = ?", [(x,) for x in dependencies])
+            self.db.executemany(
+                "INSERT OR IGNORE INTO dependencies (mod_id, dependency_id) VALUES (?, ?)",
+                [(mod_id, x["mod_id"]) for mod_id, data in dependencies.items() for x in data],
+            )
+
+    def _merge(self, requested, mod_json, removed):
+        mods = [
+            mod
+            for mod in mod_json
+            if mod["status"] != Status.deleted.value and mod["visible"] != Visibility.hidden.value
+        ]
+        self._store(mods)
+
+        updated = {mod["id"] for mod in mods}
+        removed = sorted(set(removed) | (set(requested) - updated))
+        self._remove(removed)
+        return sorted(updated), removed
+
+    def _save_filters(self, filters):
+        params = {}
+        if filters is not None:
+            # sorting and pagination are handled by the mirror
+            filters = filters.freeze().with_params({"_sort": None, "_limit": None, "_offset": None})
+            params = dict(filters.get_dict())
+
+        self._set_state("filters", json.dumps(params))
+
+    def _update_filters(self, changed):
+        filters = FrozenFilter(json.loads(self._get_state("filters", "{}")))
+        return filters.with_params({"id-in": ",".join(str(mod_id) for mod_id in changed)})
+
+    def _latest_event_filters(self):
+        return Filter().sort("id", reverse=True).limit(1)
+
+    def bootstrap(
+        self, *, filters: Filter = None, dependencies: bool = False, max_workers: int = MAX_WORKERS
+    ):
+        """Fills the mirror with every mod of the game. The mods are crawled concurrently with
+        :func:`crawl.partitioned_crawl` and inserted in batches. The latest event of the game is
+        requested first so that the changes made during the crawl are picked up by the next update.
+
+        Parameters
+        -----------
+        filters : Optional[Filter]
+            A instance of Filter to restrict the mods mirrored, sorting and pagination are
+            handled by the method. The filter is stored in the mirror and applied by every
+            later update, mods which stop matching it are removed.
+        dependencies : Optional[bool]
+            Whether to also mirror the dependencies of every mod, this costs one extra request
+            per mod and every later update also refreshes the dependencies of the mods it
+            updates. Defaults to False.
+        max_workers : Optional[int]
+            The number of concurrent requests
+
+        Returns
+        --------
+        int
+            The number of mods in the mirror
+        """
+        events, _ = self.game.get_mod_events(filters=self._latest_event_filters())
+        batch = []
+        for mod in partitioned_crawl(self.game.get_mods, filters=filters, max_workers=max_workers):
+            batch.append(mod.to_dict())
+            if len(batch) >= PAGE_LIMIT:
+                self._store(batch)
+                batch = []
+
+        self._store(batch)
+        self._save_filters(filters)
+        self._set_state("last_event_id", events[0].id if events else 0)
+        self._set_state("dependencies", int(dependencies))
+        if dependencies:
+            self.refresh_dependencies(max_workers=max_workers)
+
+        return len(self)
+
+    async def async_bootstrap(
+        self, *, filters: Filter = None, dependencies: bool = False, max_workers: int = MAX_WORKERS
+    ):
+        events, _ = await self.game.async_get_mod_events(filters=self._latest_event_filters())
+        batch = []
+        async for mod in async_partitioned_crawl(
+            self.game.async_get_mods, filters=filters, max_workers=max_workers
+        ):
+            batch.append(mod.to_dict())
+            if len(batch) >= PAGE_LIMIT:
+                self._store(batch)
+                batch = []
+
+        self._store(batch)
+        self._save_filters(filters)
+        self._set_state("last_event_id", events[0].id if events else 0)
+        self._set_state("dependencies", int(dependencies))
+        if dependencies:
+            await self.async_refresh_dependencies(max_workers=max_workers)
+
+        return len(self)
+
+    def update(self):
+        """Brings the mirror up to date by requesting the mod events of the game since the last
+        update, then requesting every mod those events concern in bulk. Deleted, unavailable and
+        hidden mods, as well as mods which no longer match the filter the mirror was bootstrapped
+        with, are removed from the mirror.
+
+        Returns
+        --------
+        Tuple[List[int], List[int]]
+            The ids of the mods updated and the ids of the mods removed
+        """
+        cursor = Cursor(self._get_state("last_event_id", 0))
+        changed, removed = _changes(crawl(self.game.get_mod_events, cursor=cursor))
+
+        mod_json = []
+        if changed:
+            mod_json = self.game.connection.get_all_request(
+                f"/games/{self.game.id}/mods", filters=self._update_filters(changed)
+            )
+
+        updated, removed = self._merge(changed, mod_json, removed)
+        if updated and self._get_state("dependencies"):
+            self.refresh_dependencies(updated)
+
+        self._set_state("last_event_id", cursor.last_id)
+        return updated, removed
+
+    async def async_update(self):
+        cursor = Cursor(self._get_state("last_event_id", 0))
+        events = [event async for event in async_crawl(self.game.async_get_mod_events, cursor=cursor)]
+        changed, removed = _changes(events)
+
+        mod_json = []
+        if changed:
+            mod_json = await self.game.connection.async_get_all_request(
+                f"/games/{self.game.id}/mods", filters=self._update_filters(changed)
+            )
+
+        updated, removed = self._merge(changed, mod_json, removed)
+        if updated and self._get_state("dependencies"):
+            await self.async_refresh_dependencies(updated)
+
+        self._set_state("last_event_id", cursor.last_id)
+        return updated, removed
+
+    def refresh_dependencies(self, mod_ids=None, *, max_workers: int = MAX_WORKERS):
+        """Requests the dependencies of mods of the mirror, concurrently.
+
+        Parameters
+        -----------
+        mod_ids : Optional[List[int]]
+            The ids of the mods to refresh, defaults to every mod of the mirror.
+        max_workers : Optional[int]
+            The number of concurrent requests
+        """
+        if mod_ids is None:
+            mod_ids = [row[0] for row in self.db.execute("SELECT id FROM mods")]
+
+        connection = self.game.connection
+
+        def get_dependencies(mod_id):
+            return connection.get_all_request(
+                f"/games/{self.game.id}/mods/{mod_id}/dependencies", max_workers=1
+            )
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            self._store_dependencies(dict(zip(mod_ids, executor.map(get_dependencies, mod_ids))))
+
+    async def async_refresh_dependencies(self, mod_ids=None, *, max_workers: int = MAX_WORKERS):
+        if mod_ids is None:
+            mod_ids = [row[0] for row in self.db.execute("SELECT id FROM mods")]
+
+        semaphore = asyncio.Semaphore(max_workers)
+
+        async def get_dependencies(mod_id):
+            async with semaphore:
+                return await self.game.connection.async_get_all_request(
+                    f"/games/{self.game.id}/mods/{mod_id}/dependencies", max_workers=1
+                )
+
+        results = await asyncio.gather(*(get_dependencies(mod_id) for mod_id in mod_ids))
+        self._store_dependencies(dict(zip(mod_ids, results)))
+
+    def get_mod(self, mod_id: int) -> Mod:
+        """Returns a mod of the mirror. If the mod is not in the mirror it is requested from the
+        API and added to the mirror.
+
+        Parameters
+        -----------
+        mod_id : int
+            The id of the mod
+
+        Returns
+        --------
+        Mod
+            The mod
+        """
+        row = self.db.execute("SELECT data FROM mods WHERE id = ?", (mod_id,)).fetchone()
+        if row is not None:
+            return self._mod(row[0])
+
+        mod = self.game.get_mod(mod_id)
+        self._store([mod.to_dict()])
+        return mod
+
+    async def async_get_mod(self, mod_id: int) -> Mod:
+        row = self.db.execute("SELECT data FROM mods WHERE id = ?", (mod_id,)).fetchone()
+        if row is not None:
+            return self._mod(row[0])
+
+        mod = await self.game.async_get_mod(mod_id)
+        self._store([mod.to_dict()])
+        return mod
+
+    def get_dependencies(self, mod_id: int) -> List[int]:
+        """Returns the ids of the mods a mod of the mirror depends on, dependencies are only mirrored
+        if the mirror was bootstrapped with `dependencies=True`.
+
+        Parameters
+        -----------
+        mod_id : int
+            The id of the mod
+
+        Returns
+        --------
+        List[int]
+            The ids of the dependencies
+        """
+        rows = self.db.execute(
+            "SELECT dependency_id FROM dependencies WHERE mod_id = ? ORDER BY dependency_id", (mod_id,)
+        )
+        return [row[0] for row in rows]
+
+    def query(self, filters: Filter = None) -> Returned[Mod]:
+        """Returns the mods of the mirror which match a filter, with the same semantics as
+        :meth:`Game.get_mods`. Filters on the columns of the mirror, tags and metadata are
+        evaluated by the database, other filters are evaluated on the mods with
+        :func:`query.evaluate`.
+
+        Parameters
+        -----------
+        filters : Optional[Filter]
+            A instance of Filter to be used for filtering, paginating and sorting
+            results
+
+        Returns
+        --------
+        Returned[List[Mod], Pagination]
+            The results and pagination tuple of the query
+        """
+        params = (filters or Filter()).get_dict()
+        where, args, rest = [], [], {}
+        for key, value in params.items():
+            if key.startswith("_"):
+                continue
+
+            clause = _clause(*_parse_key(key), value)
+            if clause is None:
+                rest[key] = value
+            else:
+                where.append(clause[0])
+                args.extend(clause[1])
+
+        if params.get("_q"):
+            words = str(params["_q"]).split()
+            where.append(f"({' OR '.join([_name_like] * len(words))})")
+            args.extend(f"%{_like(word)}%" for word in words)
+
+        sql = f" FROM mods WHERE {' AND '.join(where)}" if where else " FROM mods"
+        sort = params.get("_sort")
+        column = _sort_columns.get(str(sort).lstrip("-"), str(sort).lstrip("-")) if sort else "id"
+
+        if rest or column not in _columns:
+            mods = [self._mod(row[0]) for row in self.db.execute(f"SELECT data{sql} ORDER BY id", args)]
+            rest.update({key: params[key] for key in ("_sort", "_limit", "_offset") if key in params})
+            return evaluate(FrozenFilter(rest), mods)
+
+        order = "DESC" if sort and sort.startswith("-") else "ASC"
+        offset = int(params.get("_offset", 0))
+        limit = int(params.get("_limit", PAGE_LIMIT))
+        total = self.db.execute(f"SELECT COUNT(*){sql}", args).fetchone()[0]
+        rows = self.db.execute(
+            f"SELECT data{sql} ORDER BY {column} IS NULL, {column} {order}, id LIMIT ? OFFSET ?",
+            [*args, limit, offset],
+        )
+        mods = [self._mod(row[0]) for row in rows]
+
+        pagination = Pagination(
+            result_count=len(mods), result_limit=limit, result_offset=offset, result_total=total
+        )
+        return Returned(mods, pagination)
@@ -1,7 +1,9 @@
 """Module storing all mixins for shared methods"""
+import json
 import time
 
 from .enums import RatingType, Report
+from .errors import modioException
 from . import entities
 
 
@@ -133,6 +135,80 @@ class OwnerMixin:
         return entities.User(connection=self.connection, **user)
 
 
+class ConnectionMixin:
+    """Mixin for entities which hold a connection. The connection is dropped when
+    the entity is pickled so that it can be sent to other processes, use
+    :meth:`Client.attach` to attach the entity to a client again once it has been
+    unpickled. If the client was created with `keep_raw` the entity also keeps a
+    reference to the payload it was created from.
+    """
+
+    _raw = None
+
+    def _store_raw(self, attrs, *injected):
+        if getattr(attrs.get("connection"), "keep_raw", False):
+            self._raw = {
+                key: value for key, value in attrs.items() if key != "connection" and key not in injected
+            }
+
+    def to_dict(self) -> dict:
+        """Returns the payload this entity was created from, as it was returned by the
+        mod.io API. The payload is returned as is rather than rebuilt from the attributes
+        of the entity so changes made to the entity after its creation are not reflected.
+
+        Raises
+        -------
+        modioException
+            The client was not created with `keep_raw`
+
+        Returns
+        --------
+        dict
+            The payload of the entity
+        """
+        if self._raw is None:
+            raise modioException("The raw payload was not kept, create the Client with keep_raw=True")
+
+        return self._raw
+
+    def to_json(self, **kwargs) -> str:
+        """Returns the payload this entity was created from encoded as JSON, keyword
+        arguments are passed to :func:`json.dumps`.
+
+        Raises
+        -------
+        modioException
+            The client was not created with `keep_raw`
+
+        Returns
+        --------
+        str
+            The JSON encoded payload of the entity
+        """
+        return json.dumps(self.to_dict(), **kwargs)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["connection"] = None
+        return state
+
+    def _attach(self, connection, seen):
+        if id(self) in seen:
+            return
+
+        seen.add(id(self))
+        self.connection = connection
+        for value in self.__dict__.values():
+            if isinstance(value, dict):
+                value = value.values()
+            elif not isinstance(value, (list, tuple, set)):
+                value = (value,)
+
+            for item in value:
+                if isinstance(item, ConnectionMixin):
+                    item._attach(connection, seen)
+
+
 class StatsMixin:
     """Shared is_stale method."""
 
@@ -147,4 +223,4 @@ class StatsMixin:
         bool
             True if stats are expired, False else.
         """
-        return self.date_expires.timestamp() < time.time()
+        return self._date_expires_raw < time.time()
@@ -2,7 +2,7 @@
 from typing import List, Optional, Union
 from .enums import Level, Maturity, Status, Visibility
 from .errors import modioException
-from .mixins import OwnerMixin, RatingMixin, ReportMixin
+from .mixins import ConnectionMixin, OwnerMixin, RatingMixin, ReportMixin
 from .entities import (
     Comment,
     Event,
@@ -15,10 +15,11 @@ from .entities import (
     User,
 )
 from .objects import Filter, NewModFile, Pagination, Returned
-from .utils import _convert_date, _clean_and_convert
+from .upload import BUFFER_SIZE, MultipartUpload
+from .utils import DateField, _comment_tree, _convert_date, _clean_and_convert
 
 
-class Mod(ReportMixin, RatingMixin, OwnerMixin):
+class Mod(ReportMixin, RatingMixin, OwnerMixin, ConnectionMixin):
     """Represent a modio mod object.
 
     Filter-Only Attributes
@@ -94,16 +95,20 @@ class Mod(ReportMixin, RatingMixin, OwnerMixin):
 
     _resource_type = "mods"
     mod_key = "id"
+    date = DateField()
+    updated = DateField()
+    live = DateField()
 
     def __init__(self, **attrs):
+        self._store_raw(attrs)
         self.id = attrs.pop("id")
         self.status = Status(attrs.pop("status"))
         self.visible = Visibility(attrs.pop("visible"))
         self.game_id = attrs.pop("game_id")
         # self.game_name = attrs.pop("game_name")
-        self.date = _convert_date(attrs.pop("date_added"))
-        self.updated = _convert_date(attrs.pop("date_updated"))
-        self.live = _convert_date(attrs.pop("date_live"))
+        self._date_raw = attrs.pop("date_added")
+        self._updated_raw = attrs.pop("date_updated")
+        self._live_raw = attrs.pop("date_live")
         self.logo = Image(**attrs.pop("logo"))
         self.homepage = attrs.pop("homepage_url", None)
         self.name = attrs.pop("name")
@@ -322,6 +327,38 @@ class Mod(ReportMixin, RatingMixin, OwnerMixin):
             Pagination(**depen_json),
         )
 
+    def resolve_dependencies(self, *, resolver=None) -> List["Mod"]:
+        """Returns every mod this mod depends on, directly or through other mods, in the order they
+        should be installed. Each mod comes after the mods it depends on and this mod is last. See
+        :class:`DependencyResolver` for how the dependency graph is requested.
+
+        |coro|
+
+        Parameters
+        -----------
+        resolver : Optional[DependencyResolver]
+            The resolver to use, pass the same resolver when resolving several mods so that the
+            dependencies they share are only requested once.
+
+        Raises
+        -------
+        modioException
+            A dependency could not be found or the dependencies are circular
+
+        Returns
+        --------
+        List[Mod]
+            The install plan of the mod
+        """
+        from .dependencies import DependencyResolver
+
+        return (resolver or DependencyResolver()).resolve(self)
+
+    async def async_resolve_dependencies(self, *, resolver=None) -> List["Mod"]:
+        from .dependencies import DependencyResolver
+
+        return await (resolver or DependencyResolver()).async_resolve(self)
+
     def get_team(self, *, filters: Filter = None) -> Returned[TeamMember]:
         """Returns a list of TeamMember object representing the Team in charge of the mod. |filterable|
 
@@ -355,9 +392,8 @@ class Mod(ReportMixin, RatingMixin, OwnerMixin):
         )
 
     def get_comments(self, *, filters: Filter = None) -> Returned[Comment]:
-        """Returns a list of all the top level comments for this mod wih comments replying
-        to top level comments stored in the children attribute. This can be flattened using
-        the utils.flatten function. |filterable|
+        """Returns a list of the comments for this mod, replies are returned alongside the comments
+        they reply to. Use :meth:`get_comment_tree` to get the comments nested by thread. |filterable|
 
         |coro|
 
@@ -389,6 +425,41 @@ class Mod(ReportMixin, RatingMixin, OwnerMixin):
             Pagination(**comment_json),
         )
 
+    def get_comment_tree(self, *, filters: Filter = None) -> List[Comment]:
+        """Returns a list of the top level comments for this mod with the replies to each comment
+        stored in its children attribute. Every page of comments is requested, concurrently after the
+        first one, and the tree is then assembled in a single pass. The comments of each level keep
+        the order they were returned in. The tree can be flattened again with :func:`utils.flatten`.
+        |filterable|
+
+        |coro|
+
+        Parameters
+        -----------
+        filter : Optional[Filter]
+            A instance of Filter to be used for filtering and sorting results, pagination is handled
+            by the method.
+
+        Returns
+        --------
+        List[Comment]
+            The top level comments
+        """
+        comment_json = self.connection.get_all_request(
+            f"/games/{self.game_id}/mods/{self.id}/comments", filters=filters
+        )
+        return _comment_tree(
+            [Comment(**comment, connection=self.connection, mod=self) for comment in comment_json]
+        )
+
+    async def async_get_comment_tree(self, *, filters: Filter = None) -> List[Comment]:
+        comment_json = await self.connection.async_get_all_request(
+            f"/games/{self.game_id}/mods/{self.id}/comments", filters=filters
+        )
+        return _comment_tree(
+            [Comment(**comment, connection=self.connection, mod=self) for comment in comment_json]
+        )
+
     def add_comment(self, content: str, *, reply: int = None) -> Comment:
         """Add a comment to the mod page. You can specify a comment to reply too.
 
@@ -503,9 +574,11 @@ class Mod(ReportMixin, RatingMixin, OwnerMixin):
         self.status = 3
         return resp
 
-    def add_file(self, file: NewModFile) -> ModFile:
+    def add_file(self, file: NewModFile, *, buffer_size: int = BUFFER_SIZE, progress=None) -> ModFile:
         """Adds a new file to the mod, to do so first construct an instance of NewModFile
-        and then pass it to the function.
+        and then pass it to the function. The file is streamed from disk as it is uploaded and
+        its md5 is computed at the same time, so it is only read once. The md5 is then stored in
+        the `filehash` attribute of the NewModFile.
 
         |coro|
 
@@ -513,6 +586,11 @@ class Mod(ReportMixin, RatingMixin, OwnerMixin):
         -----------
         file : NewModFile
             The mod file to upload
+        buffer_size : Optional[int]
+            The size of the reads from the file in bytes, defaults to 8 MiB.
+        progress : Optional[Callable[[int, int, float], Any]]
+            Called with the number of bytes sent, the size of the file and the average throughput
+            in bytes per second as the file is uploaded.
 
         Raises
         -------
@@ -527,22 +605,28 @@ class Mod(ReportMixin, RatingMixin, OwnerMixin):
         """
         file_d = file.__dict__.copy()
         file_file = file_d.pop("file")
+        file_d.pop("filehash")
 
-        with open(file_file, "rb") as f:
-            file_json = self.connection.post_request(
-                f"/games/{self.game_id}/mods/{self.id}/files", h_type=1, data=file_d, files={"filedata": f}
-            )
+        upload = MultipartUpload(file_file, file_d, buffer_size=buffer_size, progress=progress)
+        file_json = self.connection.post_request(
+            f"/games/{self.game_id}/mods/{self.id}/files", h_type=1, data=upload, headers=upload.headers
+        )
+        file.filehash = upload.md5
 
         return ModFile(**file_json, game_id=self.game_id, connection=self.connection)
 
-    async def async_add_file(self, file: NewModFile) -> ModFile:
+    async def async_add_file(
+        self, file: NewModFile, *, buffer_size: int = BUFFER_SIZE, progress=None
+    ) -> ModFile:
         file_d = file.__dict__.copy()
         file_file = file_d.pop("file")
+        file_d.pop("filehash")
 
-        with open(file_file, "rb") as f:
-            file_json = await self.connection.async_post_request(
-                f"/games/{self.game_id}/mods/{self.id}/files", h_type=1, data=file_d, files={"filedata": f}
-            )
+        upload = MultipartUpload(file_file, file_d, buffer_size=buffer_size, progress=progress)
+        file_json = await self.connection.async_post_request(
+            f"/games/{self.game_id}/mods/{self.id}/files", h_type=1, data=upload, headers=upload.headers
+        )
+        file.filehash = upload.md5
 
         return ModFile(**file_json, game_id=self.game_id, connection=self.connection)
 
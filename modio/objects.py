@@ -2,12 +2,12 @@
 
 import datetime
 import enum
-import hashlib
+import types
 import typing
 import typing_extensions
 
 from .enums import EventType, Maturity, Visibility
-from .utils import _lib_to_api
+from .utils import _event_type_to_api, _lib_to_api
 
 
 class NewMod:
@@ -93,13 +93,6 @@ class NewModFile:
         self.file = None
         self.filehash = None
 
-    def _file_hash(self, file):
-        hash_md5 = hashlib.md5()
-        with open(file, "rb") as f:
-            for chunk in iter(lambda: f.read(4096), b""):
-                hash_md5.update(chunk)
-        return hash_md5.hexdigest()
-
     def add_file(self, path):
         """Used to add a file.
 
@@ -113,6 +106,9 @@ class NewModFile:
                 unless the game manages this
             - Mods which overwrite files are not supported unless the game manages this
 
+        The file is not read until it is uploaded, its md5 is computed as it is
+        uploaded and stored in `filehash` afterwards.
+
         Parameters
         -----------
         path : str
@@ -120,7 +116,7 @@ class NewModFile:
 
         """
         self.file = path
-        self.filehash = self._file_hash(path)
+        self.filehash = None
 
         return self
 
@@ -168,11 +164,8 @@ class Filter:
         except KeyError:
             pass
 
-        if key == "event_type":
-            if value.value < 8:
-                value = f"MOD{'_' if value != EventType.file_changed else ''}{value.name.upper()}"
-            else:
-                value = f"USER_{value.name.upper()}"
+        if isinstance(value, EventType):
+            value = _event_type_to_api[value]
 
         if isinstance(value, datetime.datetime):
             value = int(value.timestamp())
@@ -349,6 +342,157 @@ class Filter:
         """
         return {key: value for key, value in self.__dict__.items() if value is not None}
 
+    def freeze(self):
+        """Returns an immutable and hashable copy of the filter which can be passed anywhere a
+        filter is accepted. Changes made to this filter afterwards do not affect the copy.
+
+        Returns
+        --------
+        FrozenFilter
+            The frozen filter
+        """
+        return FrozenFilter(self.get_dict())
+
+
+class FrozenFilter:
+    """This class is unique to the library and represents an immutable version of a :class:`Filter`,
+    obtained through :meth:`Filter.freeze`. The parameters are normalized once when the frozen
+    filter is created so frozen filters can be compared, hashed and used as dictionnary keys as well
+    as shared safely between threads and coroutines. Frozen filters can be passed anywhere a
+    filter is accepted.
+
+    Attributes
+    -----------
+    params : Tuple[Tuple[str, Union[str, int]]]
+        The parameters of the filter sorted by name
+    """
+
+    __slots__ = ("params", "_dict", "_hash")
+
+    def __init__(self, params):
+        params = {key: value for key, value in params.items() if value is not None}
+        object.__setattr__(self, "params", tuple(sorted(params.items())))
+        object.__setattr__(self, "_dict", params)
+        object.__setattr__(self, "_hash", hash(self.params))
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{self.__class__.__name__} is immutable, use thaw to get a mutable Filter")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{self.__class__.__name__} is immutable, use thaw to get a mutable Filter")
+
+    def __repr__(self):
+        return f"< FrozenFilter filters={self._dict}>"
+
+    def __hash__(self):
+        return self._hash
+
+    def __eq__(self, other):
+        if not isinstance(other, FrozenFilter):
+            return NotImplemented
+
+        return self._hash == other._hash and self.params == other.params
+
+    def __reduce__(self):
+        return (self.__class__, (self._dict,))
+
+    @property
+    def _q(self):
+        return self._dict.get("_q")
+
+    @property
+    def _sort(self):
+        return self._dict.get("_sort")
+
+    @property
+    def _limit(self):
+        return self._dict.get("_limit")
+
+    @property
+    def _offset(self):
+        return self._dict.get("_offset")
+
+    def get_dict(self):
+        """Returns a read-only view of the parameters of the filter, the view is
+        not rebuilt on each call.
+
+        Returns
+        ---------
+        Mapping[str, Union[str, int]]
+            The mapping of filters
+        """
+        return types.MappingProxyType(self._dict)
+
+    def freeze(self):
+        """Returns the frozen filter itself.
+
+        Returns
+        --------
+        FrozenFilter
+            The frozen filter
+        """
+        return self
+
+    def with_params(self, params):
+        """Returns a new frozen filter with the given parameters replaced, parameters
+        set to None are removed. Parameters must be in modio format.
+
+        Parameters
+        -----------
+        params : dict
+            The parameters to replace
+
+        Returns
+        --------
+        FrozenFilter
+            The new frozen filter
+        """
+        return FrozenFilter({**self._dict, **params})
+
+    def with_offset(self, offset):
+        """Returns a new frozen filter with a different offset.
+
+        Parameters
+        -----------
+        offset : int
+            The number of results to skip.
+
+        Returns
+        --------
+        FrozenFilter
+            The new frozen filter
+        """
+        return self.with_params({"_offset": offset})
+
+    def with_limit(self, limit):
+        """Returns a new frozen filter with a different limit.
+
+        Parameters
+        -----------
+        limit : int
+            Limit of returned results for the query
+
+        Returns
+        --------
+        FrozenFilter
+            The new frozen filter
+        """
+        return self.with_params({"_limit": limit})
+
+    def thaw(self):
+        """Returns a mutable :class:`Filter` with the same parameters.
+
+        Returns
+        --------
+        Filter
+            The mutable filter
+        """
+        filters = Filter()
+        for key, value in self._dict.items():
+            setattr(filters, key, value)
+
+        return filters
+
 
 class Pagination:
     """This class is unique to the library and represents the pagination
@@ -418,6 +562,26 @@ class Returned(typing_extensions.NamedTuple, typing.Generic[Result]):
     pagination: Pagination
 
 
+class SyncResult(typing_extensions.NamedTuple):
+    """A named tuple returned by :meth:`Game.sync_mods` describing the changes of an
+    incremental sync.
+
+    Attributes
+    ----------
+    updated : List[Mod]
+        The mods which were added or updated since the last sync
+    removed : List[Mod]
+        The mods which were deleted or hidden since the last sync
+    since : Optional[datetime.datetime]
+        The high-water mark of the sync, the latest update date among the mods fetched.
+        It should be stored and passed as `since` to the next sync.
+    """
+
+    updated: typing.List[typing.Any]
+    removed: typing.List[typing.Any]
+    since: typing.Optional[datetime.datetime]
+
+
 class Object:
     """A dud class that can be used to replace other classes, keyword arguments
     passed will become attributes.
@@ -0,0 +1,298 @@
+"""Local evaluation of filters against models which were already fetched."""
+import bisect
+import datetime
+import enum
+import re
+
+from .client import PAGE_LIMIT
+from .objects import Filter, Pagination, Returned
+from .utils import _lib_to_api, _missing, _resolve_attr
+
+_operators = (
+    "-not-lk",
+    "-not-in",
+    "-bitwise-and",
+    "-not",
+    "-lk",
+    "-in",
+    "-min",
+    "-max",
+    "-st",
+    "-gt",
+)
+
+_api_to_lib = {}
+for _lib, _api in _lib_to_api.items():
+    _api_to_lib.setdefault(_api, []).append(_lib)
+
+# API columns which are nested in another model in the library
+_nested = {
+    "submitted_by": "submitter",
+    "modfile": "file",
+    "downloads_total": "stats.downloads",
+    "subscribers_total": "stats.subscribers",
+    "ratings_positive": "stats.positive",
+    "ratings_negative": "stats.negative",
+    "ratings_weighted_aggregate": "stats.weighted",
+    "popularity_rank_position": "stats.rank",
+    "downloads": "stats.downloads",
+    "popular": "stats.rank",
+    "rating": "stats.weighted",
+    "subscribers": "stats.subscribers",
+}
+
+_paths = {}
+
+
+def _normalize(value):
+    if isinstance(value, datetime.datetime):
+        return int(value.timestamp())
+
+    if isinstance(value, enum.Enum):
+        return value.value
+
+    if isinstance(value, bool):
+        return int(value)
+
+    if isinstance(value, dict):
+        if all(isinstance(x, list) for x in value.values()):
+            return {f"{key}:{x}" for key, values in value.items() for x in values} | set(value)
+
+        return set(value)
+
+    if isinstance(value, (list, tuple, set)):
+        return {_normalize(x) for x in value}
+
+    if hasattr(value, "id"):
+        return value.id
+
+    return value
+
+
+def _number(value):
+    if isinstance(value, str):
+        try:
+            number = float(value)
+        except ValueError:
+            return value
+
+        return int(number) if number.is_integer() else number
+
+    return value
+
+
+def _coerce(value, like):
+    if isinstance(like, (int, float)) and not isinstance(like, bool):
+        return _number(value)
+
+    if isinstance(like, str) and not isinstance(value, str):
+        return str(value)
+
+    return value
+
+
+def _pattern(value):
+    return re.compile(".*".join(re.escape(part) for part in str(value).split("*")), re.IGNORECASE)
+
+
+def _resolve(item, field):
+    path = _paths.get((type(item), field))
+    if path is None:
+        candidates = [field, _nested.get(field), *_api_to_lib.get(field, ())]
+        for candidate in filter(None, candidates):
+            if _resolve_attr(item, candidate) is not _missing:
+                path = _paths[(type(item), field)] = candidate
+                break
+        else:
+            raw = getattr(item, "_raw", None) or {}
+            return _normalize(raw.get(field, _missing))
+
+    return _normalize(_resolve_attr(item, path))
+
+
+def _parse_key(key):
+    for operator in _operators:
+        if key.endswith(operator):
+            return key[: -len(operator)], operator
+
+    return key, "="
+
+
+class _Condition:
+    def __init__(self, key, value):
+        self.field, self.operator = _parse_key(key)
+        self.value = value
+        if self.operator in ("-in", "-not-in"):
+            self.value = [x for x in str(value).split(",") if x]
+        elif self.operator in ("-lk", "-not-lk"):
+            self.value = _pattern(value)
+
+    def __call__(self, item):
+        value = _resolve(item, self.field)
+        if value is _missing or value is None:
+            return self.operator in ("-not", "-not-in", "-not-lk")
+
+        if isinstance(value, set):
+            return self._contains(value)
+
+        try:
+            return self._compare(value)
+        except TypeError:
+            return False
+
+    def _contains(self, values):
+        operator = self.operator
+        if operator in ("=", "-not"):
+            found = any(_coerce(self.value, x) == x for x in values)
+        elif operator in ("-in", "-not-in"):
+            found = any(_coerce(y, x) == x for x in values for y in self.value)
+        elif operator in ("-lk", "-not-lk"):
+            found = any(self.value.fullmatch(str(x)) for x in values)
+        else:
+            return False
+
+        return found if "not" not in operator else not found
+
+    def _compare(self, value):
+        operator = self.operator
+        if operator == "=":
+            return value == _coerce(self.value, value)
+        if operator == "-not":
+            return value != _coerce(self.value, value)
+        if operator == "-lk":
+            return self.value.fullmatch(str(value)) is not None
+        if operator == "-not-lk":
+            return self.value.fullmatch(str(value)) is None
+        if operator == "-in":
+            return any(value == _coerce(x, value) for x in self.value)
+        if operator == "-not-in":
+            return all(value != _coerce(x, value) for x in self.value)
+        if operator == "-min":
+            return value >= _coerce(self.value, value)
+        if operator == "-max":
+            return value <= _coerce(self.value, value)
+        if operator == "-st":
+            return value < _coerce(self.value, value)
+        if operator == "-gt":
+            return value > _coerce(self.value, value)
+
+        mask = int(_number(self.value))
+        return value & mask == mask
+
+    def narrow(self, catalog):
+        """Returns the models of a catalog which can match the condition using one of its indexes
+        or None if the condition cannot use an index."""
+        name = ("query", self.field)
+
+        def key(item):
+            return _resolve(item, self.field)
+
+        if self.operator in ("=", "-in"):
+            index = catalog._index(name, key)
+            if index is None:
+                return None
+
+            values = [self.value] if self.operator == "=" else self.value
+            items = {}
+            for value in values:
+                for candidate in {value, _number(value), str(value)}:
+                    for item in index.get(candidate, ()):
+                        items[id(item)] = item
+
+            return list(items.values())
+
+        if self.operator in ("-min", "-max", "-st", "-gt"):
+            pairs = catalog._range(name, key)
+            if pairs is None or not pairs[0]:
+                return None if pairs is None else []
+
+            values, items = pairs
+            bound = _coerce(self.value, values[0])
+            try:
+                if self.operator == "-min":
+                    return items[bisect.bisect_left(values, bound) :]
+                if self.operator == "-gt":
+                    return items[bisect.bisect_right(values, bound) :]
+                if self.operator == "-max":
+                    return items[: bisect.bisect_right(values, bound)]
+                return items[: bisect.bisect_left(values, bound)]
+            except TypeError:
+                return None
+
+        return None
+
+
+def _text(item, words):
+    name = _resolve(item, "name")
+    if not isinstance(name, str):
+        return False
+
+    name = name.lower()
+    return any(word in name for word in words)
+
+
+def _sorted(items, key):
+    reverse = key.startswith("-")
+    field = key.lstrip("-")
+    present, absent = [], []
+    for item in items:
+        value = _resolve(item, field)
+        if value is _missing or value is None or isinstance(value, set):
+            absent.append(item)
+        else:
+            present.append((value, item))
+
+    present.sort(key=lambda pair: pair[0], reverse=reverse)
+    return [pair[1] for pair in present] + absent
+
+
+def evaluate(filters, items):
+    """Evaluates a filter against a collection of models the same way the API would evaluate it
+    against its database, this allows the same filters to be used whether the models are
+    requested from the API or were already fetched. Filter columns are looked up under both
+    their API name and their library name, e.g. `date_added` matches against `date` and
+    `downloads_total` against `stats.downloads`. As with the API, the results are limited to 100
+    models unless a limit is set in the filter.
+
+    If the collection is a :class:`Catalog` its indexes are used to narrow down the models
+    which need to be checked.
+
+    .. code-block:: python
+
+        filters = modio.Filter().text("HD").sort("downloads", reverse=True).limit(10)
+        mods, pagination = evaluate(filters, mods)
+
+    Parameters
+    -----------
+    filters : Optional[Filter]
+        The filter to evaluate
+    items : Iterable[Any]
+        The models to evaluate the filter against
+
+    Returns
+    --------
+    Returned[List[Any], Pagination]
+        The models which match the filter and the pagination tuple of the results
+    """
+    params = (filters or Filter()).get_dict()
+    conditions = [_Condition(key, value) for key, value in params.items() if not key.startswith("_")]
+
+    narrow = getattr(items, "_narrow", None)
+    candidates = narrow(conditions) if narrow is not None else items
+    results = [item for item in candidates if all(condition(item) for condition in conditions)]
+
+    if params.get("_q"):
+        words = str(params["_q"]).lower().split()
+        results = [item for item in results if _text(item, words)]
+
+    if params.get("_sort"):
+        results = _sorted(results, params["_sort"])
+
+    offset = int(params.get("_offset", 0))
+    limit = int(params.get("_limit", PAGE_LIMIT))
+    page = results[offset : offset + limit]
+
+    pagination = Pagination(
+        result_count=len(page), result_limit=limit, result_offset=offset, result_total=len(results)
+    )
+    return Returned(page, pagination)
@@ -0,0 +1,281 @@
+"""Scheduling of the polling of many games under a single ratelimit."""
+import asyncio
+import logging
+import time
+
+from .client import PAGE_LIMIT
+from .crawl import Cursor
+from .objects import Filter
+
+
+class TokenBucket:
+    """This class is unique to the library and represents a request budget which refills at a
+    constant rate up to a maximum, allowing short bursts of requests while keeping the average rate
+    of requests under the refill rate.
+
+    Parameters
+    -----------
+    rate : float
+        The number of requests allowed per second on average
+    burst : Optional[int]
+        The maximum number of requests which can be made at once, defaults to 1.
+
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self._updated = time.monotonic()
+
+    def __repr__(self):
+        return f"<TokenBucket rate={self.rate} burst={self.burst} tokens={self.tokens}>"
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self):
+        """Waits until a request can be made and takes it from the budget."""
+        self._refill()
+        while self.tokens < 1:
+            await asyncio.sleep((1 - self.tokens) / self.rate)
+            self._refill()
+
+        self.tokens -= 1
+
+
+class _Job:
+    def __init__(self, game, kind, weight, freshness, callback):
+        self.game = game
+        self.kind = kind
+        self.weight = weight
+        self.freshness = freshness
+        self.callback = callback
+        self.due = 0
+        self.finish = 0
+        self.rate = 0
+        self.polled = None
+        self.running = False
+
+    def __repr__(self):
+        return f"<_Job game={self.game.id} kind={self.kind} rate={self.rate}>"
+
+
+async def _call(callback, *args):
+    result = callback(*args)
+    if asyncio.iscoroutine(result):
+        await result
+
+
+class Scheduler:
+    """This class is unique to the library and multiplexes the polling of the mod events and stats
+    of many games over a single request budget. Every game has a priority, the budget is shared
+    between the games which need to be polled proportionally to their priority using weighted fair
+    queuing, so that busy games cannot starve others. Every game also has a freshness, the longest
+    time it may go without being polled. Within that bound, games are polled more often the more
+    events they are observed to have, so that idle games do not waste requests.
+
+    Stats are polled when the stats previously returned expire, or at the freshness of the game if
+    that comes first.
+
+    .. code-block:: python
+
+        async def on_events(game, events):
+            ...
+
+        scheduler = Scheduler(rate=1, burst=5)
+        for game in games:
+            scheduler.add_game(game, on_events=on_events)
+
+        await scheduler.run()
+
+    Parameters
+    -----------
+    rate : Optional[float]
+        The number of requests per second shared between every game, defaults to 1.
+    burst : Optional[int]
+        The number of requests which can be made at once, defaults to 5.
+    min_interval : Optional[float]
+        The shortest time between two polls of the same game, in seconds. Defaults to 1.
+    max_concurrency : Optional[int]
+        The maximum number of requests made concurrently, defaults to 4.
+
+    Attributes
+    -----------
+    bucket : TokenBucket
+        The request budget of the scheduler
+    """
+
+    def __init__(self, *, rate: float = 1, burst: int = 5, min_interval: float = 1, max_concurrency: int = 4):
+        self.bucket = TokenBucket(rate, burst)
+        self.min_interval = min_interval
+        self._jobs = []
+        self._cursors = {}
+        self._virtual = 0
+        self._semaphore = None
+        self._wakeup = None
+        self._running = False
+        self._max_concurrency = max_concurrency
+
+    def __repr__(self):
+        return f"<Scheduler jobs={len(self._jobs)} running={self._running}>"
+
+    def add_game(
+        self,
+        game,
+        *,
+        on_events=None,
+        on_stats=None,
+        priority: float = 1,
+        freshness: float = 60,
+        cursor: Cursor = None,
+    ):
+        """Adds a game to poll, can be called while the scheduler runs.
+
+        Parameters
+        -----------
+        game : Game
+            The game to poll
+        on_events : Optional[Callable[[Game, List[Event]], Any]]
+            Called with the game and the new mod events of the game every time new events are found,
+            can be a coroutine function. The events of the game are not polled if omitted.
+        on_stats : Optional[Callable[[Game, GameStats], Any]]
+            Called with the game and its stats every time the stats are polled, can be a coroutine
+            function. The stats of the game are not polled if omitted.
+        priority : Optional[float]
+            The share of the budget the game gets relative to other games, defaults to 1.
+        freshness : Optional[float]
+            The longest time between two polls of the game, in seconds. Defaults to 60.
+        cursor : Optional[Cursor]
+            The cursor of the events of the game, defaults to polling only events created
+            after the game is added.
+        """
+        if on_events is not None:
+            self._cursors[game.id] = cursor
+            self._jobs.append(_Job(game, "events", priority, freshness, on_events))
+
+        if on_stats is not None:
+            self._jobs.append(_Job(game, "stats", priority, freshness, on_stats))
+
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def remove_game(self, game):
+        """Stops polling a game.
+
+        Parameters
+        -----------
+        game : Game
+            The game to stop polling
+        """
+        self._jobs = [job for job in self._jobs if job.game.id != game.id]
+        self._cursors.pop(game.id, None)
+
+    def stop(self):
+        """Stops the scheduler, polls in progress are completed."""
+        self._running = False
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def _next_job(self, now):
+        due = [job for job in self._jobs if not job.running and job.due <= now]
+        if not due:
+            return None
+
+        # start-time fair queuing, the job which started its share of the budget the
+        # earliest goes first, ties go to the job with the most weight
+        return min(due, key=lambda job: (max(self._virtual, job.finish), 1 / job.weight))
+
+    async def run(self):
+        """Polls the games until :meth:`stop` is called."""
+        self._running = True
+        self._semaphore = asyncio.Semaphore(self._max_concurrency)
+        self._wakeup = asyncio.Event()
+        tasks = set()
+        loop = asyncio.get_event_loop()
+
+        while self._running:
+            if self._next_job(loop.time()) is None:
+                waiting = [job.due for job in self._jobs if not job.running]
+                timeout = max(min(waiting) - loop.time(), 0) if waiting else None
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+
+                continue
+
+            # the job is only picked once a request can be made so that the jobs
+            # which became due while waiting get their fair share
+            await self._semaphore.acquire()
+            await self.bucket.acquire()
+            job = self._next_job(loop.time())
+            if job is None:
+                self._semaphore.release()
+                continue
+
+            start = max(self._virtual, job.finish)
+            job.finish = start + 1 / job.weight
+            self._virtual = start
+            job.running = True
+
+            task = asyncio.ensure_future(self._poll(job, loop))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+
+        if tasks:
+            await asyncio.gather(*tasks)
+
+    async def _poll(self, job, loop):
+        try:
+            if job.kind == "events":
+                interval = await self._poll_events(job, loop.time())
+            else:
+                interval = await self._poll_stats(job)
+        except Exception:
+            logging.exception("Failed to poll the %s of game %s", job.kind, job.game.id)
+            interval = job.freshness
+        finally:
+            job.running = False
+            self._semaphore.release()
+
+        job.due = loop.time() + interval
+        self._wakeup.set()
+
+    async def _poll_events(self, job, now):
+        cursor = self._cursors[job.game.id]
+        if cursor is None:
+            latest, _ = await job.game.async_get_mod_events(
+                filters=Filter().sort("id", reverse=True).limit(1)
+            )
+            cursor = self._cursors[job.game.id] = Cursor(latest[0].id if latest else 0)
+            job.polled = now
+            return self.min_interval
+
+        filters = Filter().sort("id").limit(PAGE_LIMIT).min(id=cursor.last_id + 1)
+        events, _ = await job.game.async_get_mod_events(filters=filters)
+        if events:
+            await _call(job.callback, job.game, events)
+            cursor.advance(events[-1].id)
+
+        if job.polled is not None and now > job.polled:
+            job.rate = 0.5 * job.rate + 0.5 * len(events) / (now - job.polled)
+
+        job.polled = now
+
+        if len(events) >= PAGE_LIMIT:
+            return 0
+
+        if not job.rate:
+            return job.freshness
+
+        return min(max(1 / job.rate, self.min_interval), job.freshness)
+
+    async def _poll_stats(self, job):
+        stats = await job.game.async_get_stats()
+        await _call(job.callback, job.game, stats)
+        expires = stats._date_expires_raw - time.time()
+        return min(max(expires, self.min_interval), job.freshness)
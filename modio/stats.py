@@ -0,0 +1,215 @@
+"""Caching and batched refreshing of mod stats."""
+import asyncio
+import concurrent.futures
+import logging
+import time
+
+from .client import MAX_WORKERS, PAGE_LIMIT
+from .objects import Filter
+
+
+class StatsManager:
+    """This class is unique to the library and keeps the stats of a set of mods of a game fresh. The
+    stats of every mod tracked are cached until shortly before they expire, then every stats about to
+    expire are refreshed together, requesting up to a hundred mods at once through
+    :meth:`Game.get_mods_stats` instead of once per mod through :meth:`Mod.get_stats`. Mods tracked
+    as :class:`Mod` objects have their `stats` attribute updated in place.
+
+    Stats can either be refreshed lazily, as they are requested with :meth:`get`, or in the background
+    by running :meth:`run`.
+
+    .. code-block:: python
+
+        stats = StatsManager(game)
+        stats.track(*mods)
+
+        asyncio.ensure_future(stats.run())
+        ...
+        print(stats.get(mod.id).downloads)
+
+    Parameters
+    -----------
+    game : Game
+        The game of the mods
+    margin : Optional[float]
+        How long before they expire stats are refreshed, in seconds. Defaults to 30.
+    max_workers : Optional[int]
+        The maximum number of batches requested concurrently
+    min_interval : Optional[float]
+        The shortest time between two refreshes made by :meth:`run`, in seconds. Defaults to 1.
+
+    """
+
+    def __init__(self, game, *, margin: float = 30, max_workers: int = MAX_WORKERS, min_interval: float = 1):
+        self.game = game
+        self.margin = margin
+        self.max_workers = max_workers
+        self.min_interval = min_interval
+        self._stats = {}
+        self._mods = {}
+
+    def __repr__(self):
+        return f"<StatsManager game={self.game.id} tracked={len(self._stats)}>"
+
+    def __len__(self):
+        return len(self._stats)
+
+    def __contains__(self, mod_id):
+        return mod_id in self._stats
+
+    def track(self, *mods):
+        """Starts tracking the stats of mods. The stats of mods already tracked are kept.
+
+        Parameters
+        -----------
+        mods : Union[Mod, int]
+            The mods to track, either mod objects, whose stats are used until they need refreshing,
+            or mod ids, whose stats are requested on the next refresh.
+        """
+        for mod in mods:
+            if isinstance(mod, int):
+                self._stats.setdefault(mod, None)
+                continue
+
+            self._mods[mod.id] = mod
+            if self._stats.get(mod.id) is None:
+                self._stats[mod.id] = mod.stats
+
+    def untrack(self, *mod_ids: int):
+        """Stops tracking the stats of mods.
+
+        Parameters
+        -----------
+        mod_ids : int
+            The ids of the mods
+        """
+        for mod_id in mod_ids:
+            self._stats.pop(mod_id, None)
+            self._mods.pop(mod_id, None)
+
+    def _is_due(self, mod_id, now):
+        stats = self._stats.get(mod_id)
+        return stats is None or stats._date_expires_raw - self.margin <= now
+
+    def _due(self, now):
+        return sorted(mod_id for mod_id in self._stats if self._is_due(mod_id, now))
+
+    def next_refresh(self) -> float:
+        """Returns the number of seconds until stats need to be refreshed, 0 if some already do.
+
+        Returns
+        --------
+        Optional[float]
+            The time until the next refresh in seconds, None if no mods are tracked
+        """
+        if not self._stats:
+            return None
+
+        now = time.time()
+        if any(stats is None for stats in self._stats.values()):
+            return 0
+
+        return max(min(stats._date_expires_raw for stats in self._stats.values()) - self.margin - now, 0)
+
+    def _batches(self, mod_ids):
+        for index in range(0, len(mod_ids), PAGE_LIMIT):
+            batch = mod_ids[index : index + PAGE_LIMIT]
+            yield Filter().values_in(mod_id=batch).limit(PAGE_LIMIT)
+
+    def _update(self, mod_ids, results):
+        refreshed = []
+        for stats in results:
+            if stats.id not in self._stats:
+                continue
+
+            self._stats[stats.id] = stats
+            if stats.id in self._mods:
+                self._mods[stats.id].stats = stats
+
+            refreshed.append(stats)
+
+        # mods which no longer have stats were deleted or hidden
+        self.untrack(*(set(mod_ids) - {stats.id for stats in refreshed}))
+        return refreshed
+
+    def refresh(self, *, force: bool = False):
+        """Refreshes in batches the stats which expire within the margin. Mods the game no longer
+        has stats for are no longer tracked.
+
+        Parameters
+        -----------
+        force : Optional[bool]
+            Refresh the stats of every mod tracked, even if they are not about to expire.
+
+        Returns
+        --------
+        List[ModStats]
+            The stats refreshed
+        """
+        mod_ids = sorted(self._stats) if force else self._due(time.time())
+        if not mod_ids:
+            return []
+
+        def get_batch(filters):
+            return self.game.get_mods_stats(filters=filters).results
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            pages = list(executor.map(get_batch, self._batches(mod_ids)))
+
+        return self._update(mod_ids, (stats for page in pages for stats in page))
+
+    async def async_refresh(self, *, force: bool = False):
+        mod_ids = sorted(self._stats) if force else self._due(time.time())
+        if not mod_ids:
+            return []
+
+        semaphore = asyncio.Semaphore(self.max_workers)
+
+        async def get_batch(filters):
+            async with semaphore:
+                return (await self.game.async_get_mods_stats(filters=filters)).results
+
+        pages = await asyncio.gather(*(get_batch(filters) for filters in self._batches(mod_ids)))
+        return self._update(mod_ids, (stats for page in pages for stats in page))
+
+    def get(self, mod_id: int):
+        """Returns the stats of a mod, tracking the mod if it was not already. If the stats are about
+        to expire, they are refreshed along with every other stats about to expire.
+
+        Parameters
+        -----------
+        mod_id : int
+            The id of the mod
+
+        Returns
+        --------
+        Optional[ModStats]
+            The stats of the mod, None if the game has no stats for the mod
+        """
+        self.track(mod_id)
+        if self._is_due(mod_id, time.time()):
+            self.refresh()
+
+        return self._stats.get(mod_id)
+
+    async def async_get(self, mod_id: int):
+        self.track(mod_id)
+        if self._is_due(mod_id, time.time()):
+            await self.async_refresh()
+
+        return self._stats.get(mod_id)
+
+    async def run(self):
+        """Refreshes the stats shortly before they expire until cancelled. Refreshes are at least
+        `min_interval` apart, even if the stats refreshed already expire within the margin, and a
+        failed refresh is logged and tried again on the next iteration."""
+        while True:
+            delay = self.next_refresh()
+            await asyncio.sleep(max(self.margin if delay is None else delay, self.min_interval))
+            if delay is None:
+                continue
+
+            try:
+                await self.async_refresh()
+            except Exception:
+                logging.exception("Failed to refresh the stats of game %s", self.game.id)
@@ -0,0 +1,377 @@
+"""Compact storage of the stats of mods over time."""
+import array
+import bisect
+import datetime
+import itertools
+import os
+import struct
+import sys
+import time
+import zlib
+
+from .entities import ModStats
+from .errors import modioException
+
+_magic = b"MODIOTS1"
+
+# timestamp, number of mods, keyframe flag, length of the compressed payload
+_header = struct.Struct("<qIBI")
+
+COLUMNS = ("downloads", "subscribers", "rank", "positive", "negative")
+
+
+def _pack(values):
+    data = array.array("q", values)
+    if sys.byteorder == "big":
+        data.byteswap()
+
+    return data.tobytes()
+
+
+def _unpack(data):
+    values = array.array("q")
+    values.frombytes(data)
+    if sys.byteorder == "big":
+        values.byteswap()
+
+    return values
+
+
+def _timestamp(value):
+    if isinstance(value, datetime.datetime):
+        return int(value.timestamp())
+
+    return value
+
+
+class StatsTimeSeries:
+    """This class is unique to the library and stores periodic snapshots of the stats of the mods of
+    a game in a single append-only file. Each snapshot is stored column by column, the mod ids as the
+    difference with the previous id and every stat as the difference with the value of the same mod in
+    the previous snapshot, then compressed. Since most stats change little between snapshots the
+    differences are mostly zeros and compress to a few bytes per mod. Every `keyframe_interval`
+    snapshots the values are stored whole, so reading a range of snapshots only decodes from the
+    keyframe before it.
+
+    The stats stored are those listed in :data:`COLUMNS`: downloads, subscribers, rank, positive and
+    negative.
+
+    .. code-block:: python
+
+        with StatsTimeSeries("stats.bin") as series:
+            series.record(game)
+            ...
+            downloads_per_day = series.rate(mod.id)
+
+    Parameters
+    -----------
+    path : str
+        The file to store the snapshots in, created if it does not exist.
+    keyframe_interval : Optional[int]
+        The number of snapshots between two snapshots stored whole, defaults to 32.
+
+    """
+
+    def __init__(self, path, *, keyframe_interval: int = 32):
+        self.path = path
+        self.keyframe_interval = keyframe_interval
+        self._timestamps = []
+        self._offsets = []
+        self._keyframes = []
+        self._last = None
+        self._file = open(path, "a+b")
+        self._load()
+
+    def __repr__(self):
+        return f"<StatsTimeSeries path={self.path} snapshots={len(self)}>"
+
+    def __len__(self):
+        return len(self._timestamps)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        """Closes the file."""
+        self._file.close()
+
+    def _load(self):
+        size = os.fstat(self._file.fileno()).st_size
+        if not size:
+            self._file.write(_magic)
+            self._file.flush()
+            return
+
+        self._file.seek(0)
+        if self._file.read(len(_magic)) != _magic:
+            self._file.close()
+            raise modioException(f"{self.path} is not a stats time series")
+
+        position = len(_magic)
+        while position + _header.size <= size:
+            timestamp, _, keyframe, length = _header.unpack(self._file.read(_header.size))
+            if position + _header.size + length > size:
+                break
+
+            if keyframe:
+                self._keyframes.append(len(self._timestamps))
+
+            self._timestamps.append(timestamp)
+            self._offsets.append(position)
+            position += _header.size + length
+            self._file.seek(position)
+
+        # a snapshot only partly written when the process stopped is discarded
+        if position != size:
+            self._file.truncate(position)
+
+    def _read(self, index):
+        self._file.seek(self._offsets[index])
+        _, count, keyframe, length = _header.unpack(self._file.read(_header.size))
+        columns = _unpack(zlib.decompress(self._file.read(length)))
+        return count, keyframe, columns
+
+    def _snapshots(self, start, stop):
+        """Decodes the snapshots from start to stop, starting from the keyframe before start."""
+        if start >= stop:
+            return
+
+        index = self._keyframes[bisect.bisect_right(self._keyframes, start) - 1]
+        previous = {}
+        for index in range(index, stop):
+            count, keyframe, columns = self._read(index)
+            mod_id, snapshot = 0, {}
+            for position in range(count):
+                mod_id += columns[position]
+                values = columns[count + position :: count]
+                if not keyframe and mod_id in previous:
+                    values = tuple(a + b for a, b in zip(values, previous[mod_id]))
+                else:
+                    values = tuple(values)
+
+                snapshot[mod_id] = values
+
+            previous = snapshot
+            if index >= start:
+                yield self._timestamps[index], snapshot
+
+    def _snapshot(self, index):
+        return next(self._snapshots(index, index + 1))
+
+    def _values(self, start, stop, mod_id, column):
+        """Decodes the value of a single stat of a mod from start to stop, starting from the keyframe
+        before start. Only the id column is accumulated, to find the position of the mod with a
+        bisection, the other values are read at that position only."""
+        if start >= stop:
+            return
+
+        index = self._keyframes[bisect.bisect_right(self._keyframes, start) - 1]
+        value = None
+        for index in range(index, stop):
+            count, keyframe, columns = self._read(index)
+            ids = list(itertools.accumulate(columns[:count]))
+            position = bisect.bisect_left(ids, mod_id)
+            if position == count or ids[position] != mod_id:
+                # the value of a mod missing from a snapshot is stored whole in the next one
+                value = None
+                continue
+
+            delta = columns[count * (column + 1) + position]
+            value = delta if keyframe or value is None else value + delta
+            if index >= start:
+                yield self._timestamps[index], value
+
+    def _indices(self, start, end):
+        low = 0 if start is None else bisect.bisect_left(self._timestamps, _timestamp(start))
+        high = len(self) if end is None else bisect.bisect_right(self._timestamps, _timestamp(end))
+        return low, high
+
+    def append(self, stats, timestamp=None):
+        """Appends a snapshot of stats.
+
+        Parameters
+        -----------
+        stats : Iterable[ModStats]
+            The stats of the mods at the time of the snapshot
+        timestamp : Optional[Union[datetime.datetime, int]]
+            The time of the snapshot, defaults to now.
+
+        Raises
+        -------
+        modioException
+            The snapshot is older than the last snapshot stored
+        """
+        timestamp = int(time.time()) if timestamp is None else _timestamp(timestamp)
+        if self._timestamps and timestamp < self._timestamps[-1]:
+            raise modioException("Snapshots must be appended in chronological order")
+
+        snapshot = {stat.id: tuple(getattr(stat, column) for column in COLUMNS) for stat in stats}
+        keyframe = len(self) % self.keyframe_interval == 0
+        if not keyframe and self._last is None:
+            _, self._last = self._snapshot(len(self) - 1)
+
+        mod_ids = sorted(snapshot)
+        columns = [b - a for a, b in zip([0] + mod_ids, mod_ids)]
+        for column in range(len(COLUMNS)):
+            for mod_id in mod_ids:
+                value = snapshot[mod_id][column]
+                if not keyframe and mod_id in self._last:
+                    value -= self._last[mod_id][column]
+
+                columns.append(value)
+
+        payload = zlib.compress(_pack(columns))
+        self._file.seek(0, os.SEEK_END)
+        position = self._file.tell()
+        self._file.write(_header.pack(timestamp, len(mod_ids), keyframe, len(payload)) + payload)
+        self._file.flush()
+
+        if keyframe:
+            self._keyframes.append(len(self))
+
+        self._timestamps.append(timestamp)
+        self._offsets.append(position)
+        self._last = snapshot
+
+    def record(self, game):
+        """Requests the stats of every mod of a game and appends them as a snapshot.
+
+        |coro|
+
+        Parameters
+        -----------
+        game : Game
+            The game to take a snapshot of
+        """
+        stats_json = game.connection.get_all_request(f"/games/{game.id}/mods/stats")
+        self.append(ModStats(**stats) for stats in stats_json)
+
+    async def async_record(self, game):
+        stats_json = await game.connection.async_get_all_request(f"/games/{game.id}/mods/stats")
+        self.append(ModStats(**stats) for stats in stats_json)
+
+    @property
+    def timestamps(self):
+        """List[int] : The UNIX timestamps of the snapshots stored"""
+        return list(self._timestamps)
+
+    def series(self, mod_id: int, column: str = "downloads", *, start=None, end=None):
+        """Returns the values of a stat of a mod over time.
+
+        Parameters
+        -----------
+        mod_id : int
+            The id of the mod
+        column : Optional[str]
+            The stat, one of :data:`COLUMNS`. Defaults to downloads.
+        start : Optional[Union[datetime.datetime, int]]
+            The time of the first snapshot to include, defaults to the first snapshot.
+        end : Optional[Union[datetime.datetime, int]]
+            The time of the last snapshot to include, defaults to the last snapshot.
+
+        Returns
+        --------
+        List[Tuple[int, int]]
+            The UNIX timestamp and the value of each snapshot of the range the mod is part of
+        """
+        low, high = self._indices(start, end)
+        return list(self._values(low, high, mod_id, COLUMNS.index(column)))
+
+    def totals(self, column: str = "downloads", *, start=None, end=None):
+        """Returns the sum of a stat over every mod of the game over time.
+
+        Parameters
+        -----------
+        column : Optional[str]
+            The stat, one of :data:`COLUMNS`. Defaults to downloads.
+        start : Optional[Union[datetime.datetime, int]]
+            The time of the first snapshot to include, defaults to the first snapshot.
+        end : Optional[Union[datetime.datetime, int]]
+            The time of the last snapshot to include, defaults to the last snapshot.
+
+        Returns
+        --------
+        List[Tuple[int, int]]
+            The UNIX timestamp and the total of each snapshot of the range
+        """
+        column = COLUMNS.index(column)
+        low, high = self._indices(start, end)
+        return [
+            (timestamp, sum(values[column] for values in snapshot.values()))
+            for timestamp, snapshot in self._snapshots(low, high)
+        ]
+
+    def rates(self, column: str = "downloads", *, start=None, end=None, per: int = 86400):
+        """Returns how fast a stat changed for every mod over a range of time, computed from the
+        first and last snapshot of the range. Mods missing from either snapshot are left out.
+
+        Parameters
+        -----------
+        column : Optional[str]
+            The stat, one of :data:`COLUMNS`. Defaults to downloads.
+        start : Optional[Union[datetime.datetime, int]]
+            The start of the range, defaults to the first snapshot.
+        end : Optional[Union[datetime.datetime, int]]
+            The end of the range, defaults to the last snapshot.
+        per : Optional[int]
+            The unit of time of the rates in seconds, defaults to a day.
+
+        Returns
+        --------
+        Dict[int, float]
+            The change of the stat per unit of time of each mod, keyed by mod id
+        """
+        column = COLUMNS.index(column)
+        low, high = self._indices(start, end)
+        if high - low < 2:
+            return {}
+
+        # only the two ends of the range are decoded, each from the keyframe before it
+        first_time, first = self._snapshot(low)
+        last_time, last = self._snapshot(high - 1)
+        if last_time == first_time:
+            return {}
+
+        scale = per / (last_time - first_time)
+        return {
+            mod_id: (values[column] - first[mod_id][column]) * scale
+            for mod_id, values in last.items()
+            if mod_id in first
+        }
+
+    def rate(self, mod_id: int = None, column: str = "downloads", *, start=None, end=None, per: int = 86400):
+        """Returns how fast a stat changed for a mod, or for the whole game, over a range of time.
+        For example the downloads per day of a mod over the last week.
+
+        Parameters
+        -----------
+        mod_id : Optional[int]
+            The id of the mod, defaults to the total of every mod of the game.
+        column : Optional[str]
+            The stat, one of :data:`COLUMNS`. Defaults to downloads.
+        start : Optional[Union[datetime.datetime, int]]
+            The start of the range, defaults to the first snapshot.
+        end : Optional[Union[datetime.datetime, int]]
+            The end of the range, defaults to the last snapshot.
+        per : Optional[int]
+            The unit of time of the rate in seconds, defaults to a day.
+
+        Returns
+        --------
+        Optional[float]
+            The change of the stat per unit of time, None if the range has less than two snapshots
+            of the mod.
+        """
+        if mod_id is None:
+            points = self.totals(column, start=start, end=end)
+        else:
+            points = self.series(mod_id, column, start=start, end=end)
+
+        if len(points) < 2 or points[-1][0] == points[0][0]:
+            return None
+
+        (first_time, first), (last_time, last) = points[0], points[-1]
+        return (last - first) * per / (last_time - first_time)
@@ -0,0 +1,137 @@
+"""Streaming uploads of modfiles."""
+import asyncio
+import hashlib
+import os
+import time
+import uuid
+
+BUFFER_SIZE = 8 * 1024 * 1024
+
+# length of the hexdigest of an md5
+_MD5_LENGTH = 32
+
+
+# characters escaped in the parameters of a Content-Disposition header, the way browsers and
+# urllib3 do, so that quotes and line breaks cannot end the parameter or the header. Other
+# characters, including non-ASCII ones, are sent as UTF-8.
+_ESCAPES = {ord('"'): "%22", ord("\r"): "%0D", ord("\n"): "%0A"}
+
+
+def _quote(value):
+    return f'"{value.translate(_ESCAPES)}"'
+
+
+def _read(file, hasher, size):
+    chunk = file.read(size)
+    hasher.update(chunk)
+    return chunk
+
+
+class _Progress:
+    def __init__(self, total, callback):
+        self.total = total
+        self.callback = callback
+        self.sent = 0
+        self.start = time.monotonic()
+
+    def update(self, sent):
+        self.sent += sent
+        if self.callback is not None:
+            elapsed = time.monotonic() - self.start
+            self.callback(self.sent, self.total, self.sent / elapsed if elapsed else 0.0)
+
+
+class MultipartUpload:
+    """This class is unique to the library and represents the multipart body of a modfile upload,
+    streamed from disk as it is sent so that the file is only read once and never held in memory.
+    The md5 of the file is computed as the file is read and sent as the last field of the body, since
+    the length of an md5 is fixed the length of the body is known before the file is read.
+
+    The body can be iterated, for requests, or asynchronously iterated, for aiohttp. Asynchronous
+    iteration reads and hashes the file in an executor so the event loop is not blocked. Each
+    iteration reads the file from the start so the body can be sent again if a request is retried.
+
+    Parameters
+    -----------
+    path : str
+        The path of the file to upload
+    fields : dict
+        The other fields of the form, fields whose value is None are not sent.
+    name : Optional[str]
+        The name of the field of the file, defaults to `filedata`.
+    buffer_size : Optional[int]
+        The size of the reads from the file in bytes, defaults to 8 MiB.
+    progress : Optional[Callable[[int, int, float], Any]]
+        Called with the number of bytes of the file sent, the size of the file and the average
+        throughput in bytes per second after every read.
+
+    Attributes
+    -----------
+    md5 : str
+        The md5 of the file, None until the file was sent
+    """
+
+    def __init__(self, path, fields, *, name="filedata", buffer_size=BUFFER_SIZE, progress=None):
+        self.path = path
+        self.size = os.path.getsize(path)
+        self.buffer_size = buffer_size
+        self.progress = progress
+        self.boundary = uuid.uuid4().hex
+        self.md5 = None
+
+        head = [self._field(key, value) for key, value in fields.items() if value is not None]
+        filename = _quote(os.path.basename(path))
+        head.append(
+            f"--{self.boundary}\r\nContent-Disposition: form-data; name={_quote(name)}; filename={filename}\r\n"
+            "Content-Type: application/octet-stream\r\n\r\n".encode()
+        )
+        self._head = b"".join(head)
+
+    def __repr__(self):
+        return f"<MultipartUpload path={self.path} size={self.size}>"
+
+    def _field(self, key, value):
+        return f"--{self.boundary}\r\nContent-Disposition: form-data; name={_quote(key)}\r\n\r\n{value}\r\n".encode()
+
+    def _tail(self, md5):
+        return b"\r\n" + self._field("filehash", md5) + f"--{self.boundary}--\r\n".encode()
+
+    def __len__(self):
+        return len(self._head) + self.size + len(self._tail("0" * _MD5_LENGTH))
+
+    @property
+    def headers(self):
+        """dict : The headers to send the body with"""
+        return {
+            "Content-Type": f"multipart/form-data; boundary={self.boundary}",
+            "Content-Length": str(len(self)),
+        }
+
+    def __iter__(self):
+        hasher = hashlib.md5()
+        progress = _Progress(self.size, self.progress)
+        yield self._head
+        with open(self.path, "rb") as f:
+            for chunk in iter(lambda: _read(f, hasher, self.buffer_size), b""):
+                progress.update(len(chunk))
+                yield chunk
+
+        self.md5 = hasher.hexdigest()
+        yield self._tail(self.md5)
+
+    async def __aiter__(self):
+        loop = asyncio.get_event_loop()
+        hasher = hashlib.md5()
+        progress = _Progress(self.size, self.progress)
+        yield self._head
+        with open(self.path, "rb") as f:
+            while True:
+                chunk = await loop.run_in_executor(None, _read, f, hasher, self.buffer_size)
+                if not chunk:
+                    break
+
+                progress.update(len(chunk))
+                yield chunk
+
+        self.md5 = hasher.hexdigest()
+        yield self._tail(self.md5)
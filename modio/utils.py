@@ -1,10 +1,17 @@
 """Utility functions for the library"""
 from functools import wraps
+from collections import defaultdict
 import inspect
 import enum
 import datetime
 
 from modio.errors import modioException
+from modio.enums import EventType
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
 
 
 def concat_docs(cls):
@@ -41,6 +48,18 @@ def concat_docs(cls):
     return cls
 
 
+_missing = object()
+
+
+def _resolve_attr(item, key):
+    for attr in key.split("."):
+        item = getattr(item, attr, _missing)
+        if item is _missing:
+            break
+
+    return item
+
+
 def find(iterable, **fields):
     """Finds the first item in the :attrs: iterable that has the :attrs: attr equal to :attrs: value. For
     example:
@@ -58,9 +77,8 @@ def find(iterable, **fields):
     """
 
     for e in iterable:
-        if all(key in e.__dict__ for key in fields):
-            if all(e.__dict__[key] == fields[key] for key in fields):
-                return e
+        if all(getattr(e, key, _missing) == value for key, value in fields.items()):
+            return e
 
     return None
 
@@ -82,9 +100,8 @@ def get(iterable, **fields):
 
     e_list = []
     for e in iterable:
-        if all(key in e.__dict__ for key in fields):
-            if all(e.__dict__[key] == fields[key] for key in fields):
-                e_list.append(e)
+        if all(getattr(e, key, _missing) == value for key, value in fields.items()):
+            e_list.append(e)
 
     return e_list
 
@@ -135,6 +152,84 @@ _lib_to_api = {
 }
 
 
+_event_type_to_api = {
+    event_type: (
+        f"MOD{'_' if event_type != EventType.file_changed else ''}{event_type.name.upper()}"
+        if event_type.value < 8
+        else f"USER_{event_type.name.upper()}"
+    )
+    for event_type in EventType
+}
+
+_api_to_event_type = {value: key for key, value in _event_type_to_api.items()}
+
+
+def group_events(events):
+    """Groups events by their type in a single pass, the order of the events
+    is preserved within each group. For example:
+
+        groups = group_events(game.get_mod_events().results)
+
+    would return a dictionnary where `groups[EventType.edited]` is the list of
+    all the edit events. Types without any events are not included.
+
+    Parameters
+    -----------
+    events : Iterable[Event]
+        The events to group
+
+    Returns
+    --------
+    Dict[EventType, List[Event]]
+        The events grouped by type
+    """
+    groups = defaultdict(list)
+    for event in events:
+        groups[event.type].append(event)
+
+    return dict(groups)
+
+
+def _comment_tree(comments):
+    by_id = {comment.id: comment for comment in comments}
+
+    roots = []
+    for comment in comments:
+        parent = by_id.get(comment.parent_id)
+        if parent is None:
+            roots.append(comment)
+        else:
+            parent.children.append(comment)
+
+    return roots
+
+
+def flatten(comments):
+    """Lazily flattens a tree of comments such as the one returned by :meth:`Mod.get_comment_tree`,
+    comments are yielded depth first so that every comment is followed by its replies. For example:
+
+        for comment in flatten(mod.get_comment_tree()):
+            print("  " * (comment.level - 1), comment.content)
+
+    would print every comment of the mod indented by level.
+
+    Parameters
+    -----------
+    comments : List[Comment]
+        The top level comments of the tree
+
+    Returns
+    --------
+    Iterator[Comment]
+        The comments of the tree
+    """
+    stack = list(reversed(comments))
+    while stack:
+        comment = stack.pop()
+        yield comment
+        stack.extend(reversed(comment.children))
+
+
 def _clean_and_convert(fields):
     new_fields = {}
     for key, value in fields.items():
@@ -146,7 +241,7 @@ def _clean_and_convert(fields):
         if isinstance(value, enum.Enum):
             value = value.value
         elif isinstance(value, datetime.datetime):
-            value = value.total_seconds()
+            value = int(value.timestamp())
         elif hasattr(value, "id"):
             value = value.id
 
@@ -156,7 +251,63 @@ def _clean_and_convert(fields):
 
 
 def _convert_date(time):
-    return datetime.datetime.utcfromtimestamp(time)
+    return datetime.datetime.fromtimestamp(time, datetime.timezone.utc)
+
+
+def convert_dates(timestamps, *, columnar=False):
+    """Converts a batch of UNIX timestamps in a single pass. By default this returns a list of
+    timezone aware datetimes in UTC. If `columnar` is True the timestamps are instead converted
+    in one vectorized operation to a numpy array of `datetime64[s]`, numpy datetimes carry no
+    timezone and should be read as UTC.
+
+    Parameters
+    -----------
+    timestamps : Iterable[int]
+        The UNIX timestamps to convert
+    columnar : Optional[bool]
+        Whether to convert the timestamps to a numpy array. Requires numpy to be installed.
+
+    Raises
+    -------
+    modioException
+        numpy is not installed and `columnar` is True
+
+    Returns
+    --------
+    Union[List[datetime.datetime], numpy.ndarray]
+        The converted timestamps, in the same order
+    """
+    if columnar:
+        if numpy is None:
+            raise modioException("numpy is required to convert timestamps to a columnar array")
+
+        return numpy.asarray(timestamps, dtype="int64").astype("datetime64[s]")
+
+    fromtimestamp = datetime.datetime.fromtimestamp
+    utc = datetime.timezone.utc
+    return [fromtimestamp(time, utc) for time in timestamps]
+
+
+class DateField:
+    """Descriptor for date attributes of models. Models keep the UNIX timestamp returned by the
+    API in a private `_<name>_raw` attribute and the timezone aware datetime is only created the
+    first time the attribute is accessed, after which it is cached on the instance.
+    """
+
+    def __set_name__(self, owner, name):
+        self.name = name
+        self.raw = f"_{name}_raw"
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+
+        value = instance.__dict__[self.raw]
+        if value is not None:
+            value = _convert_date(value)
+
+        instance.__dict__[self.name] = value
+        return value
 
 
 def ratelimit_retry(max_retries):
@@ -0,0 +1,117 @@
+import hashlib
+import os
+import tempfile
+import time
+import unittest
+
+import modio
+from modio.cache import FileCache
+from modio.entities import ModFile
+from modio.errors import modioException
+
+from .test_download import FakeSession
+from .utils import payload, run
+
+
+class TestFileCache(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        self.cache = FileCache(os.path.join(self.directory, "cache"), max_size=250)
+
+    def make_source(self, name, data):
+        path = os.path.join(self.directory, name)
+        with open(path, "wb") as f:
+            f.write(data)
+
+        return path, hashlib.md5(data).hexdigest()
+
+    def read(self, path):
+        with open(path, "rb") as f:
+            return f.read()
+
+    def test_put_get(self):
+        source, md5 = self.make_source("a.zip", b"a" * 100)
+        path = self.cache.put(md5.upper(), source)
+        assert path == self.cache.path(md5) and os.path.dirname(path).endswith(md5[:2])
+        assert md5 in self.cache and self.cache.get(md5) == path
+        assert os.path.exists(source)
+        assert os.listdir(os.path.join(self.cache.directory, "tmp")) == []
+
+        with self.assertRaises(modioException):
+            self.cache.put("0" * 32, source)
+
+        assert self.cache.get("0" * 32) is None
+
+    def test_eviction(self):
+        now = time.time()
+        hashes = []
+        for index, letter in enumerate("abc"):
+            source, md5 = self.make_source(f"{letter}.zip", letter.encode() * 100)
+            self.cache.put(md5, source, move=True)
+            os.utime(self.cache.path(md5), (now - 100 + index, now - 100 + index))
+            hashes.append(md5)
+
+        assert len(self.cache) == 2 and hashes[0] not in self.cache
+
+        self.cache.get(hashes[1])
+        source, md5 = self.make_source("d.zip", b"d" * 100)
+        self.cache.put(md5, source)
+        assert hashes[1] in self.cache and hashes[2] not in self.cache and md5 in self.cache
+        assert self.cache.size == 200
+
+    def test_materialize(self):
+        source, md5 = self.make_source("a.zip", b"a" * 100)
+        self.cache.put(md5, source)
+
+        for link in ("auto", "hardlink", "copy"):
+            destination = os.path.join(self.directory, "install", link, "a.zip")
+            assert self.read(self.cache.materialize(md5, destination, link=link)) == b"a" * 100
+
+        hardlinked = os.path.join(self.directory, "install", "hardlink", "a.zip")
+        assert os.stat(hardlinked).st_ino == os.stat(self.cache.path(md5)).st_ino
+
+        with self.assertRaises(modioException):
+            self.cache.materialize("0" * 32, destination)
+
+    def test_download(self):
+        data = os.urandom(200)
+        client = modio.Client(api_key="fake key")
+        session = FakeSession(data)
+        client.connection.session = client.connection.async_session = session
+        file = ModFile(
+            connection=client.connection,
+            **payload(
+                "modfile", filesize=200, filename="mod.zip", filehash={"md5": hashlib.md5(data).hexdigest()}
+            ),
+        )
+
+        first = self.cache.download(file, os.path.join(self.directory, "one"), link="copy")
+        os.makedirs(os.path.join(self.directory, "two"))
+        second = run(self.cache.async_download(file, os.path.join(self.directory, "two")))
+
+        assert self.read(first) == self.read(second) == data
+        assert second == os.path.join(self.directory, "two", "mod.zip")
+        assert len(session.requests) == 1 and file.hash in self.cache
+
+    def test_download_temporary_files(self):
+        data = os.urandom(200)
+        client = modio.Client(api_key="fake key")
+        client.connection.session = FakeSession(data)
+        file = ModFile(
+            connection=client.connection,
+            **payload("modfile", filesize=200, filehash={"md5": hashlib.md5(b"corrupted").hexdigest()}),
+        )
+
+        # the partial file of another download of the same file is left alone
+        other = os.path.join(self.cache._tmp, f"{file.hash}.part")
+        with open(other, "wb") as f:
+            f.write(data[:100])
+
+        with self.assertRaises(modioException):
+            self.cache.download(file, self.directory)
+
+        assert os.listdir(self.cache._tmp) == [os.path.basename(other)]
+        assert self.read(other) == data[:100]
+        assert file.hash not in self.cache
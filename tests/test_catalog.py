@@ -0,0 +1,103 @@
+import datetime
+import unittest
+
+import modio
+
+from .utils import payload
+
+
+def make_mods(client, count=10):
+    mods = []
+    for index in range(1, count + 1):
+        stats = payload("stats", mod_id=index, downloads_total=index * 100)
+        data = payload(
+            "mod",
+            id=index,
+            name=f"Mod {index % 3}",
+            visible=index % 2,
+            date_updated=1600000000 + index,
+            stats=stats,
+        )
+        mods.append(modio.Mod(connection=client.connection, **data))
+
+    return mods
+
+
+class TestCatalog(unittest.TestCase):
+    def setUp(self):
+        self.client = modio.Client(api_key="fake key")
+        self.mods = make_mods(self.client)
+        self.catalog = modio.Catalog(self.mods)
+
+    def test_get(self):
+        assert self.catalog.get(name="Mod 1") == modio.utils.get(self.mods, name="Mod 1")
+        assert self.catalog.get(name="Mod 1", visible=modio.Visibility.public) == modio.utils.get(
+            self.mods, name="Mod 1", visible=modio.Visibility.public
+        )
+        assert self.catalog.get(name="Missing") == []
+        assert self.catalog.get(**{"stats.downloads": 300})[0].id == 3
+
+    def test_find(self):
+        assert self.catalog.find(id=4) is self.mods[3]
+        assert self.catalog.find(id=400) is None
+
+    def test_unhashable(self):
+        assert len(self.catalog.get(tags={"Unity": 1499841487})) == 10
+
+    def test_between(self):
+        assert [mod.id for mod in self.catalog.between("stats.downloads", 250, 500)] == [3, 4, 5]
+        assert [mod.id for mod in self.catalog.between("id", high=2)] == [1, 2]
+
+        low = datetime.datetime.fromtimestamp(1600000009, datetime.timezone.utc)
+        assert [mod.id for mod in self.catalog.between("updated", low)] == [9, 10]
+        assert [mod.id for mod in self.catalog.between("updated", 1600000009)] == [9, 10]
+
+    def test_add_discard(self):
+        self.catalog.get(name="Mod 1")
+        extra = make_mods(self.client, 11)[-1]
+        self.catalog.add(extra)
+
+        assert extra in self.catalog.get(name="Mod 2")
+        assert self.catalog.between("id", 11) == [extra]
+
+        self.catalog.discard(extra)
+        assert extra not in self.catalog.get(name="Mod 2")
+        assert len(self.catalog) == 10
+
+
+class TestModIndex(unittest.TestCase):
+    def setUp(self):
+        self.client = modio.Client(api_key="fake key")
+        self.index = modio.ModIndex(make_mods(self.client))
+
+    def test_getitem(self):
+        assert self.index[3].id == 3
+        assert 3 in self.index
+
+    def test_replace(self):
+        mod = make_mods(self.client, 3)[-1]
+        mod.name = "Replaced"
+        self.index.add(mod)
+
+        assert len(self.index) == 10
+        assert self.index[3] is mod
+        assert self.index.find(name="Replaced") is mod
+        assert self.index.find(id=3) is mod
+
+        self.index.discard(3)
+        assert 3 not in self.index
+
+    def test_discard_keeps_indexes(self):
+        self.index.get(name="Mod 1")
+        index, _ = self.index._indexes[("name",)]
+        self.index.discard(1)
+        self.index.discard(4)
+
+        assert self.index._indexes[("name",)][0] is index
+        assert [mod.id for mod in self.index.get(name="Mod 1")] == [7, 10]
+
+        mod = self.index[7]
+        mod.name = "Renamed"
+        self.index.discard(mod)
+        assert ("name",) not in self.index._indexes
+        assert [mod.id for mod in self.index.get(name="Mod 1")] == [10]
@@ -1,3 +1,4 @@
+import random
 from unittest import mock
 
 import pytest
@@ -114,3 +115,99 @@ class TestClient:
             client.connection._post_process(FakeRequest(status_code=429, headers={"retry-after": retry_after}, json_data={"error": {"code": "", "message": "", "error_ref": ""}}))
             assert sleep_mock.called == expected
 
+
+
+def _get_path(mod, path):
+    for key in path:
+        mod = mod.get(key, 0)
+
+    return mod
+
+
+def fake_mods(total=250):
+    mods = [
+        {"id": index, "stats": {"downloads_total": (index * 37) % total}} for index in range(1, total + 1)
+    ]
+
+    def get_request(url, *, filters=None, **fields):
+        params = filters.get_dict()
+        ids = {int(x) for x in params["id-in"].split(",")}
+        assert len(ids) <= modio.client.MAX_IN_VALUES
+
+        matched = [mod for mod in mods if mod["id"] in ids]
+        if params.get("_sort"):
+            key = params["_sort"].lstrip("-")
+            path = ("stats", "downloads_total") if key == "downloads" else (key,)
+            matched.sort(key=lambda mod: _get_path(mod, path), reverse=params["_sort"].startswith("-"))
+
+        offset, limit = params.get("_offset", 0), params.get("_limit", 100)
+        return {
+            "data": matched[offset : offset + limit],
+            "result_count": len(matched[offset : offset + limit]),
+            "result_limit": limit,
+            "result_offset": offset,
+            "result_total": len(matched),
+        }
+
+    return mods, get_request
+
+
+class TestSplitFilters:
+    def test_split(self):
+        client = modio.Client(api_key="fake key", test=use_test_env)
+        mods, get_request = fake_mods()
+        ids = list(range(1, 251)) + [1, 2]
+        filters = modio.Filter().values_in(id=ids).sort("downloads", reverse=True).limit(20).offset(10)
+
+        with mock.patch.object(client.connection, "_get_request", get_request):
+            data = client.connection.get_request("/games/1/mods", filters=filters)
+
+        expected = sorted(mods, key=lambda mod: mod["stats"]["downloads_total"], reverse=True)[10:30]
+        assert data["data"] == expected
+        assert data["result_total"] == 250
+        assert data["result_offset"] == 10 and data["result_limit"] == 20
+
+    def test_split_unsorted(self):
+        client = modio.Client(api_key="fake key", test=use_test_env)
+        mods, get_request = fake_mods()
+        ids = list(range(1, 251))
+        random.Random(4).shuffle(ids)
+
+        with mock.patch.object(client.connection, "_get_request", get_request):
+            filters = modio.Filter().values_in(id=ids).limit(10)
+            data = client.connection.get_request("/games/1/mods", filters=filters)
+            assert data["data"] == mods[:10]
+
+            with pytest.raises(modioException):
+                client.connection.get_request(
+                    "/games/1/mods", filters=modio.Filter().values_in(id=ids).sort("name").limit(10)
+                )
+
+    def test_split_all(self):
+        client = modio.Client(api_key="fake key", test=use_test_env)
+        mods, get_request = fake_mods()
+        filters = modio.Filter().values_in(id=range(250, 0, -1)).sort("id")
+
+        with mock.patch.object(client.connection, "_get_request", get_request):
+            data = client.connection.get_all_request("/games/1/mods", filters=filters)
+
+        assert data == mods
+
+    def test_split_async(self):
+        client = modio.Client(api_key="fake key", test=use_test_env)
+        mods, get_request = fake_mods()
+        filters = modio.Filter().values_in(id=range(1, 251)).sort("id", reverse=True)
+
+        async def async_get_request(url, **fields):
+            return get_request(url, **fields)
+
+        with mock.patch.object(client.connection, "_async_get_request", async_get_request):
+            data = run(client.connection.async_get_request("/games/1/mods", filters=filters))
+
+        assert data["data"] == mods[::-1][:100]
+        assert data["result_total"] == 250
+
+    def test_no_split(self):
+        assert modio.client._split_filters(modio.Filter().values_in(id=range(100))) is None
+        assert modio.client._split_filters(modio.Filter().values_not_in(id=range(500))) is None
+        assert len(modio.client._split_filters(modio.Filter().values_in(id=range(201)))) == 3
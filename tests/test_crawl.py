@@ -0,0 +1,107 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import modio
+from modio.crawl import Cursor, _Partitions, async_crawl, async_partitioned_crawl, crawl, partitioned_crawl
+from modio.query import evaluate
+
+from .utils import run
+
+
+def fake_endpoint(ids):
+    items = [modio.Object(id=item_id) for item_id in ids]
+    calls = []
+
+    def method(*, filters=None):
+        calls.append(filters.get_dict())
+        return evaluate(filters, items)
+
+    async def async_method(*, filters=None):
+        return method(filters=filters)
+
+    return method, async_method, calls
+
+
+class TestCrawl(unittest.TestCase):
+    @mock.patch("modio.crawl.PAGE_LIMIT", 3)
+    def test_crawl(self):
+        method, _, calls = fake_endpoint([5, 1, 9, 3, 7, 2, 8])
+        assert [item.id for item in crawl(method)] == [1, 2, 3, 5, 7, 8, 9]
+        assert [call["id-min"] for call in calls] == [1, 4, 9]
+        assert all(call["_sort"] == "id" and "_offset" not in call for call in calls)
+
+    @mock.patch("modio.crawl.PAGE_LIMIT", 3)
+    def test_crawl_filters(self):
+        method, _, _ = fake_endpoint(range(1, 20))
+        filters = modio.Filter().min(id=5).max(id=12).offset(3)
+        assert [item.id for item in crawl(method, filters=filters)] == list(range(5, 13))
+
+    @mock.patch("modio.crawl.PAGE_LIMIT", 3)
+    def test_resume(self):
+        method, _, calls = fake_endpoint(range(1, 11))
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "cursor.json")
+            crawler = crawl(method, cursor=Cursor.load(path))
+            assert [next(crawler).id for _ in range(4)] == [1, 2, 3, 4]
+            crawler.close()
+
+            cursor = Cursor.load(path)
+            assert cursor.last_id == 3
+            assert [item.id for item in crawl(method, cursor=cursor)] == list(range(4, 11))
+            assert Cursor.load(path).last_id == 10
+
+    @mock.patch("modio.crawl.PAGE_LIMIT", 3)
+    def test_async_crawl(self):
+        _, async_method, _ = fake_endpoint(range(1, 8))
+        cursor = Cursor()
+
+        async def collect():
+            return [item.id async for item in async_crawl(async_method, cursor=cursor)]
+
+        assert run(collect()) == list(range(1, 8))
+        assert cursor.last_id == 7
+
+
+class TestPartitionedCrawl(unittest.TestCase):
+    ids = list(range(1, 6)) + list(range(100, 160)) + [400]
+
+    @mock.patch("modio.crawl.PAGE_LIMIT", 4)
+    def test_partitioned_crawl(self):
+        method, _, calls = fake_endpoint(self.ids)
+        results = [item.id for item in partitioned_crawl(method, partitions=2, max_workers=3)]
+        assert sorted(results) == self.ids
+        assert all(call["_sort"] in ("id", "-id") for call in calls)
+
+    @mock.patch("modio.crawl.PAGE_LIMIT", 4)
+    def test_partitioned_crawl_filters(self):
+        method, _, _ = fake_endpoint(self.ids)
+        filters = modio.Filter().max(id=120)
+        results = [item.id for item in partitioned_crawl(method, filters=filters)]
+        assert sorted(results) == [x for x in self.ids if x <= 120]
+
+        filters = modio.Filter().min(id=1000)
+        assert list(partitioned_crawl(method, filters=filters)) == []
+
+    @mock.patch("modio.crawl.PAGE_LIMIT", 4)
+    def test_async_partitioned_crawl(self):
+        _, async_method, _ = fake_endpoint(self.ids)
+
+        async def collect():
+            return [item.id async for item in async_partitioned_crawl(async_method, max_workers=3)]
+
+        assert sorted(run(collect())) == self.ids
+
+    @mock.patch("modio.crawl.PAGE_LIMIT", 4)
+    def test_rebalance(self):
+        work = _Partitions(1, 100, 1)
+        first = work.take()
+        assert (first.low, first.high) == (1, 100)
+
+        second = work.take()
+        assert (first.high, second.low, second.high) == (50, 51, 100)
+
+        results, done = work.advance(first, [modio.Object(id=x) for x in (10, 20, 30, 60)])
+        assert [result.id for result in results] == [10, 20, 30] and not done
+        assert first.low == 31
@@ -0,0 +1,100 @@
+import unittest
+from unittest import mock
+
+import modio
+from modio.dependencies import DependencyResolver
+from modio.errors import modioException
+from modio.query import evaluate
+
+from .utils import payload, run
+
+
+class FakeGraph:
+    """Serves mods and their dependencies from memory, counting the requests made."""
+
+    def __init__(self, edges):
+        self.edges = edges
+        self.mods = {mod_id: payload("mod", id=mod_id, name=f"Mod {mod_id}") for mod_id in edges}
+        self.requests = []
+
+    def get_request(self, url, *, filters=None, **fields):
+        self.requests.append(url)
+        if url.endswith("/dependencies"):
+            data = [{"mod_id": mod_id, "date_added": 1000} for mod_id in self.edges[int(url.split("/")[-2])]]
+            return {
+                "data": data,
+                "result_count": len(data),
+                "result_limit": 100,
+                "result_offset": 0,
+                "result_total": len(data),
+            }
+
+        objects = [modio.Object(id=mod_id) for mod_id in self.mods]
+        results, pagination = evaluate(filters, objects)
+        return {
+            "data": [self.mods[obj.id] for obj in results],
+            "result_count": pagination.count,
+            "result_limit": pagination.limit,
+            "result_offset": pagination.offset,
+            "result_total": pagination.total,
+        }
+
+
+class TestDependencyResolver(unittest.TestCase):
+    def setUp(self):
+        self.client = modio.Client(api_key="fake key")
+        self.graph = FakeGraph({1: [2, 3], 2: [4], 3: [4, 5], 4: [], 5: [6], 6: [], 7: [3]})
+        patcher = mock.patch.object(self.client.connection, "_get_request", self.graph.get_request)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def mod(self, mod_id):
+        return modio.Mod(connection=self.client.connection, **self.graph.mods[mod_id])
+
+    def assert_plan(self, plan, root):
+        ids = [mod.id for mod in plan]
+        assert ids[-1] == root
+        assert len(ids) == len(set(ids))
+        for mod_id in ids:
+            for dependency in self.graph.edges[mod_id]:
+                assert ids.index(dependency) < ids.index(mod_id)
+
+    def test_resolve(self):
+        plan = self.mod(1).resolve_dependencies()
+        self.assert_plan(plan, 1)
+        assert sorted(mod.id for mod in plan) == [1, 2, 3, 4, 5, 6]
+        assert all(isinstance(mod, modio.Mod) for mod in plan)
+
+        # one request for the dependencies of each mod and one request for the mods of each level
+        mods_requests = [url for url in self.graph.requests if url.endswith("/mods")]
+        assert len(mods_requests) == 3
+
+    def test_memoized(self):
+        resolver = DependencyResolver()
+        self.mod(1).resolve_dependencies(resolver=resolver)
+        count = len(self.graph.requests)
+
+        plan = self.mod(7).resolve_dependencies(resolver=resolver)
+        self.assert_plan(plan, 7)
+        assert [mod.id for mod in plan] == [4, 6, 5, 3, 7]
+        assert len(self.graph.requests) == count + 1
+
+    def test_cycle(self):
+        self.graph.edges[6] = [1]
+        with self.assertRaises(modioException):
+            self.mod(1).resolve_dependencies()
+
+    def test_missing(self):
+        del self.graph.mods[5]
+        with self.assertRaises(modioException):
+            self.mod(1).resolve_dependencies()
+
+    def test_async_resolve(self):
+        async def get_request(url, **fields):
+            return self.graph.get_request(url, **fields)
+
+        with mock.patch.object(self.client.connection, "_async_get_request", get_request):
+            plan = run(self.mod(1).async_resolve_dependencies())
+
+        self.assert_plan(plan, 1)
+        assert len(plan) == 6
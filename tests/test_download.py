@@ -0,0 +1,289 @@
+import asyncio
+import hashlib
+import os
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+import modio
+from modio.download import DownloadQueue
+from modio.entities import ModFile
+from modio.errors import modioException
+
+from .utils import payload, run
+
+
+class FakeResponse:
+    def __init__(self, data, status, fail_after=None):
+        self.data = data
+        self.status_code = self.status = status
+        self.fail_after = fail_after
+        self.content = self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        pass
+
+    def iter_content(self, chunk_size):
+        for index in range(0, len(self.data), chunk_size):
+            if self.fail_after is not None and index >= self.fail_after:
+                raise ConnectionError("Connection reset")
+
+            yield self.data[index : index + chunk_size]
+
+    async def iter_chunked(self, chunk_size):
+        for chunk in self.iter_content(chunk_size):
+            await asyncio.sleep(0)
+            yield chunk
+
+
+class FakeSession:
+    """Serves a file over a fake HTTP session, honoring range requests unless told not to."""
+
+    def __init__(self, data, ranges=True):
+        self.data = data
+        self.ranges = ranges
+        self.fail_after = None
+        self.requests = []
+
+    def get(self, url, *, headers=None, stream=False):
+        self.requests.append(headers)
+        if headers and "Range" in headers and self.ranges:
+            start, end = headers["Range"][len("bytes=") :].split("-")
+            end = int(end) + 1 if end else len(self.data)
+            return FakeResponse(self.data[int(start) : end], 206, self.fail_after)
+
+        return FakeResponse(self.data, 200, self.fail_after)
+
+
+class DownloadTestCase(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        self.data = os.urandom(100_000)
+
+        self.client = modio.Client(api_key="fake key")
+        self.session = FakeSession(self.data)
+        self.client.connection.session = self.session
+        self.client.connection.async_session = self.session
+        self.file = ModFile(
+            connection=self.client.connection,
+            **payload(
+                "modfile",
+                filesize=len(self.data),
+                filename="mod.zip",
+                filehash={"md5": hashlib.md5(self.data).hexdigest()},
+            ),
+        )
+
+    def read(self, path):
+        with open(path, "rb") as f:
+            return f.read()
+
+
+class TestDownload(DownloadTestCase):
+    def test_download(self):
+        progress = []
+        path = self.file.download(
+            self.directory, chunk_size=30_000, progress=lambda done, total: progress.append(done)
+        )
+        assert path == os.path.join(self.directory, "mod.zip")
+        assert self.read(path) == self.data
+        assert progress == [30_000, 60_000, 90_000, 100_000]
+        assert not os.path.exists(f"{path}.part")
+
+    def test_resume(self):
+        path = os.path.join(self.directory, "resumed.zip")
+        self.session.fail_after = 40_000
+        with self.assertRaises(ConnectionError):
+            self.file.download(path, chunk_size=10_000)
+
+        assert len(self.read(f"{path}.part")) == 40_000
+
+        self.session.fail_after = None
+        assert self.read(self.file.download(path)) == self.data
+        assert self.session.requests[-1] == {"Range": "bytes=40000-"}
+
+    def test_range_ignored(self):
+        path = os.path.join(self.directory, "mod.zip")
+        with open(f"{path}.part", "wb") as f:
+            f.write(b"garbage")
+
+        self.session.ranges = False
+        assert self.read(self.file.download(path)) == self.data
+
+    def test_corrupted(self):
+        self.file.hash = "0" * 32
+        path = os.path.join(self.directory, "mod.zip")
+        with self.assertRaises(modioException):
+            self.file.download(path)
+
+        assert not os.path.exists(path) and not os.path.exists(f"{path}.part")
+
+    def test_async_download(self):
+        path = os.path.join(self.directory, "mod.zip")
+        with open(f"{path}.part", "wb") as f:
+            f.write(self.data[:5000])
+
+        assert self.read(run(self.file.async_download(path))) == self.data
+        assert self.session.requests == [{"Range": "bytes=5000-"}]
+
+
+class TestSegmentedDownload(DownloadTestCase):
+    def test_segmented_download(self):
+        progress = []
+        path = self.file.segmented_download(
+            self.directory,
+            segments=3,
+            segment_size=15_000,
+            progress=lambda done, total: progress.append(done),
+        )
+        assert self.read(path) == self.data
+        assert len(self.session.requests) == 7
+        assert self.session.requests[-1] == {"Range": "bytes=90000-99999"}
+        assert sorted(progress)[-1] == 100_000
+
+    def test_segmented_range_ignored(self):
+        self.session.ranges = False
+        path = os.path.join(self.directory, "mod.zip")
+        with self.assertRaises(modioException):
+            self.file.segmented_download(path)
+
+        assert not os.path.exists(f"{path}.part")
+
+    def test_segmented_failure_stops(self):
+        self.session.fail_after = 0
+        with self.assertRaises(ConnectionError):
+            self.file.segmented_download(self.directory, segments=1, segment_size=10_000)
+
+        assert len(self.session.requests) == 1
+        assert os.listdir(self.directory) == []
+
+    def test_async_segmented_failure(self):
+        get = self.session.get
+
+        def fail_first_range(url, *, headers=None, stream=False):
+            resp = get(url, headers=headers, stream=stream)
+            if headers["Range"].startswith("bytes=0-"):
+                resp.fail_after = 5000
+
+            return resp
+
+        self.session.get = fail_first_range
+
+        async def download():
+            with self.assertRaises(ConnectionError):
+                await self.file.async_segmented_download(self.directory, segments=2, chunk_size=1000)
+
+            return asyncio.all_tasks() - {asyncio.current_task()}
+
+        assert run(download()) == set()
+        assert os.listdir(self.directory) == []
+
+    def test_segmented_corrupted(self):
+        self.file.hash = "0" * 32
+        with self.assertRaises(modioException):
+            self.file.segmented_download(self.directory)
+
+    def test_async_segmented_download(self):
+        path = run(self.file.async_segmented_download(self.directory, segments=4))
+        assert self.read(path) == self.data
+        assert self.session.requests[0] == {"Range": "bytes=0-24999"}
+
+
+class TestDownloadQueue(DownloadTestCase):
+    def make_file(self, file_id, mod_id, expires):
+        file = ModFile(
+            connection=self.client.connection,
+            game_id=1,
+            **payload(
+                "modfile",
+                id=file_id,
+                mod_id=mod_id,
+                filesize=len(self.data),
+                filename=f"{file_id}.zip",
+                filehash={"md5": self.file.hash},
+            ),
+        )
+        file._date_expires_raw = expires
+        return file
+
+    def fake_get_all(self, url, *, filters=None, **fields):
+        self.refreshes.append((url, filters.get_dict()["id-in"]))
+        return [
+            payload(
+                "modfile",
+                id=int(file_id),
+                download={"binary_url": f"new/{file_id}", "date_expires": time.time() + 3600},
+            )
+            for file_id in filters.get_dict()["id-in"].split(",")
+        ]
+
+    def test_url_is_expired(self):
+        self.file._date_expires_raw = time.time() + 60
+        assert not self.file.url_is_expired()
+        assert self.file.url_is_expired(margin=120)
+
+    def test_queue(self):
+        self.refreshes = []
+        soon, later = time.time() + 10, time.time() + 3600
+        files = [self.make_file(1, 1, soon), self.make_file(2, 2, later), self.make_file(3, 1, soon)]
+        progress = set()
+        queue = DownloadQueue(progress=lambda file, done, total: progress.add(file.id))
+        for file in files:
+            queue.add(file, self.directory)
+
+        with mock.patch.object(self.client.connection, "get_all_request", self.fake_get_all):
+            paths = queue.run()
+
+        assert self.refreshes == [("/games/1/mods/1/files", "1,3")]
+        assert [file.url for file in files] == ["new/1", files[1].url, "new/3"]
+        assert paths == [os.path.join(self.directory, f"{x}.zip") for x in (1, 2, 3)]
+        assert progress == {1, 2, 3} and len(queue) == 0
+
+    def test_refresh(self):
+        self.refreshes = []
+        self.client.connection.keep_raw = True
+        mod = modio.Mod(connection=self.client.connection, **payload("mod", id=1, game_id=1))
+        file = mod.file
+        file._date_expires_raw = time.time()
+        expired = file.date_expires
+
+        queue = DownloadQueue()
+        queue.add(file)
+        with mock.patch.object(self.client.connection, "get_all_request", self.fake_get_all):
+            queue.refresh()
+
+        assert not file.url_is_expired(margin=60)
+        assert (file.date_expires - expired).total_seconds() > 3500
+        assert file.to_dict()["download"]["binary_url"] == file.url == f"new/{file.id}"
+        assert mod.to_dict()["modfile"]["download"] == file.to_dict()["download"]
+
+    def test_queue_me_modfiles(self):
+        self.file.game_id = None
+        with self.assertRaises(modioException):
+            DownloadQueue().add(self.file)
+
+    def test_async_queue(self):
+        self.refreshes = []
+        queue = DownloadQueue(segments=2)
+        queue.add(self.make_file(4, 1, time.time()), self.directory)
+
+        async def async_get_all_request(url, **fields):
+            return self.fake_get_all(url, **fields)
+
+        with mock.patch.object(self.client.connection, "async_get_all_request", async_get_all_request):
+            assert run(queue.async_run()) == [os.path.join(self.directory, "4.zip")]
+
+        assert self.refreshes == [("/games/1/mods/1/files", "4")]
+        assert self.session.requests[0] == {"Range": "bytes=0-49999"}
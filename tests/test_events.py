@@ -0,0 +1,174 @@
+import asyncio
+import unittest
+from unittest import mock
+
+import modio
+from modio.crawl import Cursor
+from modio.events import EventTailer, async_refetch, compact, refetch
+from modio.query import evaluate
+
+from .utils import payload, run
+
+
+def make_events(*changes, game_id=2):
+    return [
+        modio.entities.Event(
+            id=event_id,
+            mod_id=mod_id,
+            user_id=1,
+            game_id=game_id,
+            date_added=1000 + event_id,
+            event_type=event_type,
+        )
+        for event_id, (mod_id, event_type) in enumerate(changes, start=1)
+    ]
+
+
+class FakeEvents:
+    def __init__(self, count=0):
+        self.events = []
+        self.calls = []
+        self.add(count)
+
+    def add(self, count):
+        start = len(self.events) + 1
+        self.events.extend(modio.Object(id=event_id) for event_id in range(start, start + count))
+
+    async def method(self, *, filters=None):
+        self.calls.append(filters.get_dict())
+        return evaluate(filters, self.events)
+
+
+async def take(tailer, count):
+    return [(await tailer.__anext__()).id for _ in range(count)]
+
+
+class TestEventTailer(unittest.TestCase):
+    @mock.patch("modio.events.PAGE_LIMIT", 3)
+    def test_backlog(self):
+        source = FakeEvents(10)
+        cursor = Cursor(2)
+
+        async def tail():
+            async with EventTailer(source.method, cursor=cursor, min_interval=0.01, max_workers=2) as tailer:
+                ids = await take(tailer, 8)
+                assert cursor.last_id == 10
+                source.add(2)
+                ids += await take(tailer, 2)
+                return ids
+
+        assert run(tail()) == list(range(3, 13))
+        assert all(call["_sort"] == "id" for call in source.calls)
+        assert source.calls[0]["id-min"] == 3
+        assert {call.get("_offset") for call in source.calls[:2]} == {None, 3}
+
+    @mock.patch("modio.events.PAGE_LIMIT", 3)
+    def test_cursor_advances_per_page(self):
+        source = FakeEvents(5)
+        cursor = Cursor()
+
+        async def tail():
+            async with EventTailer(source.method, cursor=cursor, min_interval=0.01) as tailer:
+                await take(tailer, 2)
+                assert cursor.last_id == 0
+                await take(tailer, 1)
+                assert cursor.last_id == 3
+
+        run(tail())
+
+    def test_adaptive_interval(self):
+        source = FakeEvents()
+
+        async def tail():
+            tailer = EventTailer(source.method, min_interval=0.01, max_interval=0.04)
+            task = asyncio.ensure_future(tailer.__anext__())
+            await asyncio.sleep(0.15)
+            assert tailer.interval == 0.04
+
+            source.add(1)
+            assert (await task).id == 1
+            assert tailer.interval == 0.02
+            await tailer.close()
+
+        run(tail())
+
+    @mock.patch("modio.events.PAGE_LIMIT", 2)
+    def test_backpressure(self):
+        source = FakeEvents(20)
+
+        async def tail():
+            tailer = EventTailer(source.method, min_interval=0.01, buffer=3)
+            assert (await tailer.__anext__()).id == 1
+            await asyncio.sleep(0.05)
+            assert tailer._queue.qsize() == 3
+            assert tailer._position < 20
+            await tailer.close()
+
+        run(tail())
+
+    def test_error(self):
+        source = FakeEvents(1)
+        failing = mock.AsyncMock(side_effect=modio.modioException("boom"))
+
+        async def tail():
+            tailer = EventTailer(failing, min_interval=0.01)
+            with self.assertRaises(modio.modioException):
+                await tailer.__anext__()
+
+            tailer.method = source.method
+            assert (await tailer.__anext__()).id == 1
+            await tailer.close()
+
+        run(tail())
+
+
+class TestCompact(unittest.TestCase):
+    def setUp(self):
+        self.client = modio.Client(api_key="fake key")
+        self.game = modio.game.Game(connection=self.client.connection, **payload("game"))
+        self.events = make_events(
+            (1, "MOD_EDITED"),
+            (1, "MOD_EDITED"),
+            (2, "MOD_COMMENT_ADDED"),
+            (3, "MOD_EDITED"),
+            (1, "MODFILE_CHANGED"),
+            (3, "MOD_DELETED"),
+            (4, "MOD_AVAILABLE"),
+            (5, "MOD_TEAM_CHANGED"),
+        )
+
+    def test_compact(self):
+        latest = compact(reversed(self.events))
+        assert sorted(latest) == [(2, 1), (2, 3), (2, 4)]
+        assert latest[(2, 1)].id == 5 and latest[(2, 1)].type is modio.EventType.file_changed
+        assert latest[(2, 3)].type is modio.EventType.deleted
+
+        other = make_events((1, "MOD_EDITED"), game_id=3)
+        assert sorted(compact(self.events + other)) == [(2, 1), (2, 3), (2, 4), (3, 1)]
+
+    def test_refetch(self):
+        calls = []
+
+        def get_all_request(url, *, filters=None, **fields):
+            calls.append((url, filters.get_dict()))
+            return [payload("mod", id=1)]
+
+        events = self.events + make_events((6, "MOD_EDITED"), game_id=3)
+        with mock.patch.object(self.client.connection, "get_all_request", get_all_request):
+            mods, removed = refetch(self.game, events)
+
+        assert calls == [("/games/2/mods", {"id-in": "1,4"})]
+        assert [mod.id for mod in mods] == [1]
+        assert removed == [3, 4]
+
+    def test_async_refetch(self):
+        async def async_get_all_request(url, *, filters=None, **fields):
+            return [payload("mod", id=mod_id) for mod_id in (1, 4)]
+
+        with mock.patch.object(self.client.connection, "async_get_all_request", async_get_all_request):
+            mods, removed = run(async_refetch(self.game, self.events))
+
+        assert [mod.id for mod in mods] == [1, 4]
+        assert removed == [3]
+
+        assert run(async_refetch(self.game, make_events((1, "MOD_DELETED")))) == ([], [1])
@@ -1,4 +1,7 @@
+import datetime
 import unittest
+from unittest import mock
+
 import modio
 import random
 
@@ -10,7 +13,7 @@ except ModuleNotFoundError:
     access_token = os.environ["ACCESS_TOKEN"]
     game_id = os.environ["GAME_ID"]
 
-from .utils import run, use_test_env
+from .utils import payload, run, use_test_env
 
 
 class TestGame(unittest.TestCase):
@@ -133,3 +136,137 @@ class TestGame(unittest.TestCase):
 
         newmod.name = "ToDeleteMod"
         run(self.game.async_add_mod(newmod))
+
+
+class TestSyncMods(unittest.TestCase):
+    def setUp(self):
+        self.client = modio.Client(api_key="fake key", test=use_test_env)
+        self.game = modio.game.Game(connection=self.client.connection, **payload("game"))
+        self.requests = []
+
+    def fake_get(self, mods):
+        def get_request(url, *, filters=None, **fields):
+            params = filters.get_dict()
+            self.requests.append(params)
+            data = [
+                payload("mod", **mod)
+                for mod in sorted(mods, key=lambda mod: mod["id"])
+                if mod["id"] >= params["id-min"]
+            ][: params["_limit"]]
+            return {
+                "data": data,
+                "result_count": len(data),
+                "result_limit": params["_limit"],
+                "result_offset": 0,
+                "result_total": len(data),
+            }
+
+        return get_request
+
+    def test_sync_mods(self):
+        mods = modio.ModIndex()
+        fetched = [{"id": 1, "date_updated": 1000}, {"id": 2, "date_updated": 1500}]
+        with mock.patch.object(self.client.connection, "get_request", self.fake_get(fetched)):
+            result = self.game.sync_mods(into=mods)
+
+        assert [mod.id for mod in result.updated] == [1, 2]
+        assert result.removed == []
+        assert result.since == datetime.datetime.fromtimestamp(1500, datetime.timezone.utc)
+        assert "date_updated-min" not in self.requests[-1]
+        assert self.requests[-1]["_sort"] == "id"
+
+        fetched = [
+            {"id": 1, "date_updated": 2000, "status": 3},
+            {"id": 2, "date_updated": 1800, "name": "Renamed"},
+            {"id": 3, "date_updated": 1700, "visible": 0},
+        ]
+        with mock.patch.object(self.client.connection, "get_request", self.fake_get(fetched)):
+            result = self.game.sync_mods(since=result.since, into=mods, overlap=100)
+
+        assert self.requests[-1]["date_updated-min"] == 1400
+        assert [mod.id for mod in result.removed] == [1, 3]
+        assert list(mods) == result.updated and mods[2].name == "Renamed"
+        assert result.since.timestamp() == 2000
+
+    def test_sync_mods_catalog(self):
+        mods = modio.Catalog()
+        fetched = [{"id": 1, "date_updated": 1000}, {"id": 2, "date_updated": 1500}]
+        with mock.patch.object(self.client.connection, "get_request", self.fake_get(fetched)):
+            result = self.game.sync_mods(into=mods)
+
+        fetched = [{"id": 1, "date_updated": 2000, "status": 3}, {"id": 2, "date_updated": 1800}]
+        with mock.patch.object(self.client.connection, "get_request", self.fake_get(fetched)):
+            result = self.game.sync_mods(since=result.since, into=mods)
+
+        assert list(mods) == result.updated
+        assert mods.find(id=1) is None
+
+    def test_sync_mods_pages(self):
+        fetched = [{"id": mod_id, "date_updated": 1000 + mod_id} for mod_id in range(1, 151)]
+        with mock.patch.object(self.client.connection, "get_request", self.fake_get(fetched)):
+            result = self.game.sync_mods(since=1000)
+
+        assert [params["id-min"] for params in self.requests] == [1, 101]
+        assert [mod.id for mod in result.updated] == list(range(1, 151))
+        assert result.since.timestamp() == 1150
+
+    def test_sync_mods_empty(self):
+        mods = {}
+        with mock.patch.object(self.client.connection, "get_request", self.fake_get([])):
+            result = self.game.sync_mods(since=1500, into=mods, overlap=datetime.timedelta(minutes=1))
+
+        assert self.requests[-1]["date_updated-min"] == 1440
+        assert result == ([], [], datetime.datetime.fromtimestamp(1500, datetime.timezone.utc))
+
+    def test_async_sync_mods(self):
+        mods = {}
+        get_request = self.fake_get([{"id": 4, "date_updated": 1000}])
+
+        async def async_get_request(url, **fields):
+            return get_request(url, **fields)
+
+        with mock.patch.object(self.client.connection, "async_get_request", async_get_request):
+            result = run(self.game.async_sync_mods(into=mods))
+
+        assert list(mods) == [4] and result.updated == [mods[4]]
+
+
+class TestAttachStats(unittest.TestCase):
+    def setUp(self):
+        self.client = modio.Client(api_key="fake key", test=use_test_env)
+        self.game = modio.game.Game(connection=self.client.connection, **payload("game"))
+        self.mods = [
+            modio.Mod(connection=self.client.connection, **payload("mod", id=x)) for x in range(1, 251)
+        ]
+        self.requests = []
+
+    def get_request(self, url, *, filters=None, **fields):
+        self.requests.append(filters.get_dict())
+        mod_ids = [int(x) for x in filters.get_dict()["mod_id-in"].split(",") if int(x) % 50]
+        data = [payload("stats", mod_id=mod_id, downloads_total=mod_id * 2) for mod_id in mod_ids]
+        return {
+            "data": data,
+            "result_count": len(data),
+            "result_limit": 100,
+            "result_offset": 0,
+            "result_total": len(data),
+        }
+
+    def test_attach_stats(self):
+        with mock.patch.object(self.client.connection, "_get_request", self.get_request):
+            stats = self.game.attach_stats(self.mods)
+
+        assert len(self.requests) == 3 and len(stats) == 245
+        assert self.mods[41].stats.downloads == 84
+        assert self.mods[49].stats.downloads == payload("stats")["downloads_total"]
+        assert self.game.attach_stats([]) == []
+
+    def test_async_attach_stats(self):
+        async def get_request(url, **fields):
+            return self.get_request(url, **fields)
+
+        with mock.patch.object(self.client.connection, "_async_get_request", get_request):
+            run(self.game.async_attach_stats(self.mods[:10]))
+
+        assert len(self.requests) == 1
+        assert [mod.stats.downloads for mod in self.mods[:3]] == [2, 4, 6]
@@ -0,0 +1,141 @@
+import unittest
+from unittest import mock
+
+import modio
+from modio.errors import modioException
+from modio.mirror import Mirror
+from modio.query import evaluate
+
+from .utils import payload, run
+
+
+class FakeAPI:
+    """Serves mods, events and dependencies from memory, evaluating filters the way the API would."""
+
+    def __init__(self, count=12):
+        self.mods = {}
+        for mod_id in range(1, count + 1):
+            tags = [{"name": "Unity" if mod_id % 2 else "Unreal", "date_added": 1499841487}]
+            stats = payload("stats", mod_id=mod_id, downloads_total=mod_id * 10)
+            self.mods[mod_id] = payload(
+                "mod", id=mod_id, name=f"Mod {mod_id}", date_updated=1000 + mod_id, tags=tags, stats=stats
+            )
+
+        self.events = [{"id": 1, "mod_id": 1, "user_id": 1, "date_added": 1000, "event_type": "MOD_EDITED"}]
+        self.dependencies = {1: [{"mod_id": 2, "date_added": 1000}]}
+
+    def add_event(self, mod_id, event_type):
+        event_id = self.events[-1]["id"] + 1
+        self.events.append(
+            {"id": event_id, "mod_id": mod_id, "user_id": 1, "date_added": 2000, "event_type": event_type}
+        )
+
+    def get_request(self, url, *, filters=None, **fields):
+        if url.endswith("/events"):
+            items = self.events
+        elif url.endswith("/dependencies"):
+            items = self.dependencies.get(int(url.split("/")[-2]), [])
+        else:
+            items = [mod for mod in self.mods.values() if mod["visible"] == 1]
+
+        objects = [modio.Object(id=item.get("id"), date_updated=item.get("date_updated")) for item in items]
+        by_object = {id(obj): item for obj, item in zip(objects, items)}
+        results, pagination = evaluate(filters, objects)
+        return {
+            "data": [by_object[id(obj)] for obj in results],
+            "result_count": pagination.count,
+            "result_limit": pagination.limit,
+            "result_offset": pagination.offset,
+            "result_total": pagination.total,
+        }
+
+
+class TestMirror(unittest.TestCase):
+    def setUp(self):
+        self.client = modio.Client(api_key="fake key", keep_raw=True)
+        self.game = modio.game.Game(connection=self.client.connection, **payload("game"))
+        self.api = FakeAPI()
+        patcher = mock.patch.object(self.client.connection, "_get_request", self.api.get_request)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.mirror = Mirror(self.game)
+        self.addCleanup(self.mirror.close)
+
+    def test_keep_raw(self):
+        client = modio.Client(api_key="fake key")
+        game = modio.game.Game(connection=client.connection, **payload("game"))
+        with self.assertRaises(modioException):
+            Mirror(game)
+
+    def test_bootstrap(self):
+        assert self.mirror.bootstrap(dependencies=True) == 12
+        assert self.mirror.get_mod(3).name == "Mod 3"
+        assert self.mirror.get_dependencies(1) == [2]
+        assert self.mirror._get_state("last_event_id") == 1
+
+    def test_async_bootstrap(self):
+        async def get_request(url, **fields):
+            return self.api.get_request(url, **fields)
+
+        with mock.patch.object(self.client.connection, "_async_get_request", get_request):
+            assert run(self.mirror.async_bootstrap()) == 12
+            self.api.add_event(4, "MOD_DELETED")
+            assert run(self.mirror.async_update()) == ([], [4])
+
+    def test_query(self):
+        self.mirror.bootstrap()
+        mods = list(self.api.mods.values())
+
+        for filters in [
+            modio.Filter().equals(tags="Unity").sort("downloads", reverse=True).limit(3),
+            modio.Filter().values_in(id=[1, 5, 7]).not_equals(id=5),
+            modio.Filter().like(name="mod 1*").offset(1),
+            modio.Filter().min(updated=1005).max(updated=1008),
+            modio.Filter().text("Mod 2"),
+            modio.Filter().equals(summary=self.api.mods[1]["summary"]).limit(2),
+        ]:
+            results, pagination = self.mirror.query(filters)
+            models = [modio.Mod(connection=self.client.connection, **mod) for mod in mods]
+            expected, expected_pagination = evaluate(filters, models)
+            assert [mod.id for mod in results] == [mod.id for mod in expected], filters
+            assert pagination.total == expected_pagination.total
+
+    def test_update(self):
+        self.mirror.bootstrap()
+        self.api.mods[2]["name"] = "Renamed"
+        self.api.mods[3]["visible"] = 0
+        self.api.mods[13] = payload("mod", id=13, name="New")
+        self.api.add_event(2, "MOD_EDITED")
+        self.api.add_event(3, "MOD_EDITED")
+        self.api.add_event(13, "MODFILE_CHANGED")
+        self.api.add_event(5, "MOD_UNAVAILABLE")
+        self.api.add_event(6, "MOD_COMMENT_ADDED")
+
+        assert self.mirror.update() == ([2, 13], [3, 5])
+        assert self.mirror.get_mod(2).name == "Renamed"
+        assert len(self.mirror) == 11
+        assert self.mirror._get_state("last_event_id") == 6
+        assert self.mirror.update() == ([], [])
+
+    def test_update_filters(self):
+        assert self.mirror.bootstrap(filters=modio.Filter().max(id=10).sort("id").limit(5)) == 10
+        self.api.mods[13] = payload("mod", id=13, name="New")
+        self.api.mods[2]["name"] = "Renamed"
+        self.api.add_event(13, "MOD_AVAILABLE")
+        self.api.add_event(2, "MOD_EDITED")
+
+        assert self.mirror.update() == ([2], [13])
+        assert self.mirror.get_mod(2).name == "Renamed"
+        assert len(self.mirror) == 10
+
+    def test_get_mod_miss(self):
+        self.api.mods[1]["name"] = "Fetched"
+        with mock.patch.object(
+            self.game,
+            "get_mod",
+            return_value=modio.Mod(connection=self.client.connection, **self.api.mods[1]),
+        ) as get_mod:
+            assert self.mirror.get_mod(1).name == "Fetched"
+            assert self.mirror.get_mod(1).name == "Fetched"
+            get_mod.assert_called_once_with(1)
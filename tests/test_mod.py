@@ -1,5 +1,6 @@
 import time
 import unittest
+from unittest import mock
 
 import pytest
 import modio
@@ -16,7 +17,9 @@ except ModuleNotFoundError:
     game_id = os.environ["GAME_ID"]
     mod_id = os.environ["MOD_ID"]
 
-from .utils import run, use_test_env
+from modio.utils import flatten
+
+from .utils import payload, run, use_test_env
 
 
 class TestMod(unittest.TestCase):
@@ -277,3 +280,67 @@ class TestMod(unittest.TestCase):
 
         if mod:
             run(mod[0].async_delete())
+
+
+def comment_pages(positions, page_limit=2):
+    comments = []
+    for index, position in enumerate(positions, start=1):
+        parent = positions.index(position.rsplit(".", 1)[0]) + 1 if "." in position else 0
+        comments.append(payload("comment", id=index, reply_id=parent, thread_position=position))
+
+    def get_request(url, *, filters=None, **fields):
+        offset = filters._offset or 0
+        return {
+            "data": comments[offset : offset + page_limit],
+            "result_count": len(comments[offset : offset + page_limit]),
+            "result_limit": page_limit,
+            "result_offset": offset,
+            "result_total": len(comments),
+        }
+
+    return get_request
+
+
+class TestCommentTree(unittest.TestCase):
+    def setUp(self):
+        self.client = modio.Client(access_token=access_token, test=use_test_env)
+        self.mod = modio.Mod(connection=self.client.connection, **payload("mod"))
+
+    @mock.patch("modio.client.PAGE_LIMIT", 2)
+    def test_comment_tree(self):
+        positions = ["02.01", "01", "02", "01.01", "01.01.01", "03", "02.02"]
+        with mock.patch.object(self.client.connection, "get_request", comment_pages(positions)):
+            tree = self.mod.get_comment_tree()
+
+        assert [comment.position for comment in tree] == ["01", "02", "03"]
+        assert [comment.position for comment in tree[1].children] == ["02.01", "02.02"]
+        assert [comment.position for comment in flatten(tree)] == [
+            "01",
+            "01.01",
+            "01.01.01",
+            "02",
+            "02.01",
+            "02.02",
+            "03",
+        ]
+
+    @mock.patch("modio.client.PAGE_LIMIT", 2)
+    def test_comment_tree_order(self):
+        positions = ["02", "01", "01.02", "02.01", "01.01"]
+        with mock.patch.object(self.client.connection, "get_request", comment_pages(positions)):
+            tree = self.mod.get_comment_tree()
+
+        assert [comment.position for comment in flatten(tree)] == ["02", "02.01", "01", "01.02", "01.01"]
+
+    @mock.patch("modio.client.PAGE_LIMIT", 2)
+    def test_async_comment_tree(self):
+        positions = ["01", "01.01", "02"]
+        get_request = comment_pages(positions)
+
+        async def async_get_request(url, **fields):
+            return get_request(url, **fields)
+
+        with mock.patch.object(self.client.connection, "async_get_request", async_get_request):
+            tree = run(self.mod.async_get_comment_tree())
+
+        assert [len(comment.children) for comment in tree] == [1, 0]
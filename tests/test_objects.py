@@ -1,3 +1,6 @@
+import datetime
+import json
+import pickle
 import unittest
 
 import pytest
@@ -6,7 +9,7 @@ import random
 
 from modio.enums import Community, EventType, TargetPlatform
 from modio.errors import modioException
-from modio.utils import _convert_date
+from modio.utils import _convert_date, convert_dates, group_events
 
 try:
     from .config import access_token, game_id, mod_id
@@ -17,7 +20,7 @@ except ModuleNotFoundError:
     game_id = os.environ["GAME_ID"]
     mod_id = os.environ["MOD_ID"]
 
-from .utils import run, use_test_env
+from .utils import payload, run, use_test_env
 
 event_params = {
     "id": 13,
@@ -39,6 +42,28 @@ class TestEvent(unittest.TestCase):
 
         assert event.type is modio.EventType.team_join
 
+    def test_all_types(self):
+        for event_type in EventType:
+            filters = modio.Filter().equals(event_type=event_type)
+            event = modio.entities.Event(**{**event_params, "event_type": filters.event_type})
+
+            assert event.type is event_type
+
+    def test_unknown_type(self):
+        event = modio.entities.Event(**{**event_params, "event_type": "MOD_UNKNOWN"})
+
+        assert event.type is None
+
+    def test_group_events(self):
+        events = [
+            modio.entities.Event(**{**event_params, "id": index, "event_type": event_type})
+            for index, event_type in enumerate(["MOD_EDITED", "MODFILE_CHANGED", "MOD_EDITED"])
+        ]
+        groups = group_events(events)
+
+        assert [event.id for event in groups[EventType.edited]] == [0, 2]
+        assert [event.id for event in groups[EventType.file_changed]] == [1]
+
 
 class TestComment(unittest.TestCase):
     def setUp(self):
@@ -255,6 +280,33 @@ class TestFilter(unittest.TestCase):
         client = modio.Client(access_token=access_token, test=use_test_env)
         client.get_my_mods(filters=filters)
 
+    def test_filter_freeze(self):
+        filters = modio.Filter().equals(id=3).sort("name").limit(10)
+        frozen = filters.freeze()
+
+        assert frozen == modio.Filter().limit(10).sort("name").equals(id=3).freeze()
+        assert hash(frozen) == hash(filters.freeze())
+        assert frozen.params == (("_limit", 10), ("_sort", "name"), ("id", 3))
+        assert frozen.freeze() is frozen
+
+        filters.equals(id=4)
+        assert frozen.get_dict()["id"] == 3
+
+        with pytest.raises(AttributeError):
+            frozen.id = 4
+
+        with pytest.raises(TypeError):
+            frozen.get_dict()["id"] = 4
+
+        page = frozen.with_offset(20).with_limit(5)
+        assert page._offset == 20 and page._limit == 5
+        assert frozen._offset is None
+        assert frozen.with_params({"_sort": None}).params == (("_limit", 10), ("id", 3))
+        assert {frozen: 1}[pickle.loads(pickle.dumps(frozen))] == 1
+
+        thawed = frozen.thaw().offset(5)
+        assert thawed.get_dict() == {"_sort": "name", "_limit": 10, "_offset": 5, "id": 3}
+
 
 class TestPagination(unittest.TestCase):
     def test_pagination(self):
@@ -275,3 +327,81 @@ class TestObject(unittest.TestCase):
 
         obj = modio.Object(**fields)
         assert fields == obj.__dict__
+
+
+class TestPickle(unittest.TestCase):
+    def setUp(self):
+        self.client = modio.Client(access_token=access_token, test=use_test_env)
+        self.mod = modio.Mod(connection=self.client.connection, **payload("mod"))
+
+    def test_pickle(self):
+        mod = pickle.loads(pickle.dumps(self.mod))
+
+        assert mod.id == self.mod.id
+        assert mod.connection is None
+        assert mod.submitter.connection is None
+        assert mod.file.connection is None
+        assert self.mod.connection is self.client.connection
+
+    def test_attach(self):
+        mods = self.client.attach(pickle.loads(pickle.dumps([self.mod])))
+
+        assert mods[0].connection is self.client.connection
+        assert mods[0].submitter.connection is self.client.connection
+        assert mods[0].file.connection is self.client.connection
+
+    def test_attach_comment(self):
+        comment = modio.entities.Comment(
+            connection=self.client.connection, mod=self.mod, **payload("comment")
+        )
+        comment = self.client.attach(pickle.loads(pickle.dumps(comment)))
+
+        assert comment.connection is self.client.connection
+        assert comment.mod.connection is self.client.connection
+
+
+class TestRaw(unittest.TestCase):
+    def test_to_dict(self):
+        client = modio.Client(access_token=access_token, test=use_test_env, keep_raw=True)
+        data = payload("mod")
+        mod = modio.Mod(connection=client.connection, **data)
+
+        assert mod.to_dict() == data
+        assert mod.to_dict()["submitted_by"] is data["submitted_by"]
+        assert mod.submitter.to_dict() == data["submitted_by"]
+        assert mod.file.to_dict()["download"]["date_expires"] == data["modfile"]["download"]["date_expires"]
+        assert mod.file.to_dict() == data["modfile"]
+        assert modio.Mod(connection=client.connection, **json.loads(mod.to_json())).id == mod.id
+
+    def test_not_kept(self):
+        client = modio.Client(access_token=access_token, test=use_test_env)
+        mod = modio.Mod(connection=client.connection, **payload("mod"))
+
+        with pytest.raises(modioException):
+            mod.to_dict()
+
+    def test_no_connection(self):
+        mod = modio.Mod(connection=None, **payload("mod"))
+        assert mod.id == payload("mod")["id"]
+
+        with pytest.raises(modioException):
+            mod.to_dict()
+
+
+class TestDates(unittest.TestCase):
+    def test_lazy_dates(self):
+        client = modio.Client(access_token=access_token, test=use_test_env)
+        mod = modio.Mod(connection=client.connection, **payload("mod"))
+
+        assert "date" not in mod.__dict__
+        assert mod.date == datetime.datetime(2017, 4, 19, 1, 8, 23, tzinfo=datetime.timezone.utc)
+        assert mod.date is mod.date
+        assert mod.file.date.timestamp() == 1499846132
+        assert mod.file.scanned.tzinfo is datetime.timezone.utc
+        assert mod.stats.is_stale()
+        assert mod.file.url_is_expired()
+
+    def test_convert_dates(self):
+        timestamps = [1499846132, 0, 1492564103]
+
+        assert convert_dates(timestamps) == [_convert_date(time) for time in timestamps]
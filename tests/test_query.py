@@ -0,0 +1,63 @@
+import unittest
+
+import modio
+from modio.query import evaluate
+
+from .test_catalog import make_mods
+
+
+class TestQuery(unittest.TestCase):
+    def setUp(self):
+        self.client = modio.Client(api_key="fake key")
+        self.mods = make_mods(self.client, count=20)
+        self.catalog = modio.Catalog(self.mods)
+
+    def ids(self, filters):
+        mods, pagination = evaluate(filters, self.mods)
+        indexed, indexed_pagination = self.catalog.query(filters)
+        assert [mod.id for mod in mods] == [mod.id for mod in indexed]
+        assert pagination.total == indexed_pagination.total
+        return [mod.id for mod in mods]
+
+    def test_equals(self):
+        assert self.ids(modio.Filter().equals(name="Mod 1")) == [1, 4, 7, 10, 13, 16, 19]
+        assert self.ids(modio.Filter().equals(visible=modio.Visibility.hidden)) == list(range(2, 21, 2))
+        assert self.ids(modio.Filter().not_equals(id=1).equals(name="Mod 1")) == [4, 7, 10, 13, 16, 19]
+        assert self.ids(modio.Filter({"tags": "Unity"})) == list(range(1, 21))
+        assert self.ids(modio.Filter({"metadata_kvp": "pistol-dmg:800"})) == list(range(1, 21))
+
+    def test_like(self):
+        assert self.ids(modio.Filter().like(name="mod 2*")) == [2, 5, 8, 11, 14, 17, 20]
+        assert len(self.ids(modio.Filter().not_like(name="*1"))) == 13
+
+    def test_in(self):
+        assert self.ids(modio.Filter().values_in(id=[3, 1, 30])) == [1, 3]
+        assert self.ids(modio.Filter().values_not_in(id=range(2, 21))) == [1]
+
+    def test_ranges(self):
+        assert self.ids(modio.Filter({"downloads_total-min": 1800})) == [18, 19, 20]
+        assert self.ids(modio.Filter().max(id=3)) == [1, 2, 3]
+        assert self.ids(modio.Filter().smaller_than(id=3).greater_than(id=1)) == [2]
+        assert self.ids(modio.Filter().min(updated=1600000019)) == [19, 20]
+        assert self.ids(modio.Filter().bitwise(visible=1)) == list(range(1, 21, 2))
+
+    def test_text(self):
+        assert self.ids(modio.Filter().text("nothing 0")) == [3, 6, 9, 12, 15, 18]
+
+    def test_sort_and_pagination(self):
+        filters = modio.Filter().sort("downloads", reverse=True).limit(5).offset(5)
+        mods, pagination = evaluate(filters, self.mods)
+        assert [mod.id for mod in mods] == [15, 14, 13, 12, 11]
+        assert pagination.total == 20
+        assert pagination.next() == 10
+        assert not pagination.max()
+
+        mods, pagination = self.catalog.query(modio.Filter().sort("name").limit(3))
+        assert [mod.name for mod in mods] == ["Mod 0", "Mod 0", "Mod 0"]
+        assert evaluate(None, self.mods).pagination.limit == 100
+
+    def test_catalog_updates(self):
+        filters = modio.Filter().equals(name="Mod 1")
+        assert len(self.catalog.query(filters).results) == 7
+        self.catalog.discard(self.mods[0])
+        assert len(self.catalog.query(filters).results) == 6
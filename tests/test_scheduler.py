@@ -0,0 +1,106 @@
+import asyncio
+import time
+import unittest
+
+import modio
+from modio.crawl import Cursor
+from modio.query import evaluate
+from modio.scheduler import Scheduler, TokenBucket
+
+from .utils import run
+
+
+class FakeGame:
+    def __init__(self, game_id, events_per_poll=0):
+        self.id = game_id
+        self.events_per_poll = events_per_poll
+        self.events = []
+        self.polls = 0
+        self.stats_polls = 0
+
+    async def async_get_mod_events(self, *, filters=None):
+        self.polls += 1
+        start = len(self.events) + 1
+        self.events.extend(modio.Object(id=x) for x in range(start, start + self.events_per_poll))
+        return evaluate(filters, self.events)
+
+    async def async_get_stats(self):
+        self.stats_polls += 1
+        return modio.Object(_date_expires_raw=time.time() + 0.05)
+
+
+async def run_for(scheduler, seconds):
+    task = asyncio.ensure_future(scheduler.run())
+    await asyncio.sleep(seconds)
+    scheduler.stop()
+    await task
+
+
+class TestTokenBucket(unittest.TestCase):
+    def test_rate(self):
+        bucket = TokenBucket(rate=100, burst=5)
+
+        async def acquire(count):
+            start = time.monotonic()
+            for _ in range(count):
+                await bucket.acquire()
+
+            return time.monotonic() - start
+
+        assert run(acquire(5)) < 0.02
+        assert run(acquire(10)) >= 0.08
+
+
+class TestScheduler(unittest.TestCase):
+    def test_fair_share(self):
+        heavy, light = FakeGame(1, events_per_poll=200), FakeGame(2, events_per_poll=200)
+        received = {1: 0, 2: 0}
+
+        def on_events(game, events):
+            received[game.id] += len(events)
+
+        scheduler = Scheduler(rate=200, burst=1, min_interval=0)
+        scheduler.add_game(heavy, on_events=on_events, priority=3, cursor=Cursor())
+        scheduler.add_game(light, on_events=on_events, priority=1, cursor=Cursor())
+        run(run_for(scheduler, 0.4))
+
+        total = heavy.polls + light.polls
+        assert total <= 0.4 * 200 + 2
+        assert 2 <= heavy.polls / light.polls <= 4
+        assert received[1] > 0 and received[2] > 0
+
+    def test_adaptive(self):
+        hot, idle = FakeGame(1, events_per_poll=5), FakeGame(2)
+        scheduler = Scheduler(rate=1000, burst=10, min_interval=0.01)
+        scheduler.add_game(hot, on_events=lambda game, events: None, freshness=0.1)
+        scheduler.add_game(idle, on_events=lambda game, events: None, freshness=0.1)
+        run(run_for(scheduler, 0.35))
+
+        assert idle.polls <= 5
+        assert hot.polls > 2 * idle.polls
+
+    def test_stats(self):
+        game = FakeGame(1)
+        stats = []
+
+        async def on_stats(game, game_stats):
+            stats.append(game_stats)
+
+        scheduler = Scheduler(rate=1000, burst=10, min_interval=0.01)
+        scheduler.add_game(game, on_stats=on_stats, freshness=1)
+        run(run_for(scheduler, 0.18))
+
+        assert game.polls == 0
+        assert 2 <= len(stats) <= 5
+
+    def test_errors(self):
+        game = FakeGame(1)
+
+        async def failing(*, filters=None):
+            raise modio.modioException("boom")
+
+        game.async_get_mod_events = failing
+        scheduler = Scheduler(rate=1000, burst=10, min_interval=0.01)
+        scheduler.add_game(game, on_events=lambda game, events: None, freshness=0.05, cursor=Cursor())
+        with self.assertLogs(level="ERROR"):
+            run(run_for(scheduler, 0.12))
@@ -0,0 +1,116 @@
+import asyncio
+import time
+import unittest
+from unittest import mock
+
+import modio
+from modio.query import evaluate
+from modio.stats import StatsManager
+
+from .utils import payload, run
+
+
+class FakeStats:
+    """Serves the stats of mods from memory, counting the requests made."""
+
+    def __init__(self, count=250, expires=None):
+        self.expires = expires or time.time() + 300
+        self.stats = {
+            mod_id: payload("stats", mod_id=mod_id, downloads_total=mod_id, date_expires=self.expires)
+            for mod_id in range(1, count + 1)
+        }
+        self.requests = 0
+
+    def get_request(self, url, *, filters=None, **fields):
+        self.requests += 1
+        objects = [modio.Object(mod_id=mod_id) for mod_id in self.stats]
+        results, pagination = evaluate(filters, objects)
+        return {
+            "data": [self.stats[obj.mod_id] for obj in results],
+            "result_count": pagination.count,
+            "result_limit": pagination.limit,
+            "result_offset": pagination.offset,
+            "result_total": pagination.total,
+        }
+
+
+class TestStatsManager(unittest.TestCase):
+    def setUp(self):
+        self.client = modio.Client(api_key="fake key")
+        self.game = modio.game.Game(connection=self.client.connection, **payload("game"))
+        self.api = FakeStats()
+        patcher = mock.patch.object(self.client.connection, "_get_request", self.api.get_request)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.manager = StatsManager(self.game)
+
+    def test_batched(self):
+        self.manager.track(*range(1, 251))
+        assert self.manager.next_refresh() == 0
+        assert len(self.manager.refresh()) == 250
+        assert self.api.requests == 3
+
+        assert self.manager.get(42).downloads == 42
+        assert self.manager.refresh() == []
+        assert self.api.requests == 3
+        assert self.manager.next_refresh() > 200
+
+    def test_refresh_before_expiry(self):
+        mod = modio.Mod(connection=self.client.connection, **payload("mod", id=7))
+        mod.stats._date_expires_raw = time.time() + 10
+        self.manager.track(mod, 8)
+        self.api.stats[7]["downloads_total"] = 1000
+
+        assert self.manager.get(7).downloads == 1000
+        assert mod.stats.downloads == 1000
+        assert self.manager.get(8).downloads == 8
+        assert self.api.requests == 1
+
+    def test_untracked_missing(self):
+        self.manager.track(1, 999)
+        self.manager.refresh()
+        assert 1 in self.manager
+        assert 999 not in self.manager
+        assert self.manager.get(999) is None
+
+    def test_async_refresh(self):
+        async def get_request(url, **fields):
+            return self.api.get_request(url, **fields)
+
+        self.manager.track(*range(1, 151))
+        with mock.patch.object(self.client.connection, "_async_get_request", get_request):
+            assert len(run(self.manager.async_refresh())) == 150
+            assert run(self.manager.async_get(150)).downloads == 150
+
+        assert self.api.requests == 2
+
+    def test_get_cached(self):
+        self.manager.track(*range(1, 251))
+        self.manager.refresh()
+        with mock.patch.object(self.manager, "_due", side_effect=AssertionError("scanned every mod")):
+            assert self.manager.get(42).downloads == 42
+
+    def test_run(self):
+        api = FakeStats(expires=time.time() - 1)
+        failures = []
+
+        async def get_request(url, **fields):
+            if not failures:
+                failures.append(url)
+                raise modio.errors.modioException("Server error", code=500)
+
+            return api.get_request(url, **fields)
+
+        async def run_for(seconds):
+            task = asyncio.ensure_future(self.manager.run())
+            await asyncio.sleep(seconds)
+            task.cancel()
+
+        self.manager.min_interval = 0.1
+        self.manager.track(1)
+        with mock.patch.object(self.client.connection, "_async_get_request", get_request):
+            with self.assertLogs(level="ERROR"):
+                run(run_for(0.35))
+
+        # expired stats are refreshed every min_interval and a failed refresh does not stop the loop
+        assert len(failures) == 1 and 1 <= api.requests <= 3
@@ -0,0 +1,103 @@
+import datetime
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import modio
+from modio.entities import ModStats
+from modio.errors import modioException
+from modio.timeseries import StatsTimeSeries
+
+from .utils import payload, run
+
+DAY = 86400
+
+
+def snapshot(day, count=200):
+    """Stats where each mod gains its id in downloads every day, and mod 5 only exists after day 3."""
+    return [
+        ModStats(
+            **payload("stats", mod_id=mod_id, downloads_total=1000 + mod_id * day, subscribers_total=mod_id)
+        )
+        for mod_id in range(1, count + 1)
+        if mod_id != 5 or day >= 3
+    ]
+
+
+class TestStatsTimeSeries(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "stats.bin")
+        self.series = StatsTimeSeries(self.path, keyframe_interval=4)
+        self.addCleanup(self.series.close)
+        for day in range(10):
+            self.series.append(snapshot(day), timestamp=day * DAY)
+
+    def test_series(self):
+        assert len(self.series) == 10
+        assert self.series.series(7) == [(day * DAY, 1000 + 7 * day) for day in range(10)]
+        assert self.series.series(5, start=2 * DAY, end=4 * DAY) == [(3 * DAY, 1015), (4 * DAY, 1020)]
+        assert self.series.series(7, "subscribers", start=9 * DAY) == [(9 * DAY, 7)]
+        assert self.series.series(999) == []
+
+        start = datetime.datetime.fromtimestamp(8 * DAY, datetime.timezone.utc)
+        assert [t for t, _ in self.series.series(1, start=start)] == [8 * DAY, 9 * DAY]
+
+    def test_rates(self):
+        assert self.series.rate(7) == 7
+        assert self.series.rate(7, start=5 * DAY, per=3600) == 7 / 24
+        assert self.series.rate(7, start=9 * DAY) is None
+        assert self.series.rate(start=4 * DAY) == sum(range(1, 201))
+
+        rates = self.series.rates(start=DAY, end=6 * DAY)
+        assert 5 not in rates and rates[200] == 200
+        assert self.series.totals(end=0) == [(0, sum(1000 for mod_id in range(1, 201) if mod_id != 5))]
+
+    def test_series_gap(self):
+        self.series.append([stats for stats in snapshot(10) if stats.id != 7], timestamp=10 * DAY)
+        self.series.append(snapshot(11), timestamp=11 * DAY)
+        assert self.series.series(7, start=9 * DAY) == [(9 * DAY, 1063), (11 * DAY, 1077)]
+
+    def test_rates_endpoints(self):
+        with mock.patch.object(self.series, "_read", wraps=self.series._read) as read:
+            rates = self.series.rates()
+
+        assert rates[7] == 7
+        # the first snapshot is a keyframe and the last one is decoded from the keyframe before it
+        assert read.call_count == 3
+
+    def test_reopen(self):
+        self.series.close()
+        with open(self.path, "ab") as f:
+            f.write(b"\x00" * 10)
+
+        with StatsTimeSeries(self.path, keyframe_interval=4) as series:
+            assert series.timestamps == [day * DAY for day in range(10)]
+            series.append(snapshot(10), timestamp=10 * DAY)
+            assert series.series(3, start=9 * DAY) == [(9 * DAY, 1027), (10 * DAY, 1030)]
+
+            with self.assertRaises(modioException):
+                series.append(snapshot(1), timestamp=DAY)
+
+    def test_compact(self):
+        raw = len(json.dumps([payload("stats") for _ in range(200)])) * 10
+        assert os.path.getsize(self.path) * 20 < raw
+
+    def test_record(self):
+        client = modio.Client(api_key="fake key")
+        game = modio.game.Game(connection=client.connection, **payload("game"))
+        stats_json = [payload("stats", mod_id=1, downloads_total=5000)]
+
+        with mock.patch.object(client.connection, "get_all_request", return_value=stats_json):
+            self.series.record(game)
+
+        async def async_get_all_request(url, **fields):
+            return [payload("stats", mod_id=1, downloads_total=6000)]
+
+        with mock.patch.object(client.connection, "async_get_all_request", async_get_all_request):
+            run(self.series.async_record(game))
+
+        assert [value for _, value in self.series.series(1)[-2:]] == [5000, 6000]
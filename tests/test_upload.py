@@ -0,0 +1,138 @@
+import email.parser
+import hashlib
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import requests
+
+import modio
+from modio.upload import MultipartUpload
+
+from .utils import payload, run
+
+
+def parse(headers, body):
+    message = email.parser.BytesParser().parsebytes(
+        f"Content-Type: {headers['Content-Type']}\r\n\r\n".encode() + body
+    )
+    return {
+        part.get_param("name", header="content-disposition"): part.get_payload(decode=True)
+        for part in message.get_payload()
+    }
+
+
+class TestMultipartUpload(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "mod.zip")
+        self.data = os.urandom(50_000)
+        with open(self.path, "wb") as f:
+            f.write(self.data)
+
+        self.md5 = hashlib.md5(self.data).hexdigest()
+
+    def test_body(self):
+        progress = []
+        upload = MultipartUpload(
+            self.path,
+            {"version": "1.0", "metadata_blob": None},
+            buffer_size=20_000,
+            progress=lambda *args: progress.append(args),
+        )
+        assert upload.md5 is None
+
+        body = b"".join(upload)
+        assert len(body) == len(upload) == int(upload.headers["Content-Length"])
+        assert parse(upload.headers, body) == {
+            "version": b"1.0",
+            "filedata": self.data,
+            "filehash": self.md5.encode(),
+        }
+        assert upload.md5 == self.md5
+        assert [sent for sent, _, _ in progress] == [20_000, 40_000, 50_000]
+        assert all(total == 50_000 and throughput >= 0 for _, total, throughput in progress)
+
+        # the body can be sent again, for example when a request is retried
+        assert b"".join(upload) == body
+
+    def test_filename_escaped(self):
+        path = os.path.join(os.path.dirname(self.path), 'mod "hd"\r\nX-Injected: 1 é.zip')
+        os.rename(self.path, path)
+        upload = MultipartUpload(path, {"version": "1.0"})
+        body = b"".join(upload)
+
+        disposition = next(line for line in body.split(b"\r\n") if b"filename=" in line)
+        filename = 'filename="mod %22hd%22%0D%0AX-Injected: 1 é.zip"'
+        assert disposition == f'Content-Disposition: form-data; name="filedata"; {filename}'.encode()
+        assert not any(line.startswith(b"X-Injected") for line in body.split(b"\r\n"))
+        assert len(body) == len(upload)
+        assert parse(upload.headers, body)["filedata"] == self.data
+
+    def test_async_body(self):
+        upload = MultipartUpload(self.path, {"version": "1.0"})
+
+        async def read():
+            return b"".join([chunk async for chunk in upload])
+
+        assert run(read()) == b"".join(upload)
+
+    def test_requests_length(self):
+        upload = MultipartUpload(self.path, {})
+        prepared = requests.Request(
+            "POST", "https://example.com", data=upload, headers=upload.headers
+        ).prepare()
+        assert prepared.headers["Content-Length"] == str(len(upload))
+        assert "Transfer-Encoding" not in prepared.headers
+
+    def test_add_file(self):
+        client = modio.Client(api_key="fake key", access_token="fake token")
+        mod = modio.Mod(connection=client.connection, **payload("mod"))
+        new = modio.NewModFile(version="1.0", changelog="Changes").add_file(self.path)
+        assert new.filehash is None
+
+        sent = {}
+
+        def post(url, *, headers=None, data=None, **fields):
+            sent["headers"], sent["body"] = headers, b"".join(data)
+            return mock.Mock(status_code=201, json=lambda: payload("modfile"), headers={})
+
+        with mock.patch.object(client.connection.session, "post", post):
+            file = mod.add_file(new)
+
+        assert isinstance(file, modio.entities.ModFile) and new.filehash == self.md5
+        assert sent["headers"]["Authorization"] == "Bearer fake token"
+        assert sent["headers"]["Content-Length"] == str(len(sent["body"]))
+        fields = parse(sent["headers"], sent["body"])
+        assert fields["changelog"] == b"Changes" and fields["filedata"] == self.data
+        assert list(fields)[-1] == "filehash" and fields["filehash"] == self.md5.encode()
+
+    def test_async_add_file(self):
+        client = modio.Client(api_key="fake key", access_token="fake token")
+        mod = modio.Mod(connection=client.connection, **payload("mod"))
+        new = modio.NewModFile(version="1.0", changelog="Changes").add_file(self.path)
+        sent = {}
+
+        class FakeRequest:
+            def __init__(self, url, *, headers=None, data=None):
+                self.headers, self.data = headers, data
+
+            async def __aenter__(self):
+                sent["headers"] = self.headers
+                sent["body"] = b"".join([chunk async for chunk in self.data])
+
+            async def __aexit__(self, *args):
+                pass
+
+        async def post_process(resp):
+            return payload("modfile")
+
+        client.connection.async_session = mock.Mock(post=FakeRequest)
+        with mock.patch.object(client.connection, "_async_post_process", post_process):
+            run(mod.async_add_file(new))
+
+        assert new.filehash == self.md5
+        assert sent["headers"]["Content-Length"] == str(len(sent["body"]))
+        assert parse(sent["headers"], sent["body"])["filedata"] == self.data
@@ -1,4 +1,5 @@
 import asyncio
+import copy
 
 import modio
 
@@ -12,3 +13,138 @@ def run(coro):
 class FakeRequest(modio.Object):
     def json(self):
         return self.json_data
+
+
+_image = {
+    "filename": "logo.png",
+    "original": "https://example.com/logo.png",
+    "thumb_320x180": "https://example.com/crop_320x180/logo.png",
+}
+
+_user = {
+    "id": 1,
+    "name_id": "xant",
+    "username": "XanT",
+    "date_online": 1509922961,
+    "avatar": {
+        "filename": "avatar.png",
+        "original": "https://example.com/avatar.png",
+        "thumb_50x50": "https://example.com/crop_50x50/avatar.png",
+    },
+    "timezone": "",
+    "language": "",
+    "profile_url": "https://mod.io/u/xant",
+}
+
+_modfile = {
+    "id": 2,
+    "mod_id": 2,
+    "date_added": 1499846132,
+    "date_scanned": 1499846132,
+    "virus_status": 0,
+    "virus_positive": 0,
+    "virustotal_hash": "",
+    "filesize": 15181,
+    "filehash": {"md5": "2d4a0e2d7273db6b0a94b0740a88ad0d"},
+    "filename": "file.zip",
+    "version": "1.3",
+    "changelog": "Changes",
+    "metadata_blob": None,
+    "download": {"binary_url": "https://example.com/file.zip", "date_expires": 1579316848},
+    "platforms": [{"platform": "windows", "status": 1}],
+}
+
+_stats = {
+    "mod_id": 2,
+    "popularity_rank_position": 13,
+    "popularity_rank_total_mods": 204,
+    "downloads_total": 27492,
+    "subscribers_total": 16394,
+    "ratings_total": 1230,
+    "ratings_positive": 1047,
+    "ratings_negative": 183,
+    "ratings_percentage_positive": 91,
+    "ratings_weighted_aggregate": 87.38,
+    "ratings_display_text": "Very Positive",
+    "date_expires": 1492564103,
+}
+
+_mod = {
+    "id": 2,
+    "game_id": 2,
+    "status": 1,
+    "visible": 1,
+    "submitted_by": _user,
+    "date_added": 1492564103,
+    "date_updated": 1499841487,
+    "date_live": 1499841403,
+    "maturity_option": 0,
+    "logo": _image,
+    "homepage_url": "https://www.rogue-hdpack.com/",
+    "name": "Rogue Knight HD Pack",
+    "name_id": "rogue-knight-hd-pack",
+    "summary": "It's time to bask in the glory of beautiful 4k textures!",
+    "description": "<p>Rogue HD Pack does exactly what you thi...</p>",
+    "description_plaintext": "Rogue HD Pack does exactly what you thi...",
+    "metadata_blob": "rogue,hd,high-res,4k,hd textures",
+    "profile_url": "https://rogue-knight.mod.io/rogue-knight-hd-pack",
+    "media": {"youtube": [], "sketchfab": [], "images": []},
+    "modfile": _modfile,
+    "stats": _stats,
+    "metadata_kvp": [{"metakey": "pistol-dmg", "metavalue": "800"}],
+    "tags": [{"name": "Unity", "date_added": 1499841487}],
+    "platforms": [],
+}
+
+_comment = {
+    "id": 2,
+    "game_id": 2,
+    "mod_id": 2,
+    "resource_id": 2,
+    "user": _user,
+    "date_added": 1499841487,
+    "reply_id": 0,
+    "thread_position": "01",
+    "karma": 1,
+    "karma_guest": 0,
+    "content": "Great mod!",
+}
+
+_game = {
+    "id": 2,
+    "status": 1,
+    "submitted_by": _user,
+    "date_added": 1493702614,
+    "date_updated": 1499410290,
+    "date_live": 1499841403,
+    "presentation_option": 0,
+    "submission_option": 1,
+    "curation_option": 0,
+    "community_options": 3,
+    "revenue_options": 1500,
+    "api_access_options": 3,
+    "maturity_options": 0,
+    "ugc_name": "mods",
+    "icon": _image,
+    "logo": _image,
+    "header": _image,
+    "name": "Rogue Knight",
+    "name_id": "rogueknight",
+    "summary": "Rogue Knight is a brand new 2D pixel platformer.",
+    "instructions": None,
+    "instructions_url": None,
+    "profile_url": "https://rogue-knight.mod.io",
+    "other_urls": [],
+    "tag_options": [],
+    "platforms": [],
+}
+
+_mod_stats = _stats
+
+
+def payload(_name, **overrides):
+    """Returns a fresh copy of one of the sample API payloads above, with
+    top level keys replaced by the given overrides."""
+    data = copy.deepcopy(globals()[f"_{_name}"])
+    data.update(overrides)
+    return data